@@ -0,0 +1,7 @@
+"""AIra Bot: personal finance guidance for students and professionals.
+
+Importing the package is cheap; submodules load numpy or gradio only when
+they are imported themselves. Run the app with `aira-bot` or
+`python -m aira_bot`.
+"""
+__version__ = "0.1.0"
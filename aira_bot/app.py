@@ -0,0 +1,347 @@
+"""Gradio UI and its event handlers. Importing this module loads gradio;
+nothing is built or served until build_demo() / launch()."""
+import asyncio
+from contextlib import aclosing
+from datetime import date
+
+import gradio as gr
+
+from .config import (
+    CHAT_HISTORY_MAX_TURNS, CHAT_RATE_LIMIT, GRADIO_CONCURRENCY_LIMIT, GRADIO_QUEUE_MAX_SIZE, MODEL_WARM_UP,
+    SERVER_NAME, SERVER_PORT, SESSION_SECRET, SHARE
+)
+from .metrics import metrics, metrics_routes
+from .bills import get_bill_scheduler
+from .goals import GOALS, get_goal_store
+from .ledger import ledger_store, recurring_charges, statement_importer
+from .forecast import forecast_store
+from .chat import FinanceChatbot, trim_history
+from .store import RateLimiter, SessionStore, get_store, off_loop
+from .users import get_user_store
+
+# Session state lives in the store; the browser only keeps the session id,
+# so any worker can serve any request
+store = get_store()
+sessions = SessionStore(store)
+chat_rate = RateLimiter(store, "chat", CHAT_RATE_LIMIT)
+
+# Initialize
+chatbot = FinanceChatbot(store=store)
+metrics.collect("aira_response_cache_hits_total", lambda: chatbot.cache.hits)
+metrics.collect("aira_response_cache_misses_total", lambda: chatbot.cache.misses)
+metrics.collect("aira_response_cache_bytes", lambda: chatbot.cache.size_bytes)
+metrics.collect("aira_model_calls_in_flight", lambda: chatbot.limiter.in_flight)
+metrics.collect("aira_model_calls_waiting", lambda: chatbot.limiter.waiting)
+metrics.collect("aira_model_clients_open", lambda: len(chatbot.pool))
+metrics.collect("aira_model_client_evictions_total", lambda: chatbot.pool.evictions)
+
+async def initialize_chatbot(hf_token, session_id):
+    status, usable = chatbot.check_token(hf_token)
+    if usable:
+        session = await off_loop(store, sessions.load, session_id)
+        session_id = await off_loop(store, sessions.save, session_id, {**session, "hf_token": hf_token})
+        # Connect and wake the model now, not on the first question
+        chatbot.warm_up_soon(hf_token)
+    return status, session_id
+
+async def restore_session(session_id):
+    """Reopen the portal a returning browser is still logged in to"""
+    session = await off_loop(store, sessions.load, session_id)
+    if session["hf_token"]:
+        chatbot.warm_up_soon(session["hf_token"])
+    if not session["logged_in"]:
+        return gr.update(visible=True), gr.update(visible=False), gr.update(visible=False), ""
+    return (
+        gr.update(visible=False),
+        gr.update(visible=session["user_type"] == "student"),
+        gr.update(visible=session["user_type"] == "professional"),
+        f"✅ Welcome back {session['user_data']['name']}!"
+    )
+
+def login(account_number, password, session_id):
+    with metrics.timer("aira_request_seconds", handler="login"):
+        account = get_user_store().authenticate((account_number or "").strip(), password or "")
+    metrics.inc("aira_logins_total", result="ok" if account is not None else "failed")
+    if account is not None:
+        user_type, user_data = account
+        session = {
+            **sessions.load(session_id),
+            "logged_in": True,
+            "user_type": user_type,
+            "account_number": account_number.strip(),
+            "user_data": user_data
+        }
+        # A new id on login, so an id handed out before it can't ride on the login
+        sessions.delete(session_id)
+        session_id = sessions.save(None, session)
+        greeting = f"✅ Welcome {user_data['name']}!"
+        reminders = get_bill_scheduler().pop_notifications(session["account_number"])
+        if reminders:
+            greeting += " 🔔 Due soon: " + "; ".join(reminders)
+        return (
+            gr.update(visible=False),
+            gr.update(visible=user_type == "student"),
+            gr.update(visible=user_type == "professional"),
+            greeting,
+            session_id
+        )
+    
+    return (
+        gr.update(visible=True),
+        gr.update(visible=False),
+        gr.update(visible=False),
+        "❌ Invalid. Try STU001/student123 or PRO001/work123",
+        session_id
+    )
+
+def logout(session_id):
+    sessions.delete(session_id)
+    return (
+        gr.update(visible=True),
+        gr.update(visible=False),
+        gr.update(visible=False),
+        "",
+        [],
+        None
+    )
+
+async def handle_chat(message, history, session_id):
+    """Stream the reply into the chat as tokens arrive"""
+    # Async handlers share the event loop: a shared store is called from a thread
+    session = await off_loop(store, sessions.load, session_id)
+    if not session["logged_in"]:
+        yield history + [[message, "⚠️ Please login first."]]
+        return
+    
+    if chatbot.needs_token and not session["hf_token"]:
+        yield history + [[message, "⚠️ Please set your HF token in Settings."]]
+        return
+    
+    if not await off_loop(store, chat_rate.allow, session["account_number"]):
+        metrics.inc("aira_fallbacks_total", reason="rate_limited")
+        yield history + [[message, "🚦 You're sending messages faster than AIra can answer. Please wait a minute."]]
+        return
+    
+    # Older turns fall off the chat so per-session memory stays bounded; a few
+    # at a time, so the model's context window doesn't shift every turn
+    previous = trim_history(history, CHAT_HISTORY_MAX_TURNS - 1)
+    history = previous + [[message, ""]]
+    partials = chatbot.generate_response(
+        message,
+        session["user_type"],
+        session["user_data"],
+        previous,
+        token=session["hf_token"]
+    )
+    # aclosing: if the browser goes, the model stream is closed now rather than at garbage collection
+    with metrics.timer("aira_request_seconds", handler="chat"):
+        async with aclosing(partials):
+            async for partial in partials:
+                history[-1][1] = partial
+                yield history
+
+def handle_feature_click(feature_name, session_id):
+    session = sessions.load(session_id)
+    if not session["logged_in"]:
+        return [[None, "⚠️ Please login first."]]
+    
+    with metrics.timer("aira_feature_seconds", feature=feature_name):
+        response = chatbot.get_feature_response(
+            feature_name,
+            session["user_type"],
+            session["user_data"]
+        )
+    
+    return [[None, response]]
+
+def handle_goal_update(goal_name, amount, session_id):
+    """Add to a savings goal (or withdraw, for a negative amount) and show the goals"""
+    session = sessions.load(session_id)
+    if not session["logged_in"]:
+        return [[None, "⚠️ Please login first."]]
+    if not amount:
+        return [[None, "⚠️ Enter an amount to add or withdraw."]]
+    
+    today = date.today()
+    book = get_goal_store().open_goals(session["account_number"], session["user_type"], today)
+    saved = book.saved[GOALS.index(goal_name)]
+    if amount < 0 and -amount > saved:
+        return [[None, f"❌ Only ₹{int(max(saved, 0)):,} saved for {goal_name}."]]
+    get_goal_store().record(session["account_number"], goal_name, amount, today)
+    return handle_feature_click("savings_goal", session_id)
+
+def handle_statement_upload(file_path, session_id, progress=gr.Progress()):
+    """Stream a bank CSV/OFX export into the user's ledger"""
+    session = sessions.load(session_id)
+    if not session["logged_in"]:
+        return [[None, "⚠️ Please login first."]]
+    if not file_path:
+        return [[None, "⚠️ Choose a CSV or OFX statement to upload."]]
+    
+    try:
+        with metrics.timer("aira_request_seconds", handler="statement_upload"):
+            result = statement_importer.run(
+                session["account_number"], file_path,
+                progress=lambda fraction, rows: progress(fraction, desc=f"Imported {rows:,} transactions")
+            )
+    except (ValueError, StopIteration, UnicodeDecodeError, OSError) as e:
+        return [[None, f"❌ Couldn't read that statement: {e}"]]
+    
+    forecast_store.invalidate(session["account_number"])
+    ledger = ledger_store.get(session["account_number"])
+    if ledger is not None:
+        get_bill_scheduler().import_recurring(session["account_number"], recurring_charges(ledger))
+    summary = f"✅ Imported {result['imported']:,} transactions"
+    if result["resumed"]:
+        summary += " (resumed where the last upload stopped)"
+    if result["duplicates"]:
+        summary += f", skipped {result['duplicates']:,} already imported"
+    if result["skipped"]:
+        summary += f", {result['skipped']:,} unreadable rows ignored"
+    breakdown = chatbot.get_feature_response("expense_categorization", session["user_type"], session["user_data"])
+    return [[None, f"{summary}.\n\n{breakdown}"]]
+
+def build_demo():
+    """The Gradio Blocks app, queued and ready to launch"""
+    with gr.Blocks(theme=gr.themes.Soft(), title="AIra Bot", css="""
+        .aira-title {
+            color: #FF1493 !important;
+            font-size: 48px !important;
+            font-weight: 700 !important;
+            text-align: center !important;
+            margin-bottom: 10px !important;
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif !important;
+        }
+        .aira-subtitle {
+            text-align: center !important;
+            color: #666 !important;
+            font-size: 18px !important;
+        }
+        """) as demo:
+        # Encrypted in localStorage; workers must share SESSION_SECRET to read it
+        session = gr.BrowserState(None, storage_key="aira_session", secret=SESSION_SECRET)
+        
+        gr.HTML("""
+        <div class="aira-title">💰 AIra Bot</div>
+        <div class="aira-subtitle">AI-Powered Financial Guidance</div>
+        """)
+        
+        with gr.Row():
+            with gr.Column(scale=1):
+                gr.Markdown("### ⚙️ Settings")
+                hf_token_input = gr.Textbox(
+                    label="Hugging Face Token",
+                    type="password",
+                    placeholder="hf_...",
+                    info="Get from huggingface.co/settings/tokens"
+                )
+                init_btn = gr.Button("Set Token", variant="primary")
+                init_status = gr.Textbox(label="Status", value="⚠️ Token not set", interactive=False)
+        
+        login_section = gr.Column(visible=True)
+        with login_section:
+            gr.Markdown("## 🔐 Login")
+            gr.Markdown("**Demo:** STU001/student123 or PRO001/work123")
+            with gr.Row():
+                account_input = gr.Textbox(label="Account", placeholder="STU001")
+                password_input = gr.Textbox(label="Password", type="password")
+            login_btn = gr.Button("Login", variant="primary")
+            login_status = gr.Textbox(label="Status", interactive=False)
+        
+        student_portal = gr.Column(visible=False)
+        with student_portal:
+            gr.Markdown("## 🎓 Student Portal")
+            
+            with gr.Tabs():
+                with gr.Tab("💬 Chat"):
+                    chatbot_s = gr.Chatbot(height=350)
+                    msg_s = gr.Textbox(placeholder="Ask about budgeting, savings...")
+                    with gr.Row():
+                        send_s = gr.Button("Send", variant="primary")
+                        clear_s = gr.Button("Clear")
+                
+                with gr.Tab("📊 Features"):
+                    with gr.Row():
+                        gr.Button("📊 Budget").click(lambda session: handle_feature_click("budget_summary", session), inputs=session, outputs=chatbot_s)
+                        gr.Button("📈 Expenses").click(lambda session: handle_feature_click("expense_categorization", session), inputs=session, outputs=chatbot_s)
+                        gr.Button("🎯 Goals").click(lambda session: handle_feature_click("savings_goal", session), inputs=session, outputs=chatbot_s)
+                    with gr.Row():
+                        gr.Button("🔔 Bills").click(lambda session: handle_feature_click("bill_reminder", session), inputs=session, outputs=chatbot_s)
+                        gr.Button("💎 Invest").click(lambda session: handle_feature_click("investment_suggestions", session), inputs=session, outputs=chatbot_s)
+                        gr.Button("💰 Net Worth").click(lambda session: handle_feature_click("net_worth", session), inputs=session, outputs=chatbot_s)
+                    with gr.Row():
+                        goal_s = gr.Dropdown(list(GOALS), value=GOALS[0], label="Savings goal")
+                        goal_amount_s = gr.Number(label="Amount (₹)", minimum=0, precision=0)
+                    with gr.Row():
+                        gr.Button("➕ Add to Goal").click(lambda goal, amount, session: handle_goal_update(goal, amount, session), inputs=[goal_s, goal_amount_s, session], outputs=chatbot_s)
+                        gr.Button("➖ Withdraw").click(lambda goal, amount, session: handle_goal_update(goal, -(amount or 0), session), inputs=[goal_s, goal_amount_s, session], outputs=chatbot_s)
+                    with gr.Row():
+                        statement_s = gr.File(label="Bank statement (CSV/OFX)", file_types=[".csv", ".ofx", ".qfx"], type="filepath")
+                    gr.Button("📥 Import Statement").click(handle_statement_upload, inputs=[statement_s, session], outputs=chatbot_s)
+            
+            logout_s = gr.Button("Logout", variant="stop")
+        
+        prof_portal = gr.Column(visible=False)
+        with prof_portal:
+            gr.Markdown("## 💼 Professional Portal")
+            
+            with gr.Tabs():
+                with gr.Tab("💬 Chat"):
+                    chatbot_p = gr.Chatbot(height=350)
+                    msg_p = gr.Textbox(placeholder="Ask about investments, taxes...")
+                    with gr.Row():
+                        send_p = gr.Button("Send", variant="primary")
+                        clear_p = gr.Button("Clear")
+                
+                with gr.Tab("📊 Features"):
+                    with gr.Row():
+                        gr.Button("📊 Budget").click(lambda session: handle_feature_click("budget_summary", session), inputs=session, outputs=chatbot_p)
+                        gr.Button("📈 Expenses").click(lambda session: handle_feature_click("expense_categorization", session), inputs=session, outputs=chatbot_p)
+                        gr.Button("🎯 Goals").click(lambda session: handle_feature_click("savings_goal", session), inputs=session, outputs=chatbot_p)
+                    with gr.Row():
+                        gr.Button("💰 Tax Tips").click(lambda session: handle_feature_click("tax_saving", session), inputs=session, outputs=chatbot_p)
+                        gr.Button("💎 Portfolio").click(lambda session: handle_feature_click("investment_suggestions", session), inputs=session, outputs=chatbot_p)
+                        gr.Button("📊 Cash Flow").click(lambda session: handle_feature_click("cash_flow", session), inputs=session, outputs=chatbot_p)
+                    with gr.Row():
+                        goal_p = gr.Dropdown(list(GOALS), value=GOALS[0], label="Savings goal")
+                        goal_amount_p = gr.Number(label="Amount (₹)", minimum=0, precision=0)
+                    with gr.Row():
+                        gr.Button("➕ Add to Goal").click(lambda goal, amount, session: handle_goal_update(goal, amount, session), inputs=[goal_p, goal_amount_p, session], outputs=chatbot_p)
+                        gr.Button("➖ Withdraw").click(lambda goal, amount, session: handle_goal_update(goal, -(amount or 0), session), inputs=[goal_p, goal_amount_p, session], outputs=chatbot_p)
+                    with gr.Row():
+                        statement_p = gr.File(label="Bank statement (CSV/OFX)", file_types=[".csv", ".ofx", ".qfx"], type="filepath")
+                    gr.Button("📥 Import Statement").click(handle_statement_upload, inputs=[statement_p, session], outputs=chatbot_p)
+            
+            logout_p = gr.Button("Logout", variant="stop")
+        
+        # Events
+        demo.load(restore_session, inputs=[session], outputs=[login_section, student_portal, prof_portal, login_status])
+        init_btn.click(initialize_chatbot, inputs=[hf_token_input, session], outputs=[init_status, session])
+        login_btn.click(login, inputs=[account_input, password_input, session], outputs=[login_section, student_portal, prof_portal, login_status, session])
+        
+        send_s.click(handle_chat, inputs=[msg_s, chatbot_s, session], outputs=[chatbot_s]).then(lambda: "", outputs=[msg_s])
+        msg_s.submit(handle_chat, inputs=[msg_s, chatbot_s, session], outputs=[chatbot_s]).then(lambda: "", outputs=[msg_s])
+        clear_s.click(lambda: [], outputs=[chatbot_s])
+        logout_s.click(logout, inputs=[session], outputs=[login_section, student_portal, prof_portal, login_status, chatbot_s, session])
+        
+        send_p.click(handle_chat, inputs=[msg_p, chatbot_p, session], outputs=[chatbot_p]).then(lambda: "", outputs=[msg_p])
+        msg_p.submit(handle_chat, inputs=[msg_p, chatbot_p, session], outputs=[chatbot_p]).then(lambda: "", outputs=[msg_p])
+        clear_p.click(lambda: [], outputs=[chatbot_p])
+        logout_p.click(logout, inputs=[session], outputs=[login_section, student_portal, prof_portal, login_status, chatbot_p, session])
+    
+    # Async chat handlers share the event loop; the limiter caps actual model calls
+    demo.queue(default_concurrency_limit=GRADIO_CONCURRENCY_LIMIT, max_size=GRADIO_QUEUE_MAX_SIZE)
+    return demo
+
+def launch(server_name=SERVER_NAME, server_port=SERVER_PORT, share=SHARE, debug=False, nightly_forecasts=True):
+    """Build the UI and serve it; blocks until the server stops"""
+    forecast_store.load_snapshot()
+    if nightly_forecasts:
+        forecast_store.start_nightly()
+    get_bill_scheduler().start()
+    if MODEL_WARM_UP and not chatbot.needs_token:
+        asyncio.run(chatbot.warm_up())  # Token-less backends can be woken before the first visitor
+    demo = build_demo()
+    demo.launch(server_name=server_name, server_port=server_port, share=share, debug=debug,
+                app_kwargs={"routes": metrics_routes()})
+    return demo
@@ -0,0 +1,328 @@
+"""Recurring bills: per-user min-heaps of due dates and a background tick.
+
+Bills are stored in SQLite with a recurrence rule and kept in memory in
+two heaps of (due date, ...) entries: one per account, so the next bills
+for a user come off the top in O(log n), and one global timeline ordered by
+when a reminder is due, so the tick only touches bills that need one.
+Entries are never updated in place; edits push a new entry with a new
+revision and stale ones are dropped when they surface. Reminders are queued
+in the same database, so whichever worker serves the user delivers them,
+and one a second worker's tick queues again is ignored.
+"""
+import calendar
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+
+from .config import BILL_DB_PATH, BILL_NOTIFY_DAYS, BILL_TICK_SECONDS
+from .metrics import metrics
+from .users import USER_DATABASE
+
+# Recurrence rules, stored as text: "monthly:<day>", "weekly:<0=Mon..6>",
+# "yearly:<MM-DD>" or "every:<days>" (counted from the first due date)
+def parse_rule(rule):
+    kind, _, value = rule.partition(":")
+    try:
+        if kind in ("monthly", "weekly", "every"):
+            number = int(value)
+            low, high = {"monthly": (1, 31), "weekly": (0, 6), "every": (1, 3660)}[kind]
+            if low <= number <= high:
+                return kind, number
+        elif kind == "yearly":
+            month, day = (int(part) for part in value.split("-"))
+            if 1 <= month <= 12 and 1 <= day <= calendar.monthrange(2024, month)[1]:
+                return kind, (month, day)
+    except ValueError:
+        pass
+    raise ValueError(f"Unknown recurrence rule {rule!r}; expected monthly:20, weekly:0, yearly:03-31 or every:14")
+
+def _clamped(year, month, day):
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+def next_due(rule, first_due, on_or_after):
+    """First occurrence of the rule on or after both dates"""
+    kind, value = parse_rule(rule)
+    day = max(first_due, on_or_after)
+    if kind == "monthly":
+        due = _clamped(day.year, day.month, value)
+        if due < day:
+            month = day.month % 12 + 1
+            due = _clamped(day.year + (month == 1), month, value)
+        return due
+    if kind == "weekly":
+        return day + timedelta(days=(value - day.weekday()) % 7)
+    if kind == "yearly":
+        due = _clamped(day.year, *value)
+        return due if due >= day else _clamped(day.year + 1, *value)
+    periods = -(-(day - first_due).days // value)
+    return first_due + timedelta(days=periods * value)
+
+def days_phrase(days):
+    return "today" if days == 0 else "tomorrow" if days == 1 else f"{days} days"
+
+class BillScheduler:
+    """Recurring bills for every account, with due-soon reminders.
+    
+    upcoming() pops the account's heap only as far as the horizon, rolling
+    bills whose date has passed onto their next occurrence on the way. tick()
+    pops the global timeline up to today and queues a reminder for each bill
+    entering its notice window, then schedules that bill's next occurrence.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bills (
+            account_number TEXT NOT NULL,
+            name TEXT NOT NULL,
+            amount INTEGER NOT NULL,
+            icon TEXT NOT NULL,
+            rule TEXT NOT NULL,
+            first_due TEXT NOT NULL,
+            active INTEGER NOT NULL DEFAULT 1,
+            updated_ns INTEGER NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS bills_account_name ON bills (account_number, name);
+        CREATE INDEX IF NOT EXISTS bills_updated ON bills (updated_ns);
+        CREATE TABLE IF NOT EXISTS reminders (
+            account_number TEXT NOT NULL,
+            name TEXT NOT NULL,
+            due TEXT NOT NULL,
+            message TEXT NOT NULL,
+            delivered INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (account_number, name, due)
+        );
+    """
+    UPSERT = """
+        INSERT INTO bills (account_number, name, amount, icon, rule, first_due, active, updated_ns)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (account_number, name) DO UPDATE SET
+            amount = excluded.amount, icon = excluded.icon, rule = excluded.rule,
+            first_due = excluded.first_due, active = excluded.active, updated_ns = excluded.updated_ns
+    """
+    # Rows another worker wrote are picked up by sync(); re-reading a few
+    # seconds back covers writes that committed after a later-stamped one
+    SYNC_OVERLAP_NS = 5 * 10**9
+    
+    def __init__(self, path=BILL_DB_PATH, notify_days=BILL_NOTIFY_DAYS, clock=date.today):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.notify_days = notify_days
+        self._clock = clock
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        self._lock = threading.Lock()
+        self._revisions = itertools.count(1)
+        self._bills = {}  # (account, name) -> bill dict
+        self._due = defaultdict(list)  # account -> heap of (due, name, rev)
+        self._timeline = []  # heap of (notify_on, due, account, name, rev)
+        self._synced_ns = 0
+        self.sync()
+    
+    def count(self):
+        with self._lock:
+            return len(self._bills)
+    
+    def add_many(self, bills):
+        """Insert or update bills from dicts (account_number, name, amount,
+        rule, first_due and optional icon); returns the number written"""
+        rows = []
+        now = time.time_ns()
+        for bill in bills:
+            parse_rule(bill["rule"])
+            rows.append((bill["account_number"], bill["name"], int(bill["amount"]), bill.get("icon", "🧾"),
+                         bill["rule"], bill["first_due"].isoformat(), 1, now))
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(self.UPSERT, rows)
+            for row in rows:
+                self._apply(row)
+        return len(rows)
+    
+    def add(self, account_number, name, amount, rule, first_due, icon="🧾"):
+        self.add_many([{"account_number": account_number, "name": name, "amount": amount,
+                        "rule": rule, "first_due": first_due, "icon": icon}])
+    
+    def remove(self, account_number, name):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("UPDATE bills SET active = 0, updated_ns = ? WHERE account_number = ? AND name = ?",
+                                   (time.time_ns(), account_number, name))
+            self._bills.pop((account_number, name), None)
+    
+    def sync(self):
+        """Load bills added or changed since the last sync, by any process"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT account_number, name, amount, icon, rule, first_due, active, updated_ns "
+                "FROM bills WHERE updated_ns > ?", (self._synced_ns - self.SYNC_OVERLAP_NS,)
+            ).fetchall()
+            for row in rows:
+                self._apply(row)
+                self._synced_ns = max(self._synced_ns, row[7])
+        return len(rows)
+    
+    def _apply(self, row):
+        """Bring one stored row into memory; caller holds the lock"""
+        account, name, amount, icon, rule, first_due, active, _ = row
+        key = (account, name)
+        current = self._bills.get(key)
+        if not active:
+            self._bills.pop(key, None)
+            return
+        first_due = date.fromisoformat(first_due)
+        if current is not None and (current["rule"], current["first_due"]) == (rule, first_due):
+            current.update(amount=amount, icon=icon)  # Same schedule: the heap entries stay valid
+            return
+        rev = next(self._revisions)
+        due = next_due(rule, first_due, self._clock())
+        self._bills[key] = {"account_number": account, "name": name, "amount": amount, "icon": icon,
+                            "rule": rule, "first_due": first_due, "due": due, "rev": rev}
+        heapq.heappush(self._due[account], (due, name, rev))
+        heapq.heappush(self._timeline, (due - timedelta(days=self.notify_days), due, account, name, rev))
+    
+    def _live(self, account, name, rev):
+        bill = self._bills.get((account, name))
+        return bill if bill is not None and bill["rev"] == rev else None
+    
+    def upcoming(self, account_number, today=None, days=31):
+        """The account's bills due within `days`, soonest first"""
+        today = today or self._clock()
+        horizon = today + timedelta(days=days)
+        found = []
+        with self._lock:
+            heap = self._due.get(account_number)
+            while heap and heap[0][0] <= horizon:
+                due, name, rev = heapq.heappop(heap)
+                bill = self._live(account_number, name, rev)
+                if bill is None or bill["due"] != due:
+                    continue  # Edited or removed since this entry was pushed
+                if due < today:
+                    bill["due"] = next_due(bill["rule"], bill["first_due"], today)
+                    heapq.heappush(heap, (bill["due"], name, rev))
+                    continue
+                found.append((due, name, rev))
+            for entry in found:
+                heapq.heappush(heap, entry)
+            return [dict(self._bills[account_number, name]) for _, name, _ in found]
+    
+    def tick(self, today=None):
+        """Queue reminders for bills entering their notice window; returns how many"""
+        today = today or self._clock()
+        reminders = []
+        with self._lock:
+            while self._timeline and self._timeline[0][0] <= today:
+                _, due, account, name, rev = heapq.heappop(self._timeline)
+                bill = self._live(account, name, rev)
+                if bill is None:
+                    continue
+                if due >= today:
+                    reminders.append((account, name, due.isoformat(),
+                                      f"{bill['icon']} {bill['name']} ₹{bill['amount']:,} due {due:%b %d} ({days_phrase((due - today).days)})"))
+                following = next_due(bill["rule"], bill["first_due"], max(due + timedelta(days=1), today))
+                heapq.heappush(self._timeline, (following - timedelta(days=self.notify_days), following, account, name, rev))
+            # Every worker ticks; the key keeps a reminder to one row however many queue it
+            with self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany("INSERT OR IGNORE INTO reminders (account_number, name, due, message) "
+                                       "VALUES (?, ?, ?, ?)", reminders)
+                sent = self._conn.total_changes - before
+                self._conn.execute("DELETE FROM reminders WHERE due < ?", (today.isoformat(),))
+        if sent:
+            metrics.inc("aira_bill_reminders_total", amount=sent)
+        return sent
+    
+    def pop_notifications(self, account_number, limit=20):
+        """Reminders queued for the account since it last asked, newest `limit` of them"""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")  # No other worker delivers the same rows meanwhile
+            rows = self._conn.execute(
+                "SELECT rowid, message FROM reminders WHERE account_number = ? AND delivered = 0 ORDER BY rowid",
+                (account_number,)
+            ).fetchall()
+            if rows:
+                self._conn.execute("UPDATE reminders SET delivered = 1 WHERE account_number = ? AND rowid <= ?",
+                                   (account_number, rows[-1][0]))
+        return [message for _, message in rows[-limit:]]
+    
+    def start(self, interval=BILL_TICK_SECONDS):
+        """Sync and tick every `interval` seconds on a daemon thread"""
+        def loop():
+            while True:
+                try:
+                    self.sync()
+                    self.tick()
+                except Exception as e:
+                    # Counted, not raised: the thread must live to run the next tick
+                    metrics.inc("aira_background_failures_total", job="bill_tick", error=type(e).__name__)
+                time.sleep(interval)
+        thread = threading.Thread(target=loop, name="bill-reminders", daemon=True)
+        thread.start()
+        return thread
+    
+    def import_recurring(self, account_number, charges):
+        """Track recurring charges found in a statement, as
+        [(merchant, amount, monthly, last charge date)]; returns how many"""
+        bills = []
+        for merchant, amount, monthly, last_date in charges:
+            rule = f"monthly:{last_date.day}" if monthly else f"yearly:{last_date:%m-%d}"
+            bills.append({"account_number": account_number, "name": merchant.title(), "amount": round(amount),
+                          "rule": rule, "first_due": last_date + timedelta(days=1), "icon": "🔁"})
+        return self.add_many(bills)
+    
+    def seed_demo_bills(self):
+        if self.count():
+            return
+        today = self._clock()
+        demo = {
+            "students": [("📱", "Mobile", 299, 2), ("🌐", "Wi-Fi", 500, 4), ("🏠", "Rent", 4000, 12), ("📺", "Netflix", 199, 13)],
+            "professionals": [("⚡", "Electricity", 2500, 2), ("💳", "Credit Card", 15000, 4),
+                              ("🏠", "Rent", 20000, 12), ("🚗", "Car EMI", 12000, 13)],
+        }
+        self.add_many(
+            {"account_number": account_number, "name": name, "amount": amount, "icon": icon,
+             "rule": f"monthly:{(today + timedelta(days=offset)).day}", "first_due": today}
+            for partition, bills in demo.items()
+            for account_number in USER_DATABASE[partition]
+            for icon, name, amount, offset in bills
+        )
+
+_scheduler_lock = threading.Lock()
+
+def get_bill_scheduler():
+    """The process-wide scheduler, loaded (and seeded with demo bills) on first
+    use; callers arriving together wait for the first one to load it"""
+    with _scheduler_lock:
+        return _open_bill_scheduler()
+
+@lru_cache(maxsize=None)
+def _open_bill_scheduler():
+    scheduler = BillScheduler()
+    scheduler.seed_demo_bills()
+    return scheduler
+
+BILL_BUCKETS = (
+    (3, "⚠️ **Urgent:**"),
+    (7, "📅 **This Week:**"),
+    (14, "📅 **Next Week:**"),
+    (None, "📅 **Later This Month:**"),
+)
+
+def render_bills(bills, today):
+    """Report for upcoming() bills, grouped by how soon they are due"""
+    def bucket(bill):
+        days = (bill["due"] - today).days
+        return next(title for limit, title in BILL_BUCKETS if limit is None or days <= limit)
+    
+    lines = ["🔔 **Bill Reminders**"]
+    for title, group in itertools.groupby(bills, key=bucket):
+        lines += ["", title]
+        for bill in group:
+            days = (bill["due"] - today).days
+            lines.append(f"- {bill['icon']} {bill['name']} - {bill['due']:%b %d} ({days_phrase(days)}) - ₹{bill['amount']:,}")
+    lines += ["", f"💰 Total upcoming: ₹{sum(bill['amount'] for bill in bills):,}"]
+    return "\n".join(lines)
@@ -0,0 +1,492 @@
+"""The chat engine: FinanceChatbot, the feature registry and conversation memory.
+
+Imports neither numpy nor gradio. Reports backed by the ledger, forecasts,
+simulation or tax engine load those modules on first use.
+"""
+import asyncio
+import random
+import time
+from contextlib import aclosing, asynccontextmanager
+from datetime import date
+from functools import lru_cache
+
+from .config import (
+    BREAKER_COOLDOWN_SECONDS, BREAKER_FAILURE_RATE, BREAKER_MIN_CALLS, BREAKER_SLOW_CALL_SECONDS,
+    BREAKER_SLOW_TOKEN_SECONDS, BREAKER_WINDOW, CHAT_HISTORY_MAX_TURNS, CONTEXT_EVICT_TURNS,
+    CONTEXT_TOKEN_BUDGET, CONTEXT_TURN_TOKENS, MAX_CONCURRENT_MODEL_CALLS, MAX_WAITING_MODEL_CALLS, MODEL_BACKEND,
+    MODEL_CALL_DEADLINE_SECONDS, MODEL_CLIENT_IDLE_SECONDS, MODEL_CLIENT_MAX_LEASES, MODEL_CLIENT_POOL_SIZE,
+    MODEL_FIRST_TOKEN_DEADLINE_SECONDS, MODEL_HEDGE_AFTER_SECONDS, MODEL_NAME, MODEL_WARM_UP,
+    RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS, ROUTE_SHORT_MODEL, TOKEN_RE
+)
+from .metrics import metrics
+from .model import (
+    CircuitBreaker, ClientPool, InferenceLimiter, ResponseCache, ServerBusy, amount_band, close_stream,
+    create_backend, delta_text
+)
+from .content import FAQ_ENTRIES, QUICK_TIPS
+from .reports import render_report
+from .routing import SHORT_INSTRUCTION, classify
+
+# Feature registry: feature name -> report generator(chatbot, user_type, user_data)
+FEATURE_REGISTRY = {}
+
+def register_feature(name):
+    """Register a report generator under a feature name.
+    
+    New features plug in without touching FinanceChatbot:
+        @register_feature("loan_planner")
+        def loan_planner(chatbot, user_type, user_data): ...
+    """
+    def decorator(func):
+        FEATURE_REGISTRY[name] = func
+        return func
+    return decorator
+
+# Conversation memory
+NOTICE_PREFIXES = ("⚠️", "❌", "🚦", "⏳")  # Status messages, not worth sending back to the model
+
+@lru_cache(maxsize=16384)
+def count_tokens(text):
+    """Rough model token count: one per punctuation mark, about one per
+    five characters of a word. Memoized, so a turn is only counted once."""
+    return sum(1 + len(piece) // 5 for piece in TOKEN_RE.findall(text))
+
+@lru_cache(maxsize=4096)
+def truncate_tokens(text, limit):
+    """`text` cut after about `limit` tokens"""
+    if count_tokens(text) <= limit:
+        return text
+    used = 0
+    for match in TOKEN_RE.finditer(text):
+        used += 1 + len(match.group()) // 5
+        if used > limit:
+            return text[:match.start()].rstrip() + " …"
+    return text
+
+def trim_history(history, max_turns=CHAT_HISTORY_MAX_TURNS):
+    """The newest turns of `history`, at most `max_turns`. The oldest are
+    dropped in whole steps of CONTEXT_EVICT_TURNS, so a turn keeps its
+    position modulo the step for the life of the chat."""
+    excess = len(history) - max_turns
+    if excess <= 0:
+        return history
+    return history[-(-excess // CONTEXT_EVICT_TURNS) * CONTEXT_EVICT_TURNS:]
+
+def build_context(history, budget=CONTEXT_TOKEN_BUDGET):
+    """Earlier chat turns as model messages, plus a one-line note on the
+    questions that no longer fit.
+    
+    Each message is cut to CONTEXT_TURN_TOKENS and the newest turns are kept
+    within `budget`. The window starts at a block of CONTEXT_EVICT_TURNS
+    turns where one fits, and blocks are counted from trim_history()'s
+    step-aligned start, so the prompt stays byte-identical across several
+    turns and backends can reuse their prefix cache. Work per call is
+    bounded by CHAT_HISTORY_MAX_TURNS, and token counts are memoized.
+    """
+    turns = []
+    for position, (user, reply) in enumerate(trim_history(history)):
+        if not reply or reply.startswith(NOTICE_PREFIXES):
+            continue
+        messages = [{"role": "user", "content": truncate_tokens(user, CONTEXT_TURN_TOKENS)}] if user else []
+        messages.append({"role": "assistant", "content": truncate_tokens(reply, CONTEXT_TURN_TOKENS)})
+        turns.append((position // CONTEXT_EVICT_TURNS, user, messages, sum(count_tokens(m["content"]) + 4 for m in messages)))
+    
+    # Earliest start of a block whose turns fit the budget; when no block
+    # start fits, the newest turns that do, rather than no history at all
+    used, earliest, aligned = 0, len(turns), None
+    for i in range(len(turns) - 1, -1, -1):
+        used += turns[i][3]
+        if used > budget:
+            break
+        earliest = i
+        if i == 0 or turns[i - 1][0] != turns[i][0]:
+            aligned = i
+    start = earliest if aligned is None else aligned
+    
+    dropped = [truncate_tokens(user, 15) for _, user, _, _ in turns[:start] if user][-5:]
+    note = f"Earlier in this chat the user asked about: {'; '.join(dropped)}" if dropped else ""
+    return [message for _, _, messages, _ in turns[start:] for message in messages], note
+
+class FinanceChatbot:
+    """Answers questions and renders reports. Holds no per-user state: the
+    HF token lives in each user's session and is passed in per request (its
+    client is pooled, see ClientPool), and answers are shared through `store`
+    when it is shared between workers."""
+    def __init__(self, backend=MODEL_BACKEND, store=None):
+        self.backend = backend
+        self.client = None  # Shared client for backends that need no token
+        self.pool = ClientPool(MODEL_CLIENT_IDLE_SECONDS, MODEL_CLIENT_POOL_SIZE, MODEL_CLIENT_MAX_LEASES)  # hf clients by token
+        self._warming = set()
+        self.limiter = InferenceLimiter(MAX_CONCURRENT_MODEL_CALLS, MAX_WAITING_MODEL_CALLS)
+        self.cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS,
+                                   shared=store if store is not None and store.shared else None)
+        self._faq = None
+        self.breaker = CircuitBreaker(BREAKER_WINDOW, BREAKER_MIN_CALLS, BREAKER_FAILURE_RATE,
+                                      BREAKER_SLOW_CALL_SECONDS, BREAKER_SLOW_TOKEN_SECONDS, BREAKER_COOLDOWN_SECONDS)
+        # Local backends need no token, so they are ready from the start
+        if backend != "hf":
+            self.client = create_backend(backend)
+    
+    @property
+    def needs_token(self):
+        return self.client is None
+    
+    def check_token(self, token):
+        """(status message, whether the token can be used)"""
+        if not self.needs_token:
+            return f"✅ Using the {self.backend} backend - no token needed.", False
+        if not token or not token.startswith("hf_"):
+            return "❌ Invalid token format. Should start with 'hf_'", False
+        return "✅ Token set successfully! AI features enabled.", True
+    
+    @asynccontextmanager
+    async def lease(self, token):
+        """Model client for a request made with this session's token (None without one)"""
+        if self.client is not None:
+            yield self.client
+        elif not token:
+            yield None
+        else:
+            async with self.pool.lease("hf", token) as client:
+                yield client
+    
+    async def warm_up(self, token=None):
+        """Open the client's connections and wake each routed model with a one-token request"""
+        started = time.monotonic()
+        async with self.lease(token) as client:
+            if client is None:
+                return
+            try:
+                await asyncio.wait_for(asyncio.gather(*(client.chat_completion(
+                    messages=[{"role": "user", "content": "Hi"}], max_tokens=1, model=model
+                ) for model in {MODEL_NAME, ROUTE_SHORT_MODEL})), MODEL_CALL_DEADLINE_SECONDS)
+            except Exception as e:
+                metrics.inc("aira_model_errors_total", stage="warm_up", error=type(e).__name__)
+                return
+        metrics.observe("aira_model_warm_up_seconds", time.monotonic() - started)
+    
+    def warm_up_soon(self, token=None):
+        """Start warm_up() in the background unless disabled or this token's client is already open"""
+        if not MODEL_WARM_UP or (self.client is None and (not token or ("hf", token) in self.pool)):
+            return
+        task = asyncio.ensure_future(self.warm_up(token))
+        self._warming.add(task)  # The loop only holds weak references to tasks
+        task.add_done_callback(self._warming.discard)
+    
+    async def generate_response(self, user_message, user_type, user_data, history=(), token=None):
+        """Stream AI response, yielding the reply accumulated so far.
+        
+        `history` is the chat so far as [user, reply] pairs; `token` is the
+        session's HF token.
+        """
+        async with self.lease(token) as client:
+            if client is None:
+                yield "⚠️ Please set your Hugging Face token first in the Settings."
+                return
+            # Closed right away when the browser goes, so the model stream below is too
+            async with aclosing(self._respond(client, user_message, user_type, user_data, history)) as partials:
+                async for partial in partials:
+                    yield partial
+    
+    async def _respond(self, client, user_message, user_type, user_data, history):
+        try:
+            # Create system prompt: amount bands, no name or exact figures, as
+            # answers are cached and served to every user in the same bands
+            if user_type == "student":
+                system_prompt = f"""You are a helpful financial advisor for students.
+User balance: {amount_band(user_data['balance'])}
+
+Provide practical advice on budgeting, savings, and student-friendly investments.
+Keep responses concise (under 200 words) and encouraging."""
+            else:
+                system_prompt = f"""You are an expert financial advisor for professionals.
+User salary: {amount_band(user_data['salary'])} | Balance: {amount_band(user_data['balance'])}
+
+Provide professional advice on investments, tax planning, and wealth building.
+Keep responses detailed but concise (under 250 words)."""
+
+            # Questions about the user's own figures get the exact report, not a model guess
+            route = classify(user_message, user_type)
+            metrics.inc("aira_query_routes_total", route=route.kind)
+            if route.kind == "feature":
+                metrics.inc("aira_answers_total", source="feature")
+                yield self.get_feature_response(route.feature, user_type, user_data)
+                return
+            
+            # The system prompt comes first and doesn't change between turns; the
+            # note on older questions follows it, changing only with the window
+            context, earlier = build_context(history)
+            messages = [
+                {"role": "system", "content": system_prompt},
+                *([{"role": "system", "content": earlier}] if earlier else []),
+                *context,
+                # With the question, so the prompt before it is the same whatever the route
+                {"role": "user", "content": f"{user_message}\n\n{SHORT_INSTRUCTION}" if route.kind == "short" else user_message}
+            ]
+            
+            # Common questions are answered locally without a model call; a question
+            # routed as detailed wants advice, so a canned tip at most, never a report
+            faq_answer = self.get_faq_answer(user_message, user_type, user_data, reports=route.kind != "detailed")
+            if faq_answer is not None:
+                metrics.inc("aira_answers_total", source="faq")
+                yield faq_answer
+                return
+            
+            # Near-identical questions from similar profiles reuse the last answer;
+            # follow-ups depend on the conversation, so only opening questions are cached
+            cache_key = None if len(messages) > 2 else self.cache.make_key(user_message, user_type, user_data)
+            cached = await self.cache.get_async(cache_key) if cache_key else None
+            if cached is not None:
+                metrics.inc("aira_answers_total", source="cache")
+                yield cached
+                return
+            
+            # Unhealthy endpoint: answer locally instead of waiting on timeouts
+            if not self.breaker.allow():
+                metrics.inc("aira_fallbacks_total", reason="breaker_open")
+                yield f"⚠️ The AI model is having trouble right now. Here's a quick tip instead:\n\n{self.get_quick_tip(user_type, user_message)}"
+                return
+            
+            # A half-open probe that ends without an outcome (busy, cancelled, the
+            # browser gone) is handed back, or the breaker would wait on it forever
+            probe = self.breaker.probes if self.breaker.state == CircuitBreaker.HALF_OPEN else None
+            try:
+                async with aclosing(self._model_answer(client, messages, route, cache_key, user_type, user_message)) as partials:
+                    async for partial in partials:
+                        yield partial
+            finally:
+                if probe is not None:
+                    self.breaker.release_probe(probe)
+        
+        except ServerBusy:
+            metrics.inc("aira_fallbacks_total", reason="busy")
+            yield f"🚦 AIra is answering a lot of questions right now. Please try again in a few seconds.\n\n{self.get_quick_tip(user_type, user_message)}"
+        except Exception as e:
+            metrics.inc("aira_fallbacks_total", reason="error")
+            metrics.inc("aira_model_errors_total", stage="request", error=type(e).__name__)
+            yield f"❌ Error: {str(e)}\n\nPlease verify your token at huggingface.co/settings/tokens"
+    
+    async def _model_answer(self, client, messages, route, cache_key, user_type, user_message):
+        """Stream the model's answer within the call deadlines, retrying once without streaming"""
+        if self.limiter.is_saturated():
+            yield f"⏳ All model slots are busy ({self.limiter.waiting + 1} waiting). Your answer will start shortly..."
+        
+        queued = time.monotonic()
+        async with self.limiter.slot():
+            started = time.monotonic()
+            metrics.observe("aira_model_queue_seconds", started - queued)
+            deadline = started + MODEL_CALL_DEADLINE_SECONDS
+            chunks = []
+            try:
+                first_text, stream = await asyncio.wait_for(
+                    self._hedged_stream_start(client, messages, route), MODEL_FIRST_TOKEN_DEADLINE_SECONDS
+                )
+                first_token = time.monotonic() - started
+                metrics.observe("aira_model_first_token_seconds", first_token)
+                # Closed however it ends (done, deadline, cut short, browser gone):
+                # an abandoned stream otherwise holds its connection
+                try:
+                    if first_text:
+                        chunks.append(first_text)
+                        yield first_text
+                    while stream is not None:
+                        try:
+                            message = await asyncio.wait_for(stream.__anext__(), max(deadline - time.monotonic(), 0))
+                        except StopAsyncIteration:
+                            break
+                        text = delta_text(message)
+                        if text:
+                            chunks.append(text)
+                            yield "".join(chunks)
+                finally:
+                    await close_stream(stream)
+                
+                elapsed = time.monotonic() - started
+                self.breaker.record_success(first_token, (elapsed - first_token) / max(len(chunks), 1))
+                metrics.observe("aira_model_generation_seconds", elapsed)
+                metrics.observe("aira_model_tokens_per_second", len(chunks) / max(elapsed, 1e-6))
+                metrics.inc("aira_answers_total", source="model")
+                response = "".join(chunks).strip()
+                if response and cache_key:
+                    await self.cache.put_async(cache_key, response)
+                yield response if response else "No response generated. Please try again."
+            
+            except Exception as stream_error:
+                self.breaker.record_failure()
+                metrics.inc("aira_model_errors_total", stage="stream", error=type(stream_error).__name__)
+                if chunks:
+                    metrics.inc("aira_fallbacks_total", reason="cut_short")
+                    yield "".join(chunks).strip() + "\n\n⚠️ Response cut short - the model stopped responding."
+                    return
+                
+                # Fallback: try non-streaming within what's left of the deadline
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.breaker.allow():
+                    metrics.inc("aira_fallbacks_total", reason="timeout")
+                    yield f"⚠️ Model timeout. Here's a quick tip instead:\n\n{self.get_quick_tip(user_type, user_message)}"
+                    return
+                try:
+                    retry_started = time.monotonic()
+                    result = await asyncio.wait_for(client.chat_completion(
+                        messages=messages,
+                        max_tokens=route.max_tokens,
+                        model=route.model,
+                        temperature=route.temperature
+                    ), remaining)
+                    retry_elapsed = time.monotonic() - retry_started
+                    response = result.choices[0].message.content
+                    # No first token to time on a whole answer: judge it per token
+                    # (the usage count when the endpoint reports one, else words)
+                    usage = getattr(result, "usage", None)
+                    tokens = getattr(usage, "completion_tokens", None) or len((response or "").split())
+                    self.breaker.record_success(seconds_per_token=retry_elapsed / max(tokens, 1))
+                    metrics.observe("aira_model_generation_seconds", retry_elapsed)
+                    metrics.inc("aira_answers_total", source="retry")
+                    if response and cache_key:
+                        await self.cache.put_async(cache_key, response)
+                    yield response
+                except Exception as retry_error:
+                    self.breaker.record_failure()
+                    metrics.inc("aira_model_errors_total", stage="retry", error=type(retry_error).__name__)
+                    metrics.inc("aira_fallbacks_total", reason="retry_failed")
+                    yield f"⚠️ Model timeout. Here's a quick tip instead:\n\n{self.get_quick_tip(user_type, user_message)}"
+    
+    async def _start_stream(self, client, messages, route):
+        """Open a streaming completion within the route's budget and wait for its first content delta"""
+        stream = await client.chat_completion(
+            messages=messages,
+            max_tokens=route.max_tokens,
+            model=route.model,
+            stream=True,
+            temperature=route.temperature
+        )
+        stream = stream.__aiter__()
+        try:
+            async for message in stream:
+                text = delta_text(message)
+                if text:
+                    return text, stream
+        except BaseException:
+            await close_stream(stream)  # Failed, or cancelled as a hedge loser or past the deadline
+            raise
+        return "", None
+    
+    async def _hedged_stream_start(self, client, messages, route):
+        """First token from the primary call, or from a duplicate call fired
+        if the primary hasn't produced one after MODEL_HEDGE_AFTER_SECONDS"""
+        primary = asyncio.ensure_future(self._start_stream(client, messages, route))
+        if MODEL_HEDGE_AFTER_SECONDS <= 0:
+            return await primary
+        
+        pending = {primary}
+        error = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=MODEL_HEDGE_AFTER_SECONDS)
+            if done:
+                return primary.result()
+            
+            pending.add(asyncio.ensure_future(self._start_stream(client, messages, route)))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [task for task in done if task.exception() is None]
+                if winners:
+                    for loser in winners[1:]:
+                        await close_stream(loser.result()[1])
+                    return winners[0].result()
+                error = next(iter(done)).exception()
+            raise error
+        finally:
+            for task in pending:
+                # One that finished after the winner was picked still has an open stream
+                if not task.cancel() and not task.cancelled() and task.exception() is None:
+                    await close_stream(task.result()[1])
+    
+    @property
+    def faq(self):
+        """FAQ index, loaded (with numpy) on the first question"""
+        if self._faq is None:
+            from .faq import FaqIndex
+            self._faq = FaqIndex.load_or_build(FAQ_ENTRIES)
+        return self._faq
+    
+    def get_quick_tip(self, user_type, message):
+        """Fallback tips when AI fails"""
+        return random.choice(QUICK_TIPS.get(user_type, QUICK_TIPS["student"]))
+    
+    def get_faq_answer(self, user_message, user_type, user_data, reports=True):
+        """Instant answer from the FAQ index, or None if no confident match;
+        a feature report only if `reports`"""
+        entry = self.faq.lookup(user_message, user_type, reports)
+        if entry is None:
+            return None
+        if "feature" in entry:
+            return self.get_feature_response(entry["feature"], user_type, user_data)
+        return entry["tip"]
+    
+    def get_feature_response(self, feature_name, user_type, user_data):
+        """Generate only the requested feature report"""
+        generator = FEATURE_REGISTRY.get(feature_name)
+        if generator is None:
+            return "Feature coming soon!"
+        return generator(self, user_type, user_data)
+    
+    def render_report(self, feature_name, user_type, user_data):
+        return render_report(feature_name, user_type, user_data["balance"], user_data.get("salary"), date.today())
+    
+    @register_feature("budget_summary")
+    def generate_budget_summary(self, user_type, user_data):
+        return self.render_report("budget_summary", user_type, user_data)
+    
+    @register_feature("expense_categorization")
+    def categorize_expenses(self, user_type, user_data):
+        from .ledger import ledger_store, render_expense_breakdown
+        ledger = ledger_store.get(user_data.get("account_number"))
+        if ledger is not None and len(ledger):
+            return render_expense_breakdown(ledger)
+        return self.render_report("expense_categorization", user_type, user_data)
+    
+    @register_feature("savings_goal")
+    def track_savings_goal(self, user_type, user_data):
+        from .goals import get_goal_store, render_goals
+        today = date.today()
+        return render_goals(get_goal_store().open_goals(user_data.get("account_number"), user_type, today), today)
+    
+    @register_feature("bill_reminder")
+    def get_bill_reminders(self, user_type, user_data):
+        from .bills import get_bill_scheduler, render_bills
+        today = date.today()
+        bills = get_bill_scheduler().upcoming(user_data.get("account_number"), today)
+        if bills:
+            return render_bills(bills, today)
+        return "🔔 **Bill Reminders**\n\nNo bills due in the next month. Import a statement and your recurring charges show up here."
+    
+    @register_feature("investment_suggestions")
+    def suggest_investments(self, user_type, user_data):
+        return self.render_report("investment_suggestions", user_type, user_data)
+    
+    @register_feature("net_worth")
+    def calculate_net_worth(self, user_type, user_data):
+        from .networth import get_net_worth_store, render_net_worth
+        history = get_net_worth_store().record_balance(user_data.get("account_number"), user_data["balance"], date.today())
+        return render_net_worth(history.summary(), user_type)
+    
+    @register_feature("tax_saving")
+    def tax_saving_tips(self, user_type, user_data):
+        return self.render_report("tax_saving", user_type, user_data)
+    
+    @register_feature("subscription_tracker")
+    def track_subscriptions(self, user_type, user_data):
+        from .ledger import detect_subscriptions, ledger_store, render_subscriptions
+        ledger = ledger_store.get(user_data.get("account_number"))
+        subscriptions = detect_subscriptions(ledger) if ledger is not None else []
+        if subscriptions:
+            return render_subscriptions(subscriptions)
+        return self.render_report("subscription_tracker", user_type, user_data)
+    
+    @register_feature("cash_flow")
+    def predict_cash_flow(self, user_type, user_data):
+        from .forecast import forecast_store, render_forecast
+        forecast = forecast_store.get(user_data.get("account_number"), user_data["balance"])
+        if forecast is not None:
+            return render_forecast(forecast)
+        return self.render_report("cash_flow", user_type, user_data)
@@ -0,0 +1,105 @@
+"""`aira-bot` command line: parse launch options, then load the app.
+
+Options that map to settings are written to the AIRA_* environment before
+the app is imported, since config reads them once at import time.
+`aira-bot import-users <csv>` adds or updates accounts instead of serving.
+"""
+import argparse
+import os
+import secrets
+
+from . import __version__
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="aira-bot", description="Serve the AIra Bot finance assistant.")
+    parser.add_argument("--host", default=None, help="interface to bind (default 127.0.0.1, or AIRA_SERVER_NAME)")
+    parser.add_argument("--port", type=int, default=None, help="port to serve on (default 7860, or AIRA_SERVER_PORT)")
+    parser.add_argument("--share", action=argparse.BooleanOptionalAction, default=None,
+                        help="open a public gradio.live link (default off, or AIRA_SHARE=1)")
+    parser.add_argument("--debug", action="store_true", help="block and print errors to the console, as in Colab")
+    parser.add_argument("--backend", choices=("hf", "llamacpp", "stub"), help="model backend (AIRA_MODEL_BACKEND)")
+    parser.add_argument("--model", help="model name for the hf backend (AIRA_MODEL_NAME)")
+    parser.add_argument("--data-dir", help="where the user store, ledgers and indexes live (AIRA_DATA_DIR)")
+    parser.add_argument("--store", help="sessions, cached answers and rate limits: memory:// or redis://host:port/db "
+                                        "(AIRA_STORE_URL)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes on consecutive ports from --port (default 1, or AIRA_WORKERS); "
+                             "needs a redis:// store and a load balancer with sticky sessions in front")
+    parser.add_argument("--no-metrics", action="store_true", help="don't record or serve /metrics")
+    parser.add_argument("--no-nightly-forecasts", action="store_true", help="don't start the nightly forecast batch")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    import_users = commands.add_parser("import-users", help="add or update accounts from a CSV file, then exit")
+    import_users.add_argument("csv", help="header row of account_number, user_type, name, password, balance, salary "
+                                          "(or password_salt, password_hash, hash_iterations instead of password)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    settings = {
+        "AIRA_MODEL_BACKEND": args.backend,
+        "AIRA_MODEL_NAME": args.model,
+        "AIRA_DATA_DIR": args.data_dir,
+        "AIRA_STORE_URL": args.store,
+        "AIRA_METRICS": "0" if args.no_metrics else None,
+    }
+    for name, value in settings.items():
+        if value is not None:
+            os.environ[name] = value
+    
+    if args.command == "import-users":
+        import_users(args.csv)
+        return
+    
+    from .config import SERVER_PORT, SHARE, STORE_URL, WORKERS
+    
+    options = {"debug": args.debug, "nightly_forecasts": not args.no_nightly_forecasts}
+    if args.host is not None:
+        options["server_name"] = args.host
+    if args.share is not None:
+        options["share"] = args.share
+    port = args.port if args.port is not None else SERVER_PORT
+    workers = args.workers if args.workers is not None else WORKERS
+    if workers <= 1:
+        serve({**options, "server_port": port})
+        return
+    
+    if STORE_URL.startswith("memory://"):
+        parser.error("--workers needs a store they can share, e.g. --store redis://localhost:6379/0")
+    if options.get("share", SHARE):
+        parser.error("--share tunnels to a single worker; put the workers behind a load balancer instead")
+    # Every worker must decrypt the session id a browser got from any other
+    os.environ.setdefault("AIRA_SESSION_SECRET", secrets.token_urlsafe(24))
+    import multiprocessing
+    
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        # One nightly forecast batch is enough; the other workers pick up its snapshot on their next Cash Flow request
+        context.Process(target=serve, name=f"aira-worker-{i}", args=({
+            **options, "server_port": port + i, "nightly_forecasts": options["nightly_forecasts"] and i == 0
+        },))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def import_users(path):
+    # Straight into the store: opening it for the app would seed the demo accounts first
+    from .users import UserStore
+    
+    store = UserStore()
+    written = store.import_csv(path)
+    print(f"Imported {written:,} accounts into {store.path}")
+
+
+def serve(options):
+    # gradio and the model client load here, after the settings are in place
+    from . import app
+    
+    app.launch(**options)
@@ -0,0 +1,122 @@
+"""Settings, read once from AIRA_* environment variables.
+
+Stdlib only, so every module can import it without pulling in numpy or
+gradio.
+"""
+import os
+import re
+
+# Local state (user store, indexes) lives here
+DATA_DIR = os.environ.get("AIRA_DATA_DIR", os.path.join(os.path.expanduser("~"), ".cache", "aira_bot"))
+
+# User store
+USER_DB_PATH = os.environ.get("AIRA_USER_DB", os.path.join(DATA_DIR, "users.db"))
+USER_DB_POOL_SIZE = int(os.environ.get("AIRA_USER_DB_POOL_SIZE", "8"))
+# PBKDF2-SHA256 rounds: fixed cost keeps login latency predictable (~50 ms)
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("AIRA_PASSWORD_HASH_ITERATIONS", "120000"))
+
+# Model backend: "hf" (remote Inference API), "llamacpp" (local GGUF on CPU) or "stub"
+MODEL_BACKEND = os.environ.get("AIRA_MODEL_BACKEND", "hf")
+MODEL_NAME = os.environ.get("AIRA_MODEL_NAME", "ibm-granite/granite-3.3-2b-instruct")
+MODEL_MAX_TOKENS = int(os.environ.get("AIRA_MODEL_MAX_TOKENS", "500"))  # Reduced for faster response
+MODEL_TEMPERATURE = float(os.environ.get("AIRA_MODEL_TEMPERATURE", "0.7"))
+LOCAL_MODEL_PATH = os.environ.get("AIRA_LOCAL_MODEL_PATH", "granite-3.3-2b-instruct-Q4_K_M.gguf")
+LOCAL_MODEL_THREADS = int(os.environ.get("AIRA_LOCAL_MODEL_THREADS", str(os.cpu_count() or 4)))
+LOCAL_MODEL_CONTEXT = int(os.environ.get("AIRA_LOCAL_MODEL_CONTEXT", "4096"))
+STUB_TOKENS_PER_SECOND = float(os.environ.get("AIRA_STUB_TOKENS_PER_SECOND", "0"))  # 0 = instant
+# hf clients are pooled by token so requests reuse their keep-alive connections
+MODEL_CLIENT_IDLE_SECONDS = float(os.environ.get("AIRA_MODEL_CLIENT_IDLE_SECONDS", "300"))
+MODEL_CLIENT_POOL_SIZE = int(os.environ.get("AIRA_MODEL_CLIENT_POOL_SIZE", "256"))
+# An hf client keeps every response it streamed until it closes, so it is replaced after this many leases
+MODEL_CLIENT_MAX_LEASES = int(os.environ.get("AIRA_MODEL_CLIENT_MAX_LEASES", "50"))
+MODEL_WARM_UP = os.environ.get("AIRA_MODEL_WARM_UP", "1") == "1"  # One-token request on startup and when a token is set
+# Query routing: numeric questions go to feature reports, short ones get a small budget
+ROUTE_SHORT_MAX_TOKENS = int(os.environ.get("AIRA_ROUTE_SHORT_MAX_TOKENS", "150"))
+ROUTE_SHORT_TEMPERATURE = float(os.environ.get("AIRA_ROUTE_SHORT_TEMPERATURE", "0.3"))
+ROUTE_SHORT_MODEL = os.environ.get("AIRA_ROUTE_SHORT_MODEL", MODEL_NAME)  # A smaller model can take the quick questions
+ROUTE_SHORT_MAX_WORDS = 12  # Longer questions get the full budget
+
+# Inference concurrency: model calls are multiplexed on one event loop (per worker)
+MAX_CONCURRENT_MODEL_CALLS = int(os.environ.get("AIRA_MAX_CONCURRENT_MODEL_CALLS", "8"))
+MAX_WAITING_MODEL_CALLS = int(os.environ.get("AIRA_MAX_WAITING_MODEL_CALLS", "32"))
+GRADIO_CONCURRENCY_LIMIT = int(os.environ.get("AIRA_GRADIO_CONCURRENCY_LIMIT", "64"))
+GRADIO_QUEUE_MAX_SIZE = int(os.environ.get("AIRA_GRADIO_QUEUE_MAX_SIZE", "256"))
+
+# Response cache for model answers
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("AIRA_RESPONSE_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("AIRA_RESPONSE_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+# Salary/balance are bucketed into these bands so similar profiles share answers
+AMOUNT_BUCKET_EDGES = (10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000)
+
+# Local FAQ index answered before the model is called
+FAQ_INDEX_DIR = os.environ.get("AIRA_FAQ_INDEX_DIR", DATA_DIR)
+FAQ_CONFIDENCE_THRESHOLD = float(os.environ.get("AIRA_FAQ_CONFIDENCE_THRESHOLD", "0.7"))
+FAQ_EMBEDDING_DIM = 2048
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Model endpoint health: deadlines, hedging and circuit breaker
+MODEL_FIRST_TOKEN_DEADLINE_SECONDS = float(os.environ.get("AIRA_MODEL_FIRST_TOKEN_DEADLINE_SECONDS", "10"))
+MODEL_CALL_DEADLINE_SECONDS = float(os.environ.get("AIRA_MODEL_CALL_DEADLINE_SECONDS", "45"))
+MODEL_HEDGE_AFTER_SECONDS = float(os.environ.get("AIRA_MODEL_HEDGE_AFTER_SECONDS", "0"))  # 0 disables hedging
+BREAKER_WINDOW = int(os.environ.get("AIRA_BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.environ.get("AIRA_BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATE = float(os.environ.get("AIRA_BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_SLOW_CALL_SECONDS = float(os.environ.get("AIRA_BREAKER_SLOW_CALL_SECONDS", "5"))  # To the first token
+BREAKER_SLOW_TOKEN_SECONDS = float(os.environ.get("AIRA_BREAKER_SLOW_TOKEN_SECONDS", "0.5"))  # Between tokens
+BREAKER_COOLDOWN_SECONDS = float(os.environ.get("AIRA_BREAKER_COOLDOWN_SECONDS", "30"))
+
+# Conversation memory: earlier turns sent with each question, within a token budget
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("AIRA_CONTEXT_TOKEN_BUDGET", "1200"))
+CONTEXT_TURN_TOKENS = int(os.environ.get("AIRA_CONTEXT_TURN_TOKENS", "200"))  # Older messages are cut to this
+CONTEXT_EVICT_TURNS = 4  # The window start moves in steps of this many turns
+CHAT_HISTORY_MAX_TURNS = int(os.environ.get("AIRA_CHAT_HISTORY_MAX_TURNS", "40"))  # Kept per chat session
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Request metrics, served in Prometheus text format next to the app
+METRICS_ENABLED = os.environ.get("AIRA_METRICS", "1") == "1"
+METRICS_PATH = os.environ.get("AIRA_METRICS_PATH", "/metrics")
+
+# Serving: defaults for `aira-bot` launch options
+SERVER_NAME = os.environ.get("AIRA_SERVER_NAME", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("AIRA_SERVER_PORT", "7860"))
+SHARE = os.environ.get("AIRA_SHARE", "0") == "1"  # Public gradio.live tunnel
+WORKERS = int(os.environ.get("AIRA_WORKERS", "1"))  # Worker processes, on consecutive ports
+
+# Shared state: sessions, cached answers and rate limits. memory:// keeps them in
+# this process; a redis:// URL shares them between workers
+STORE_URL = os.environ.get("AIRA_STORE_URL", "memory://")
+SESSION_TTL_SECONDS = int(os.environ.get("AIRA_SESSION_TTL_SECONDS", str(60 * 60)))  # Idle sessions expire
+SESSION_SECRET = os.environ.get("AIRA_SESSION_SECRET")  # Encrypts the session id in the browser; same for all workers
+CHAT_RATE_LIMIT = int(os.environ.get("AIRA_CHAT_RATE_LIMIT", "20"))  # Messages per account per minute, 0 = no limit
+
+# Transaction ledger: per-user columnar arrays built from bank CSV/OFX exports
+LEDGER_DIR = os.environ.get("AIRA_LEDGER_DIR", os.path.join(DATA_DIR, "ledgers"))
+LEDGER_MAX_SEGMENTS = int(os.environ.get("AIRA_LEDGER_MAX_SEGMENTS", "32"))
+IMPORT_CHUNK_ROWS = int(os.environ.get("AIRA_IMPORT_CHUNK_ROWS", "20000"))
+
+# Cash-flow forecasting
+FORECAST_HISTORY_DAYS = 365
+FORECAST_HORIZON_DAYS = 365
+FORECAST_BASELINE_DAYS = 90
+FORECAST_BATCH_USERS = int(os.environ.get("AIRA_FORECAST_BATCH_USERS", "2000"))
+FORECAST_BATCH_HOUR = int(os.environ.get("AIRA_FORECAST_BATCH_HOUR", "2"))  # Local time
+
+# Bill reminders
+BILL_DB_PATH = os.environ.get("AIRA_BILL_DB", os.path.join(DATA_DIR, "bills.db"))
+BILL_NOTIFY_DAYS = int(os.environ.get("AIRA_BILL_NOTIFY_DAYS", "3"))  # Remind this many days before a bill is due
+BILL_TICK_SECONDS = int(os.environ.get("AIRA_BILL_TICK_SECONDS", "60"))
+
+# Net-worth history
+NETWORTH_DIR = os.environ.get("AIRA_NETWORTH_DIR", os.path.join(DATA_DIR, "networth"))
+NETWORTH_TREND_DAYS = 90
+
+# Savings goals
+GOALS_DIR = os.environ.get("AIRA_GOALS_DIR", os.path.join(DATA_DIR, "goals"))
+GOALS_COMPACT_EVENTS = int(os.environ.get("AIRA_GOALS_COMPACT_EVENTS", "10000"))  # Fold a log into balances past this many events
+
+# Monte Carlo projection behind investment suggestions
+SIMULATION_PATHS = int(os.environ.get("AIRA_SIMULATION_PATHS", "10000"))
+SIMULATION_SEED = int(os.environ.get("AIRA_SIMULATION_SEED", "2024"))
+SIMULATION_WORKERS = int(os.environ.get("AIRA_SIMULATION_WORKERS", str(os.cpu_count() or 1)))
+FD_RATE = 0.07  # Fixed-deposit benchmark for "chance of beating FD"
@@ -0,0 +1,55 @@
+"""Static advice content: fallback tips and canned FAQ answers."""
+
+# Fallback tips when AI fails; also seed the FAQ index
+QUICK_TIPS = {
+    "student": [
+        "💡 Start with the 50/30/20 rule: 50% needs, 30% wants, 20% savings",
+        "💡 Track expenses daily using a simple notebook or app",
+        "💡 Consider opening a recurring deposit (RD) account for disciplined savings",
+        "💡 Use student discounts whenever available - they add up!"
+    ],
+    "professional": [
+        "💡 Maximize 80C deductions (₹1.5L) through ELSS, PPF, or insurance",
+        "💡 Build an emergency fund covering 6 months of expenses",
+        "💡 Diversify investments: 60% equity, 30% debt, 10% gold",
+        "💡 Review and rebalance your portfolio quarterly"
+    ]
+}
+
+# Canned answers: a quick tip, or a feature report rendered with the user's data
+FAQ_ENTRIES = [
+    {"audience": "student", "tip": QUICK_TIPS["student"][0],
+     "questions": ["what is the 50 30 20 rule", "how should i split my money", "how much of my money should i save"]},
+    {"audience": "student", "tip": QUICK_TIPS["student"][1],
+     "questions": ["how do i track my expenses", "how can i keep track of spending", "best way to track daily expenses"]},
+    {"audience": "student", "tip": QUICK_TIPS["student"][2],
+     "questions": ["what is a recurring deposit", "should i open an rd account", "how can i save money regularly"]},
+    {"audience": "student", "tip": QUICK_TIPS["student"][3],
+     "questions": ["how can i save money as a student", "are student discounts worth it", "tips to save money in college"]},
+    {"audience": "professional", "tip": QUICK_TIPS["professional"][0],
+     "questions": ["what is 80c", "what is section 80c", "how much can i claim under 80c", "what are 80c deductions"]},
+    {"audience": "professional", "tip": QUICK_TIPS["professional"][1],
+     "questions": ["how big should my emergency fund be", "what is an emergency fund", "how many months of expenses should i keep"]},
+    {"audience": "professional", "tip": QUICK_TIPS["professional"][2],
+     "questions": ["how should i diversify my investments", "what is a good asset allocation", "how much equity debt and gold"]},
+    {"audience": "professional", "tip": QUICK_TIPS["professional"][3],
+     "questions": ["how often should i rebalance my portfolio", "when should i review my portfolio", "what is portfolio rebalancing"]},
+    {"audience": "any", "feature": "budget_summary",
+     "questions": ["show my budget", "budget summary", "what should my monthly budget be", "recommended monthly budget"]},
+    {"audience": "any", "feature": "expense_categorization",
+     "questions": ["show my expenses", "expense categories", "where does my money go", "what did i spend on last month"]},
+    {"audience": "any", "feature": "savings_goal",
+     "questions": ["savings goal tracker", "how close am i to my savings goal", "show my savings goals"]},
+    {"audience": "any", "feature": "bill_reminder",
+     "questions": ["bill reminders", "what bills are due", "upcoming bills", "when is my rent due"]},
+    {"audience": "any", "feature": "investment_suggestions",
+     "questions": ["where should i invest", "investment ideas", "suggest investments", "show my investment portfolio"]},
+    {"audience": "any", "feature": "net_worth",
+     "questions": ["what is my net worth", "calculate my net worth", "show my assets and liabilities"]},
+    {"audience": "any", "feature": "tax_saving",
+     "questions": ["how do i save tax", "how can i save tax", "tax saving tips", "how to reduce my income tax"]},
+    {"audience": "any", "feature": "subscription_tracker",
+     "questions": ["show my subscriptions", "subscription tracker", "how much do i spend on subscriptions"]},
+    {"audience": "any", "feature": "cash_flow",
+     "questions": ["cash flow", "how long will my balance last", "predict my cash flow", "what is my runway"]},
+]
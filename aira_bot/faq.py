@@ -0,0 +1,84 @@
+"""Local FAQ index answered before the model is called."""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .config import FAQ_CONFIDENCE_THRESHOLD, FAQ_EMBEDDING_DIM, FAQ_INDEX_DIR, WORD_RE
+
+STOP_WORDS = frozenset("a an and are do does i is it me my of on should show the to what when where which how can".split())
+
+class FaqIndex:
+    """Hashed TF-IDF index of FAQ questions with vectorized cosine lookup.
+    
+    The matrix is built once and saved as .npy; later starts memory-map it.
+    The file name carries a fingerprint of the corpus, so editing
+    FAQ_ENTRIES rebuilds it automatically.
+    """
+    def __init__(self, entries, matrix, idf):
+        self.entries = entries
+        self.matrix = matrix
+        self.idf = idf
+        self.row_entry = np.array([i for i, entry in enumerate(entries) for _ in self._documents(entry)])
+        self.row_audience = np.array([entries[i]["audience"] for i in self.row_entry])
+        self.row_report = np.array(["feature" in entries[i] for i in self.row_entry])
+    
+    @staticmethod
+    def _documents(entry):
+        return entry["questions"] + ([entry["tip"]] if "tip" in entry else [])
+    
+    @staticmethod
+    def _term_counts(text):
+        words = [w for w in WORD_RE.findall(text.lower()) if w not in STOP_WORDS]
+        terms = words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+        counts = np.zeros(FAQ_EMBEDDING_DIM, dtype=np.float32)
+        for term in terms:
+            digest = int.from_bytes(hashlib.blake2b(term.encode(), digest_size=4).digest(), "little")
+            counts[digest % FAQ_EMBEDDING_DIM] += 1.0
+        return counts
+    
+    @classmethod
+    def build(cls, entries):
+        documents = [doc for entry in entries for doc in cls._documents(entry)]
+        counts = np.stack([cls._term_counts(doc) for doc in documents])
+        doc_freq = np.count_nonzero(counts, axis=0)
+        idf = (np.log((1 + len(documents)) / (1 + doc_freq)) + 1).astype(np.float32)
+        matrix = counts * idf
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        return matrix, idf
+    
+    @classmethod
+    def load_or_build(cls, entries, index_dir=FAQ_INDEX_DIR):
+        fingerprint = hashlib.sha1(json.dumps([entries, FAQ_EMBEDDING_DIM], sort_keys=True).encode()).hexdigest()[:12]
+        path = os.path.join(index_dir, f"faq_index_{fingerprint}.npy")
+        if not os.path.exists(path):
+            matrix, idf = cls.build(entries)
+            try:
+                os.makedirs(index_dir, exist_ok=True)
+                # The idf vector is stored as the last row of the saved matrix; written
+                # aside and renamed so workers starting together never map half a file
+                partial = f"{path}.{os.getpid()}.tmp"
+                with open(partial, "wb") as f:
+                    np.save(f, np.vstack([matrix, idf]))
+                os.replace(partial, path)
+            except OSError:
+                return cls(entries, matrix, idf)
+        stored = np.load(path, mmap_mode="r")
+        return cls(entries, stored[:-1], stored[-1])
+    
+    def lookup(self, message, user_type, reports=True):
+        """Best matching entry for the message, or None below the threshold;
+        tips only, without the feature report entries, unless `reports`"""
+        query = self._term_counts(message) * self.idf
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        scores = self.matrix @ (query / norm)
+        scores[(self.row_audience != "any") & (self.row_audience != user_type)] = -1.0
+        if not reports:
+            scores[self.row_report] = -1.0
+        best = int(np.argmax(scores))
+        if scores[best] < FAQ_CONFIDENCE_THRESHOLD:
+            return None
+        return self.entries[self.row_entry[best]]
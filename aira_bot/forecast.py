@@ -0,0 +1,274 @@
+"""Cash-flow forecasts from ledger history, batched nightly."""
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from .config import (
+    DATA_DIR, FORECAST_BASELINE_DAYS, FORECAST_BATCH_HOUR, FORECAST_BATCH_USERS,
+    FORECAST_HISTORY_DAYS, FORECAST_HORIZON_DAYS
+)
+from .ledger import find_recurring, ledger_store
+from .metrics import metrics
+from .users import get_user_store
+
+class CashFlowForecaster:
+    """Daily balance forecasts for a batch of users in one vectorized pass.
+    
+    From each ledger's last FORECAST_HISTORY_DAYS days it fits:
+    - recurring bills and income (find_recurring over debits and credits),
+      replayed on their day of month (clamped to short months) or on the
+      anniversary for yearly charges;
+    - discretionary spend: the mean daily non-recurring spend over the last
+      FORECAST_BASELINE_DAYS, shaped by a per-user day-of-week profile.
+    Everything is an (users x days) matrix, so a nightly batch over the
+    whole user base is a handful of bincounts and one cumsum.
+    """
+    def __init__(self, history_days=FORECAST_HISTORY_DAYS, horizon_days=FORECAST_HORIZON_DAYS,
+                 baseline_days=FORECAST_BASELINE_DAYS):
+        self.history_days = history_days
+        self.horizon_days = horizon_days
+        self.baseline_days = baseline_days
+    
+    def forecast(self, ledgers, balances, start=None):
+        """Forecast dicts (see _summarize) for parallel lists of ledgers and
+        current balances, projecting from `start` (default today)"""
+        users = len(ledgers)
+        start = np.datetime64(start or date.today(), "D").astype(np.int64)
+        H, F = self.history_days, self.horizon_days
+        
+        # Flatten all ledgers, keeping each user's last HISTORY days
+        sizes = np.array([len(ledger) for ledger in ledgers])
+        owners = np.repeat(np.arange(users), sizes)
+        dates = np.concatenate([ledger.dates.astype(np.int64) for ledger in ledgers]) if users else np.zeros(0, np.int64)
+        amounts = np.concatenate([ledger.amounts for ledger in ledgers]) if users else np.zeros(0)
+        merchants = np.concatenate([ledger.merchants for ledger in ledgers]) if users else np.zeros(0, object)
+        last_day = np.array([ledger.dates.max().astype(np.int64) if len(ledger) else start for ledger in ledgers])
+        first_day = np.array([ledger.dates.min().astype(np.int64) if len(ledger) else start for ledger in ledgers])
+        history_start = last_day - H + 1
+        keep = dates >= history_start[owners]
+        owners, dates, amounts, merchants = owners[keep], dates[keep], amounts[keep], merchants[keep]
+        span = np.clip(last_day - np.maximum(first_day, history_start) + 1, 1, H)
+        
+        # Recurring bills and income
+        debit = amounts < 0
+        bills, bill_rows = find_recurring(owners[debit], merchants[debit], dates[debit], -amounts[debit])
+        income, _ = find_recurring(owners[~debit], merchants[~debit], dates[~debit], amounts[~debit])
+        
+        # Discretionary spend matrix (users x history days)
+        discretionary = np.flatnonzero(debit)[~bill_rows]
+        cells = owners[discretionary] * H + (dates[discretionary] - history_start[owners[discretionary]])
+        spend = np.bincount(cells, weights=-amounts[discretionary], minlength=users * H).reshape(users, H)
+        
+        window = np.minimum(span, self.baseline_days)
+        recent = np.arange(H)[None, :] >= (H - window)[:, None]
+        baseline = (spend * recent).sum(axis=1) / window
+        
+        valid = np.arange(H)[None, :] >= (H - span)[:, None]
+        weekday = (history_start[:, None] + np.arange(H)[None, :] + 3) % 7  # 1970-01-01 was a Thursday
+        slot = (np.arange(users)[:, None] * 7 + weekday)[valid]
+        dow_spend = np.bincount(slot, weights=spend[valid], minlength=users * 7).reshape(users, 7)
+        dow_days = np.bincount(slot, minlength=users * 7).reshape(users, 7)
+        overall = spend.sum(axis=1) / span
+        with np.errstate(divide="ignore", invalid="ignore"):
+            profile = np.where((dow_days > 0) & (overall[:, None] > 0), dow_spend / dow_days / overall[:, None], 1.0)
+        profile = 0.7 * profile + 0.3  # Shrink toward flat; a year has only ~52 of each weekday
+        
+        # Future calendar
+        future = start + np.arange(F)
+        future_dates = future.astype("datetime64[D]")
+        months = future_dates.astype("datetime64[M]")
+        day_of_month = (future_dates - months).astype(np.int64) + 1
+        days_in_month = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+        month_end = day_of_month == days_in_month
+        future_weekday = (future + 3) % 7
+        
+        outflow = baseline[:, None] * profile[:, future_weekday]
+        outflow += self._replay(bills, users, future, day_of_month, month_end)
+        inflow = self._replay(income, users, future, day_of_month, month_end)
+        balance = np.asarray(balances, dtype=np.float64)[:, None] + np.cumsum(inflow - outflow, axis=1)
+        
+        monthly_bills = np.bincount(bills["owner"], weights=np.where(bills["monthly"], bills["amount"], bills["amount"] / 12), minlength=users)
+        monthly_income = np.bincount(income["owner"], weights=np.where(income["monthly"], income["amount"], income["amount"] / 12), minlength=users)
+        return [
+            self._summarize(balance[u], future_dates, month_end, baseline[u], profile[u], monthly_bills[u], monthly_income[u], balances[u])
+            for u in range(users)
+        ]
+    
+    @staticmethod
+    def _replay(charges, users, future, day_of_month, month_end):
+        """(users x horizon) matrix of recurring amounts on their due days"""
+        out = np.zeros((users, len(future)))
+        monthly = charges["monthly"]
+        # Monthly: amounts by (user, day of month); days past a short month's end land on its last day
+        due_day = (charges["last_date"][monthly].astype("datetime64[D]") -
+                   charges["last_date"][monthly].astype("datetime64[D]").astype("datetime64[M]")).astype(np.int64)
+        by_day = np.bincount(charges["owner"][monthly] * 31 + due_day, weights=charges["amount"][monthly],
+                             minlength=users * 31).reshape(users, 31)
+        from_day = np.cumsum(by_day[:, ::-1], axis=1)[:, ::-1]
+        out += np.where(month_end, from_day[:, day_of_month - 1], by_day[:, day_of_month - 1])
+        # Yearly: few per user, placed on each anniversary inside the horizon
+        for owner, amount, last in zip(charges["owner"][~monthly], charges["amount"][~monthly], charges["last_date"][~monthly]):
+            due = last + 365 * np.ceil((future[0] - last) / 365).astype(np.int64)
+            while due <= future[-1]:
+                out[owner, due - future[0]] += amount
+                due += 365
+        return out
+    
+    @staticmethod
+    def _summarize(balance, dates, month_end, baseline, profile, monthly_bills, monthly_income, current):
+        negative = np.flatnonzero(balance < 0)
+        lowest = int(np.argmin(balance))
+        return {
+            "as_of": date.today(),
+            "balance": current,
+            "daily_spend": float(baseline),
+            "weekend_factor": float(profile[5:].mean()),
+            "monthly_bills": float(monthly_bills),
+            "monthly_income": float(monthly_income),
+            "month_end_balances": balance[month_end][:12].round().astype(np.int64).tolist(),
+            "month_end_dates": dates[month_end][:12].tolist(),
+            "lowest_balance": float(balance[lowest]),
+            "lowest_date": dates[lowest].item(),
+            "runs_out": dates[negative[0]].item() if len(negative) else None,
+            "year_change": float(balance[-1] - current),
+        }
+
+class ForecastStore:
+    """Precomputed forecasts by account, served by the Cash Flow button.
+    
+    The nightly batch (one worker runs it) fills it for every account with a
+    ledger and saves a dated snapshot. Every worker loads today's snapshot
+    at start and again from get() once a new one is written. A forecast is
+    reused while it is from today and neither the balance it started from
+    nor the ledger (in any worker) has changed; otherwise the user is
+    forecast alone on demand.
+    """
+    def __init__(self, forecaster, directory=DATA_DIR):
+        self.forecaster = forecaster
+        self.directory = directory
+        self._forecasts = {}
+        self._snapshot = None  # (path, mtime) of the snapshot last loaded
+        self._lock = threading.Lock()
+    
+    def _snapshot_path(self, day):
+        return os.path.join(self.directory, f"forecasts-{day:%Y%m%d}.json")
+    
+    def load_snapshot(self, day=None):
+        """Load the day's snapshot unless it is the one already loaded; one stat() when it is"""
+        path = self._snapshot_path(day or date.today())
+        try:
+            stamp = (path, os.stat(path).st_mtime_ns)
+        except OSError:
+            return
+        if stamp == self._snapshot:
+            return
+        with open(path) as f:
+            saved = json.load(f)
+        with self._lock:
+            for account, forecast in saved.items():
+                self._forecasts[account] = self._decode(forecast)
+            self._snapshot = stamp
+    
+    @staticmethod
+    def _decode(forecast):
+        forecast = dict(forecast)
+        for key in ("as_of", "lowest_date", "runs_out"):
+            if forecast[key] is not None:
+                forecast[key] = date.fromisoformat(forecast[key])
+        forecast["month_end_dates"] = [date.fromisoformat(d) for d in forecast["month_end_dates"]]
+        return forecast
+    
+    def invalidate(self, account_number):
+        with self._lock:
+            self._forecasts.pop(account_number, None)
+    
+    def get(self, account_number, balance):
+        self.load_snapshot()  # Another worker's nightly batch may have written a new one
+        with self._lock:
+            forecast = self._forecasts.get(account_number)
+        version = ledger_store.version(account_number)
+        if (forecast is not None and forecast["as_of"] == date.today() and forecast["balance"] == balance
+                and forecast.get("ledger_version") == version):
+            return forecast
+        ledger = ledger_store.get(account_number)
+        if ledger is None or not len(ledger):
+            return None
+        forecast = {**self.forecaster.forecast([ledger], [balance])[0], "ledger_version": version}
+        with self._lock:
+            self._forecasts[account_number] = forecast
+        return forecast
+    
+    def run_batch(self, batch_size=FORECAST_BATCH_USERS):
+        """Forecast every account with a ledger; returns the number forecast"""
+        if not os.path.isdir(ledger_store.directory):
+            return 0
+        accounts = sorted(os.listdir(ledger_store.directory))
+        balances = get_user_store().balances(accounts)
+        accounts = [account for account in accounts if account in balances]
+        results = {}
+        for i in range(0, len(accounts), batch_size):
+            chunk = accounts[i:i + batch_size]
+            versions = [ledger_store.version(account) for account in chunk]
+            ledgers = [ledger_store.load(account) for account in chunk]
+            chunk = [(account, version, ledger) for account, version, ledger in zip(chunk, versions, ledgers)
+                     if ledger is not None and len(ledger)]
+            forecasts = self.forecaster.forecast([ledger for _, _, ledger in chunk], [balances[a] for a, _, _ in chunk])
+            results.update((account, {**forecast, "ledger_version": version})
+                           for (account, version, _), forecast in zip(chunk, forecasts))
+        with self._lock:
+            self._forecasts.update(results)
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._snapshot_path(date.today())
+        # Written aside and renamed, so other workers never load half a file
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "w") as f:
+            json.dump(results, f, default=str)
+        os.replace(partial, path)
+        self._snapshot = (path, os.stat(path).st_mtime_ns)  # Already in memory
+        return len(results)
+    
+    def start_nightly(self, hour=FORECAST_BATCH_HOUR):
+        """Run run_batch() every day at `hour` on a daemon thread"""
+        def loop():
+            while True:
+                now = datetime.now()
+                next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+                if next_run <= now:
+                    next_run += timedelta(days=1)
+                time.sleep((next_run - now).total_seconds())
+                try:
+                    self.run_batch()
+                except Exception as e:
+                    # Counted, not raised: the thread must live to run tomorrow's batch
+                    metrics.inc("aira_background_failures_total", job="nightly_forecast", error=type(e).__name__)
+        thread = threading.Thread(target=loop, name="nightly-forecast", daemon=True)
+        thread.start()
+        return thread
+
+forecast_store = ForecastStore(CashFlowForecaster())
+
+def render_forecast(forecast):
+    runway = (f"⚠️ Runs out around {forecast['runs_out']:%b %d, %Y}" if forecast["runs_out"]
+              else "✅ Stays positive for the next 12 months")
+    lines = [
+        "📊 **Cash Flow Forecast**",
+        "",
+        f"**Balance:** ₹{int(forecast['balance']):,}",
+        f"**Daily Spend:** ₹{int(forecast['daily_spend']):,} (weekends ×{forecast['weekend_factor']:.1f})",
+        f"**Recurring:** ₹{int(forecast['monthly_bills']):,}/mo bills · ₹{int(forecast['monthly_income']):,}/mo income",
+        "",
+        "📅 **12-Month Outlook:**",
+        runway,
+        f"Lowest: ₹{int(forecast['lowest_balance']):,} on {forecast['lowest_date']:%b %d, %Y}",
+        "",
+        "💰 **Month-End Balance:**",
+    ]
+    for month, (day, balance) in enumerate(zip(forecast["month_end_dates"], forecast["month_end_balances"]), 1):
+        if month in (1, 2, 3, 6, 9, 12):
+            lines.append(f"M{month} ({day:%b}): ₹{balance:,}")
+    lines += ["", f"12-month change: ₹{int(forecast['year_change']):,}"]
+    return "\n".join(lines)
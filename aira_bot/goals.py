@@ -0,0 +1,271 @@
+"""Savings goals: an append-only event log per account, materialized on read.
+
+Deposits, withdrawals and target changes are fixed-size records appended
+to `goals/<account>.log`. Each goal's running total, target and last-30-day
+pace are kept in memory and updated per event, so the report never replays
+the log. A log is replayed (vectorized with numpy) only when an account is
+first loaded, and compacted into carried-over balances once it grows past
+GOALS_COMPACT_EVENTS.
+"""
+import os
+import shutil
+import struct
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from .config import GOALS_COMPACT_EVENTS, GOALS_DIR
+from .users import USER_DATABASE
+
+try:
+    import fcntl  # Serializes appends and compaction between worker processes
+except ImportError:
+    fcntl = None
+
+GOALS = ("Emergency", "Vacation", "Home DP")
+GOAL_ICONS = ("🛟", "🏖️", "🏠")
+# (target, days to reach it) per goal, set when an account first opens its goals
+DEFAULT_TARGETS = {
+    "student": ((5_000, 180), (10_000, 365), (50_000, 1825)),
+    "professional": ((50_000, 180), (40_000, 365), (200_000, 1825)),
+}
+PACE_DAYS = 30
+
+# Event kinds. CARRIED is written by compaction: the balance built up by
+# events that were folded away, so it counts toward the total but not the pace.
+DEPOSIT, WITHDRAW, TARGET, CARRIED = 1, 2, 3, 4
+EVENT = struct.Struct("<iBBdi")  # day ordinal, kind, goal, amount, deadline ordinal (TARGET only)
+EVENT_DTYPE = np.dtype([("day", "<i4"), ("kind", "u1"), ("goal", "u1"), ("amount", "<f8"), ("deadline", "<i4")])
+
+class GoalBook:
+    """One account's goals, materialized from its events"""
+    def __init__(self):
+        self.saved = [0.0] * len(GOALS)
+        self.targets = [0.0] * len(GOALS)
+        self.deadlines = [None] * len(GOALS)
+        self.started = [None] * len(GOALS)
+        self.recent = [deque() for _ in GOALS]  # (day ordinal, signed amount) inside the pace window
+        self.recent_sum = [0.0] * len(GOALS)
+        self.events = 0
+    
+    def apply(self, day, kind, goal, amount, deadline):
+        """Fold one event into the totals, O(1)"""
+        self.events += 1
+        if self.started[goal] is None or day < self.started[goal]:
+            self.started[goal] = day
+        if kind == TARGET:
+            self.targets[goal] = amount
+            self.deadlines[goal] = deadline
+        elif kind == CARRIED:
+            self.saved[goal] += amount
+        else:
+            signed = amount if kind == DEPOSIT else -amount
+            self.saved[goal] += signed
+            self.recent[goal].append((day, signed))
+            self.recent_sum[goal] += signed
+    
+    @classmethod
+    def replay(cls, data, today):
+        """Book for a whole log in a few array passes instead of one call per event"""
+        book = cls()
+        events = np.frombuffer(data, EVENT_DTYPE)
+        if not len(events):
+            return book
+        kinds, goals, amounts, days = events["kind"], events["goal"], events["amount"], events["day"]
+        signed = np.where(kinds == WITHDRAW, -amounts, np.where((kinds == DEPOSIT) | (kinds == CARRIED), amounts, 0.0))
+        book.saved = np.bincount(goals, weights=signed, minlength=len(GOALS)).tolist()
+        starts = np.full(len(GOALS), np.iinfo(np.int32).max)
+        np.minimum.at(starts, goals, days)
+        book.started = [int(day) if day != np.iinfo(np.int32).max else None for day in starts]
+        for i in np.flatnonzero(kinds == TARGET):  # One per goal change: few
+            book.targets[goals[i]] = float(amounts[i])
+            book.deadlines[goals[i]] = int(events["deadline"][i])
+        flows = (kinds == DEPOSIT) | (kinds == WITHDRAW)
+        for i in np.flatnonzero(flows & (days >= today.toordinal() - PACE_DAYS)):
+            book.recent[goals[i]].append((int(days[i]), float(signed[i])))
+            book.recent_sum[goals[i]] += float(signed[i])
+        book.events = len(events)
+        return book
+    
+    def pace(self, goal, today):
+        """Net saved per day over the last PACE_DAYS days"""
+        recent = self.recent[goal]
+        cutoff = today.toordinal() - PACE_DAYS
+        while recent and recent[0][0] < cutoff:
+            self.recent_sum[goal] -= recent.popleft()[1]
+        return self.recent_sum[goal] / PACE_DAYS
+    
+    def compacted(self, today):
+        """Events that rebuild this book: targets, carried balances and the pace window"""
+        records = []
+        for goal in range(len(GOALS)):
+            self.pace(goal, today)  # Drop events that left the window
+            started = self.started[goal] or today.toordinal()
+            if self.deadlines[goal] is not None:
+                records.append((started, TARGET, goal, self.targets[goal], self.deadlines[goal]))
+            records.append((started, CARRIED, goal, self.saved[goal] - self.recent_sum[goal], 0))
+            records += [(day, DEPOSIT if amount >= 0 else WITHDRAW, goal, abs(amount), 0) for day, amount in self.recent[goal]]
+        return records
+
+@contextmanager
+def _exclusive(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+class GoalStore:
+    """Goal books by account, each backed by an append-only event log.
+    
+    A loaded book is topped up from the log's tail when another worker has
+    appended, and reloaded when compaction has replaced the file.
+    """
+    def __init__(self, directory=GOALS_DIR, compact_events=GOALS_COMPACT_EVENTS):
+        self.directory = directory
+        self.compact_events = compact_events
+        self._books = {}  # account -> (inode, bytes read, book)
+        self._lock = threading.Lock()
+    
+    def _path(self, account_number):
+        return os.path.join(self.directory, f"{account_number}.log")
+    
+    def get(self, account_number, today=None):
+        """The account's goals, or None if it has no log yet"""
+        today = today or date.today()
+        path = self._path(account_number)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            inode, offset, book = self._books.get(account_number, (None, 0, None))
+            if inode != stat.st_ino:
+                offset, book = 0, None
+            if book is None or stat.st_size > offset:
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read(stat.st_size - offset)
+                data = data[:len(data) - len(data) % EVENT.size]  # A record still being written
+                if book is None:
+                    book = GoalBook.replay(data, today)
+                else:
+                    for event in EVENT.iter_unpack(data):
+                        book.apply(*event)
+                offset += len(data)
+            self._books[account_number] = (stat.st_ino, offset, book)
+            return book
+    
+    def append(self, account_number, events):
+        """Append (day, kind, goal, amount, deadline) events, compacting the log when it gets long"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(account_number)
+        data = b"".join(EVENT.pack(day.toordinal(), kind, goal, float(amount), deadline) for day, kind, goal, amount, deadline in events)
+        while True:
+            with open(path, "ab") as f, _exclusive(f):
+                # Compaction may have swapped the file while we waited for the lock
+                if os.path.exists(path) and os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                    f.write(data)
+                    break
+        book = self.get(account_number)
+        if book.events >= self.compact_events:
+            self.compact(account_number)
+        return self.get(account_number)
+    
+    def compact(self, account_number, today=None):
+        """Rewrite the log as the few events that rebuild the current state"""
+        today = today or date.today()
+        path = self._path(account_number)
+        with open(path, "ab") as f, _exclusive(f):
+            book = self.get(account_number, today)
+            records = book.compacted(today)
+            partial = f"{path}.{os.getpid()}.tmp"
+            with open(partial, "wb") as out:
+                out.write(b"".join(EVENT.pack(*record) for record in records))
+            os.replace(partial, path)
+    
+    def open_goals(self, account_number, user_type, today):
+        """The account's goals, creating the default targets on first use"""
+        book = self.get(account_number, today)
+        if book is not None:
+            return book
+        return self.append(account_number, [
+            (today, TARGET, goal, target, (today + timedelta(days=days)).toordinal())
+            for goal, (target, days) in enumerate(DEFAULT_TARGETS[user_type])
+        ])
+    
+    def record(self, account_number, goal_name, amount, today):
+        """Deposit into (or, for a negative amount, withdraw from) a goal"""
+        goal = GOALS.index(goal_name)
+        return self.append(account_number, [(today, DEPOSIT if amount >= 0 else WITHDRAW, goal, abs(amount), 0)])
+    
+    def seed_demo_goals(self, today):
+        """Weekly deposits for the demo accounts, adding up to the old tracker's figures.
+        
+        Written to a scratch directory that is renamed into place, so threads
+        or workers starting together seed it exactly once.
+        """
+        if os.path.isdir(self.directory) and os.listdir(self.directory):
+            return
+        scratch = f"{self.directory}.seed-{os.getpid()}-{threading.get_ident()}"
+        os.makedirs(scratch, exist_ok=True)
+        demo = {
+            "students": ((5_000, 12, 3_200), (10_000, 240, 2_000), (50_000, 1500, 0)),
+            "professionals": ((50_000, 0, 50_000), (40_000, 200, 25_000), (200_000, 1400, 75_000)),
+        }
+        for partition, goals in demo.items():
+            for account_number in USER_DATABASE[partition]:
+                start = (today - timedelta(weeks=40)).toordinal()
+                events = [(start, TARGET, goal, target, (today + timedelta(days=days_left)).toordinal())
+                          for goal, (target, days_left, _) in enumerate(goals)]
+                for week in range(40, 0, -1):
+                    day = (today - timedelta(weeks=week) + timedelta(days=3)).toordinal()
+                    events += [(day, DEPOSIT, goal, saved / 40, 0) for goal, (_, _, saved) in enumerate(goals) if saved]
+                with open(os.path.join(scratch, f"{account_number}.log"), "wb") as f:
+                    f.write(b"".join(EVENT.pack(*event) for event in events))
+        try:
+            os.rename(scratch, self.directory)
+        except OSError:
+            shutil.rmtree(scratch)  # Another thread or worker seeded it first
+
+@lru_cache(maxsize=None)
+def get_goal_store():
+    """The process-wide store, with demo goals seeded on first use"""
+    store = GoalStore()
+    store.seed_demo_goals(date.today())
+    return store
+
+def render_goals(book, today):
+    lines = ["🎯 **Savings Goals**"]
+    for goal, (name, icon) in enumerate(zip(GOALS, GOAL_ICONS)):
+        saved, target = max(book.saved[goal], 0), book.targets[goal]
+        share = min(saved / target, 1) if target else 0
+        blocks = int(share * 10)
+        lines += ["", f"**{icon} {name}** - ₹{int(saved):,} of ₹{int(target):,} ({share:.0%})",
+                  "🟩" * blocks + "⬜" * (10 - blocks)]
+        remaining = target - saved
+        if remaining <= 0:
+            lines.append("✅ Reached!")
+            continue
+        
+        days_left = book.deadlines[goal] - today.toordinal()
+        pace = book.pace(goal, today)
+        needed = f"₹{remaining / days_left:,.0f}/day needed" if days_left > 0 else "⚠️ deadline passed"
+        lines.append(f"Remaining ₹{int(remaining):,} · {max(days_left, 0)} days left · {needed}")
+        if pace > 0 and remaining / pace > 100 * 365:
+            lines.append(f"Pace ₹{pace:,.0f}/day (last {PACE_DAYS} days) → over 100 years at this rate ⚠️")
+        elif pace > 0:
+            done = today + timedelta(days=-(-remaining // pace))
+            late = " ⚠️ after the deadline" if done.toordinal() > book.deadlines[goal] else " ✅ on track"
+            lines.append(f"Pace ₹{pace:,.0f}/day (last {PACE_DAYS} days) → done around {done:%b %d, %Y}{late}")
+        else:
+            lines.append(f"💡 No deposits in the last {PACE_DAYS} days - add some to get back on track")
+    saved = sum(max(s, 0) for s in book.saved)
+    lines += ["", f"💰 **Total saved:** ₹{int(saved):,} of ₹{int(sum(book.targets)):,}"]
+    return "\n".join(lines)
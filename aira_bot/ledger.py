@@ -0,0 +1,637 @@
+"""Transaction ledger: bank statement import, merchant categorization and
+per-user columnar storage."""
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from .config import IMPORT_CHUNK_ROWS, LEDGER_DIR, LEDGER_MAX_SEGMENTS
+
+# Category id -> (label, emoji); ids index the ledger's int16 category column
+CATEGORIES = [
+    ("Other", "📦"),
+    ("Income", "💵"),
+    ("Food", "🍽️"),
+    ("Groceries", "🛒"),
+    ("Rent", "🏠"),
+    ("Travel", "🚌"),
+    ("Bills", "⚡"),
+    ("EMIs", "💳"),
+    ("Entertainment", "🎬"),
+    ("Shopping", "👔"),
+    ("Education", "📚"),
+    ("Health", "🏥"),
+    ("Savings", "💰"),
+    ("Cash", "🏧"),
+]
+CATEGORY_ID = {label: i for i, (label, _) in enumerate(CATEGORIES)}
+
+# Merchant keywords (single or multi-word) matched through a word trie
+CATEGORY_KEYWORDS = {
+    "Food": ["swiggy", "zomato", "restaurant", "cafe", "dominos", "mcdonalds", "kfc", "pizza hut",
+             "starbucks", "canteen", "mess", "eatclub", "barbeque nation"],
+    "Groceries": ["bigbasket", "big bazaar", "dmart", "blinkit", "zepto", "grocery", "supermarket",
+                  "reliance fresh", "more retail", "jiomart", "instamart", "kirana"],
+    "Rent": ["rent", "landlord", "hostel", "nobroker", "house rent"],
+    "Travel": ["uber", "ola", "rapido", "irctc", "metro", "petrol", "fuel", "indigo", "air india",
+               "makemytrip", "redbus", "fastag", "indian oil", "bharat petroleum", "hpcl"],
+    "Bills": ["electricity", "bescom", "tata power", "adani electricity", "water board", "piped gas",
+              "broadband", "airtel", "jio", "vodafone", "act fibernet", "wifi", "recharge", "dth"],
+    "EMIs": ["emi", "loan", "credit card", "bajaj finance", "home loan", "car loan"],
+    "Entertainment": ["netflix", "spotify", "hotstar", "prime video", "bookmyshow", "pvr", "inox",
+                      "youtube premium", "sonyliv", "zee5", "steam"],
+    "Shopping": ["amazon", "flipkart", "myntra", "ajio", "nykaa", "meesho", "decathlon", "croma"],
+    "Education": ["books", "udemy", "coursera", "college", "university", "tuition", "stationery",
+                  "exam fee", "unacademy", "byjus"],
+    "Health": ["pharmacy", "apollo", "hospital", "clinic", "medplus", "pharmeasy", "1mg", "gym",
+               "cult fit", "health insurance"],
+    "Savings": ["sip", "mutual fund", "zerodha", "groww", "ppf", "recurring deposit", "fixed deposit", "nps"],
+}
+
+# Patterns for narrations keywords can't catch, applied in one batch per category
+CATEGORY_PATTERNS = {
+    "Cash": [r"\batm\b", r"\bcash (wd|withdrawal)\b", r"\bnwd\b"],
+    "EMIs": [r"\bemi\s*\d*\b", r"\bach d\b", r"\bnach\b"],
+    "Rent": [r"\brent (for|of)\b"],
+    "Bills": [r"\b(bill ?desk|billpay|bbps)\b"],
+    "Savings": [r"\b(rd|fd) (instal+ment|booking)\b"],
+}
+
+# Narration noise dropped when normalizing a description into a merchant key
+NARRATION_NOISE = frozenset("upi pos neft imps rtgs ref txn payment paid to from by via ecom debit card dr cr ltd pvt india www com in".split())
+MERCHANT_WORD_RE = re.compile(r"[a-z]+")
+
+# bytes.translate is ~10x faster than str.translate for this
+DIGITS_TO_SPACE = bytes.maketrans(b"0123456789", b" " * 10)
+
+def normalize_merchant(description):
+    words = [w for w in MERCHANT_WORD_RE.findall(description.lower()) if w not in NARRATION_NOISE and len(w) > 1]
+    return " ".join(words[:6])
+
+def merchant_keys(descriptions):
+    """normalize_merchant for a batch; narrations differing only in reference
+    numbers share one normalization"""
+    memo = {}
+    keys = []
+    for description in descriptions:
+        stripped = description.encode().translate(DIGITS_TO_SPACE)
+        key = memo.get(stripped)
+        if key is None:
+            key = memo[stripped] = normalize_merchant(stripped.decode())
+        keys.append(key)
+    return keys
+
+def _build_keyword_trie(keywords):
+    trie = {}
+    for category, phrases in keywords.items():
+        for phrase in phrases:
+            node = trie
+            for word in phrase.split():
+                node = node.setdefault(word, {})
+            node.setdefault("$", CATEGORY_ID[category])
+    return trie
+
+class CategoryRuleEngine:
+    """Vectorized merchant categorization.
+    
+    Descriptions are factorized to unique merchant keys, each unique key is
+    categorized once (keyword trie, then compiled regex batch) and memoized
+    in an LRU cache, and the result is broadcast back with a single take().
+    A year of statements for thousands of users shares a few thousand
+    merchants, so the per-row cost is one cache lookup; uploaded statements
+    bring new ones without bound, so the cache keeps the most recent.
+    """
+    def __init__(self, keywords=CATEGORY_KEYWORDS, patterns=CATEGORY_PATTERNS):
+        self.trie = _build_keyword_trie(keywords)
+        self.patterns = [
+            (CATEGORY_ID[category], re.compile("|".join(f"(?:{p})" for p in regexes)))
+            for category, regexes in patterns.items()
+        ]
+        # One cache per engine; lru_cache on the method would be shared by all of them and keep them alive
+        self.categorize_merchant = lru_cache(maxsize=65536)(self._categorize_merchant)
+    
+    def _categorize_merchant(self, merchant):
+        words = merchant.split()
+        category = CATEGORY_ID["Other"]
+        for start in range(len(words)):
+            node = self.trie
+            for word in words[start:]:
+                node = node.get(word)
+                if node is None:
+                    break
+                if "$" in node:
+                    category = node["$"]
+                    break
+            if category != CATEGORY_ID["Other"]:
+                break
+        else:
+            for pattern_category, pattern in self.patterns:
+                if pattern.search(merchant):
+                    category = pattern_category
+                    break
+        return category
+    
+    def categorize(self, merchants, amounts):
+        """int16 category ids for parallel arrays of merchant keys and amounts"""
+        index = {}
+        codes = np.fromiter((index.setdefault(m, len(index)) for m in merchants), dtype=np.int64, count=len(merchants))
+        lookup = np.fromiter((self.categorize_merchant(m) for m in index), dtype=np.int16, count=len(index))
+        categories = lookup[codes] if len(codes) else np.zeros(0, dtype=np.int16)
+        # Credits are income regardless of who sent them
+        return np.where(np.asarray(amounts) > 0, np.int16(CATEGORY_ID["Income"]), categories).astype(np.int16)
+
+category_engine = CategoryRuleEngine()
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%d-%m-%y", "%d-%b-%Y", "%d %b %Y", "%Y%m%d")
+CSV_COLUMN_ALIASES = {
+    "date": ("date", "txn date", "transaction date", "value date", "posting date"),
+    "description": ("description", "narration", "particulars", "remarks", "details", "transaction details"),
+    "amount": ("amount", "transaction amount", "amt"),
+    "debit": ("debit", "withdrawal", "withdrawal amt", "withdrawal amount", "debit amount", "dr"),
+    "credit": ("credit", "deposit", "deposit amt", "deposit amount", "credit amount", "cr"),
+}
+
+@lru_cache(maxsize=8192)  # Statements repeat the same few hundred dates
+def parse_date(text):
+    text = text.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date {text!r}")
+
+def parse_amount(text):
+    text = (text or "").replace(",", "").replace("₹", "").strip()
+    if not text:
+        return 0.0
+    if text.endswith(("Dr", "DR")):
+        return -float(text[:-2])
+    if text.endswith(("Cr", "CR")):
+        return float(text[:-2])
+    return float(text)
+
+def map_csv_columns(header):
+    """Header index for each canonical column, by alias"""
+    normalized = [h.strip().lower().rstrip(".") for h in header]
+    columns = {}
+    for canonical, aliases in CSV_COLUMN_ALIASES.items():
+        for i, name in enumerate(normalized):
+            if name in aliases:
+                columns[canonical] = i
+                break
+    if "date" not in columns or "description" not in columns or not ("amount" in columns or "debit" in columns):
+        raise ValueError("CSV needs date, description and amount (or debit/credit) columns")
+    return columns
+
+def parse_csv_row(row, columns):
+    """(date, description, signed amount) with spend negative"""
+    if "amount" in columns:
+        amount = parse_amount(row[columns["amount"]])
+    else:
+        amount = parse_amount(row[columns["credit"]]) if "credit" in columns else 0.0
+        amount -= parse_amount(row[columns["debit"]])
+    return parse_date(row[columns["date"]]), row[columns["description"]].strip(), amount
+
+def iter_csv_rows(path, offset=0):
+    """(transaction, byte offset after it) for each data row of a bank CSV.
+    
+    Reads line by line in binary mode so the offset can be checkpointed;
+    resuming re-reads the header and seeks to `offset`. Rows that don't
+    parse yield (None, offset) so callers can count them.
+    """
+    with open(path, "rb") as f:
+        columns = map_csv_columns(next(csv.reader([f.readline().decode("utf-8-sig")])))
+        if offset > f.tell():
+            f.seek(offset)
+        for line in iter(f.readline, b""):
+            text = line.decode("utf-8", errors="replace")
+            if not text.strip():
+                continue
+            try:
+                yield parse_csv_row(next(csv.reader([text])), columns), f.tell()
+            except (ValueError, IndexError):
+                yield None, f.tell()
+
+OFX_BOUNDARY_RE = re.compile(rb"<STMTTRN>|</BANKTRANLIST>", re.I)
+OFX_FIELD_RE = re.compile(r"<(DTPOSTED|TRNAMT|NAME|MEMO)>([^<\r\n]*)", re.I)
+
+def parse_ofx_transaction(block):
+    fields = {k.upper(): v.strip() for k, v in OFX_FIELD_RE.findall(block)}
+    description = fields.get("NAME") or fields.get("MEMO", "")
+    return datetime.strptime(fields["DTPOSTED"][:8], "%Y%m%d").date(), description, float(fields["TRNAMT"])
+
+def iter_ofx_rows(path, offset=0, block_size=1 << 20):
+    """(transaction, byte offset after it) for each <STMTTRN> of an OFX/QFX
+    export (SGML or XML flavour), read in fixed-size blocks"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        buffer, buffer_start = b"", offset
+        while True:
+            block = f.read(block_size)
+            buffer += block
+            # A transaction is complete once the next one (or the list end) starts
+            positions = [m.start() for m in OFX_BOUNDARY_RE.finditer(buffer)]
+            if not block:
+                positions.append(len(buffer))
+            for begin, end in zip(positions, positions[1:]):
+                if buffer[begin:begin + 9].upper() == b"<STMTTRN>":
+                    try:
+                        yield parse_ofx_transaction(buffer[begin:end].decode("utf-8", errors="replace")), buffer_start + end
+                    except (KeyError, ValueError):
+                        yield None, buffer_start + end
+            if not block:
+                return
+            keep = positions[-1] if positions else max(len(buffer) - 32, 0)
+            buffer, buffer_start = buffer[keep:], buffer_start + keep
+
+def iter_statement_rows(path, offset=0):
+    if path.lower().endswith((".ofx", ".qfx")):
+        return iter_ofx_rows(path, offset)
+    return iter_csv_rows(path, offset)
+
+class Ledger:
+    """One user's transactions as parallel NumPy columns.
+    
+    dates are datetime64[D], amounts float64 (spend negative), merchants the
+    normalized merchant keys and categories int16 ids into CATEGORIES.
+    Appends are buffered and concatenated on the next read.
+    """
+    def __init__(self, dates=None, amounts=None, merchants=None, categories=None):
+        self._dates = dates if dates is not None else np.zeros(0, dtype="datetime64[D]")
+        self._amounts = amounts if amounts is not None else np.zeros(0, dtype=np.float64)
+        self._merchants = merchants if merchants is not None else np.zeros(0, dtype=object)
+        self._categories = categories if categories is not None else np.zeros(0, dtype=np.int16)
+        self._pending = []
+    
+    def append(self, dates, amounts, merchants, categories):
+        self._pending.append((
+            np.asarray(dates, dtype="datetime64[D]"),
+            np.asarray(amounts, dtype=np.float64),
+            np.asarray(merchants, dtype=object),
+            np.asarray(categories, dtype=np.int16),
+        ))
+    
+    def _consolidate(self):
+        if self._pending:
+            dates, amounts, merchants, categories = zip(*self._pending)
+            self._dates = np.concatenate((self._dates,) + dates)
+            self._amounts = np.concatenate((self._amounts,) + amounts)
+            self._merchants = np.concatenate((self._merchants,) + merchants)
+            self._categories = np.concatenate((self._categories,) + categories)
+            self._pending = []
+    
+    @property
+    def dates(self):
+        self._consolidate()
+        return self._dates
+    
+    @property
+    def amounts(self):
+        self._consolidate()
+        return self._amounts
+    
+    @property
+    def merchants(self):
+        self._consolidate()
+        return self._merchants
+    
+    @property
+    def categories(self):
+        self._consolidate()
+        return self._categories
+    
+    def __len__(self):
+        return len(self._dates) + sum(len(chunk[0]) for chunk in self._pending)
+    
+    def window(self, days):
+        """Boolean mask of transactions in the last `days` days of the ledger"""
+        dates = self.dates
+        if not len(dates):
+            return np.zeros(0, dtype=bool)
+        return dates > dates.max() - np.timedelta64(days, "D")
+    
+    def category_totals(self, days=30):
+        """Spend per category id over the last `days` days"""
+        mask = self.window(days) & (self.amounts < 0)
+        return np.bincount(self.categories[mask], weights=-self.amounts[mask], minlength=len(CATEGORIES))
+    
+def save_columns(path, dates, amounts, merchants, categories):
+    np.savez(path, dates=np.asarray(dates, dtype="datetime64[D]").astype(np.int64), amounts=amounts,
+             merchants=np.asarray(merchants).astype(str), categories=categories)
+
+def load_columns(path):
+    with np.load(path) as data:
+        return (data["dates"].astype("datetime64[D]"), data["amounts"],
+                data["merchants"].astype(object), data["categories"])
+
+def find_recurring(owners, merchants, dates, amounts, min_charges=3):
+    """Recurring charges for many users in one (owner, merchant, date) sort.
+    
+    `amounts` are positive magnitudes and `dates` day numbers (int64).
+    Within each (owner, merchant) run, at least 80% of gaps falling in 25-35
+    days marks a monthly charge (350-380 days: yearly), provided every amount
+    is within 15% of the run's mean. Group statistics are bincounts over the
+    sorted runs, so cost is one sort however many users are batched.
+    Returns (groups, member) where groups is a dict of per-charge arrays
+    (owner, merchant, amount, monthly, last_date) and member flags the input
+    rows that belong to a recurring charge.
+    """
+    n = len(amounts)
+    if n == 0:
+        empty = np.zeros(0)
+        return {"owner": empty.astype(np.int64), "merchant": empty.astype(object), "amount": empty,
+                "monthly": empty.astype(bool), "last_date": empty.astype(np.int64)}, np.zeros(0, dtype=bool)
+    index = {}
+    codes = np.fromiter((index.setdefault(m, len(index)) for m in merchants), dtype=np.int64, count=n)
+    order = np.lexsort((dates, codes, owners))
+    owner, code, day, amount = owners[order], codes[order], dates[order], amounts[order]
+    
+    starts_run = np.ones(n, dtype=bool)
+    starts_run[1:] = (owner[1:] != owner[:-1]) | (code[1:] != code[:-1])
+    group = np.cumsum(starts_run) - 1
+    groups = group[-1] + 1
+    count = np.bincount(group, minlength=groups)
+    
+    gaps = np.diff(day)
+    within = ~starts_run[1:]
+    gap_group = group[1:][within]
+    gaps = gaps[within]
+    monthly_gaps = np.bincount(gap_group, weights=(gaps >= 25) & (gaps <= 35), minlength=groups)
+    yearly_gaps = np.bincount(gap_group, weights=(gaps >= 350) & (gaps <= 380), minlength=groups)
+    mean = np.bincount(group, weights=amount, minlength=groups) / count
+    unsteady = np.bincount(group, weights=np.abs(amount - mean[group]) > 0.15 * mean[group], minlength=groups)
+    
+    eligible = (count >= min_charges) & (unsteady == 0)
+    monthly = eligible & (monthly_gaps >= 0.8 * (count - 1))
+    yearly = eligible & ~monthly & (yearly_gaps >= 0.8 * (count - 1))
+    recurring = monthly | yearly
+    
+    member = np.empty(n, dtype=bool)
+    member[order] = recurring[group]
+    first = np.flatnonzero(starts_run)
+    last = np.append(first[1:], n) - 1
+    chosen = np.flatnonzero(recurring)
+    return {
+        "owner": owner[first[chosen]],
+        "merchant": np.asarray(merchants, dtype=object)[order][first[chosen]],
+        "amount": mean[chosen],
+        "monthly": monthly[chosen],
+        "last_date": day[last[chosen]],
+    }, member
+
+def recurring_charges(ledger, min_charges=3):
+    """Recurring debits in one ledger, as [(merchant, amount, monthly, last charge date)]"""
+    debits = ledger.amounts < 0
+    if not debits.any():
+        return []
+    groups, _ = find_recurring(
+        np.zeros(int(debits.sum()), dtype=np.int64), ledger.merchants[debits],
+        ledger.dates[debits].astype(np.int64), -ledger.amounts[debits], min_charges
+    )
+    return [
+        (merchant, float(amount), bool(monthly), np.datetime64(int(last_date), "D").item())
+        for merchant, amount, monthly, last_date in zip(groups["merchant"], groups["amount"], groups["monthly"], groups["last_date"])
+    ]
+
+def detect_subscriptions(ledger, min_charges=3):
+    """Monthly and yearly charges in one ledger, as
+    [(merchant, monthly cost, period)] sorted by cost"""
+    found = [
+        (merchant, amount if monthly else amount / 12, "monthly" if monthly else "yearly")
+        for merchant, amount, monthly, _ in recurring_charges(ledger, min_charges)
+    ]
+    return sorted(found, key=lambda item: -item[1])
+
+class LedgerStore:
+    """Ledgers by account number, persisted as append-only .npz segments.
+    
+    Each import chunk is written as a new `segment-<seq>.npz`, so appends
+    never rewrite history. compact() merges everything into `base-<seq>.npz`;
+    loading starts from the newest base and ignores segments at or below its
+    seq, which keeps compaction safe to interrupt.
+    """
+    SEGMENT_RE = re.compile(r"(segment|base)-(\d+)\.npz$")
+    
+    def __init__(self, directory=LEDGER_DIR):
+        self.directory = directory
+        self._ledgers = {}  # account -> (version, ledger)
+        self._lock = threading.Lock()
+    
+    def account_dir(self, account_number):
+        return os.path.join(self.directory, account_number)
+    
+    def _files(self, account_number):
+        """(seq, kind, path) of live files, oldest first"""
+        directory = self.account_dir(account_number)
+        if not os.path.isdir(directory):
+            return []
+        files = sorted(
+            (int(m.group(2)), m.group(1), os.path.join(directory, name))
+            for name in os.listdir(directory)
+            for m in [self.SEGMENT_RE.match(name)] if m
+        )
+        bases = [seq for seq, kind, _ in files if kind == "base"]
+        if bases:
+            files = [f for f in files if (f[1] == "base" and f[0] == bases[-1]) or (f[1] == "segment" and f[0] > bases[-1])]
+        return files
+    
+    def load(self, account_number):
+        """Read the account's ledger from disk without caching it"""
+        ledger = None
+        for _, _, path in self._files(account_number):
+            ledger = ledger or Ledger()
+            ledger.append(*load_columns(path))
+        return ledger
+    
+    def version(self, account_number):
+        """Changes whenever a segment is added or compacted, by any worker process"""
+        try:
+            return os.stat(self.account_dir(account_number)).st_mtime_ns
+        except OSError:
+            return None
+    
+    def get(self, account_number):
+        """The account's ledger, or None if nothing was imported"""
+        version = self.version(account_number)
+        with self._lock:
+            cached = self._ledgers.get(account_number)
+            if cached is None or cached[0] != version:
+                cached = self._ledgers[account_number] = (version, self.load(account_number))
+            return cached[1]
+    
+    def append(self, account_number, dates, amounts, merchants, categories):
+        """Persist one chunk as a new segment.
+        
+        The in-memory copy is dropped rather than grown, so a long import
+        holds one chunk at a time; the next get() reloads the segments.
+        """
+        with self._lock:
+            files = self._files(account_number)
+            seq = files[-1][0] + 1 if files else 1
+            os.makedirs(self.account_dir(account_number), exist_ok=True)
+            save_columns(os.path.join(self.account_dir(account_number), f"segment-{seq:06d}.npz"),
+                         dates, amounts, merchants, categories)
+            self._ledgers.pop(account_number, None)
+    
+    def compact(self, account_number, max_segments=LEDGER_MAX_SEGMENTS):
+        files = self._files(account_number)
+        if len(files) <= max_segments:
+            return
+        ledger = self.get(account_number)
+        with self._lock:
+            save_columns(os.path.join(self.account_dir(account_number), f"base-{files[-1][0]:06d}.npz"),
+                         ledger.dates, ledger.amounts, ledger.merchants, ledger.categories)
+            for _, _, path in files:
+                os.remove(path)
+
+ledger_store = LedgerStore()
+
+class StatementImporter:
+    """Streaming statement import with flat memory and resumable checkpoints.
+    
+    parse -> normalize -> dedupe -> categorize -> append run as a generator
+    pipeline over IMPORT_CHUNK_ROWS-row chunks, so only one chunk is in
+    flight whatever the file size. After each appended chunk the byte offset
+    is checkpointed; re-uploading the same file resumes from there.
+    """
+    def __init__(self, store, chunk_rows=IMPORT_CHUNK_ROWS):
+        self.store = store
+        self.chunk_rows = chunk_rows
+    
+    # Pipeline stages: each consumes and yields (chunk, end offset)
+    def parse(self, path, offset, stats):
+        chunk = []
+        for row, end in iter_statement_rows(path, offset):
+            if row is None:
+                stats["skipped"] += 1
+                continue
+            chunk.append(row)
+            if len(chunk) >= self.chunk_rows:
+                yield chunk, end
+                chunk = []
+        if chunk:
+            yield chunk, end
+    
+    def normalize(self, chunks):
+        for rows, end in chunks:
+            dates, descriptions, amounts = zip(*rows)
+            yield {
+                "dates": np.array(dates, dtype="datetime64[D]"),
+                "amounts": np.array(amounts, dtype=np.float64),
+                "merchants": np.array(merchant_keys(descriptions), dtype=object),
+            }, end
+    
+    def dedupe(self, batches, existing, stats):
+        """Drop rows already imported before this upload (overlapping statements).
+        
+        `existing` counts (date, amount, merchant) of the ledger as it was when
+        the import started; only rows dated on or before its last date are
+        checked, and repeats within the upload are kept as genuine charges.
+        """
+        last_date = max(existing)[0] if existing else None
+        for batch, end in batches:
+            if last_date is not None:
+                keep = np.ones(len(batch["dates"]), dtype=bool)
+                for i in np.flatnonzero(batch["dates"] <= np.datetime64(last_date)):
+                    key = (batch["dates"][i].item(), float(batch["amounts"][i]), batch["merchants"][i])
+                    if existing.get(key):
+                        existing[key] -= 1
+                        keep[i] = False
+                stats["duplicates"] += int(len(keep) - keep.sum())
+                batch = {column: values[keep] for column, values in batch.items()}
+            yield batch, end
+    
+    def categorize(self, batches):
+        for batch, end in batches:
+            batch["categories"] = category_engine.categorize(batch["merchants"], batch["amounts"])
+            yield batch, end
+    
+    def _checkpoint_path(self, account_number):
+        return os.path.join(self.store.account_dir(account_number), "import-checkpoint.json")
+    
+    @staticmethod
+    def source_id(path):
+        """Identifies an upload by size and leading bytes (upload temp names change)"""
+        with open(path, "rb") as f:
+            head = f.read(1 << 20)
+        return f"{os.path.getsize(path)}:{hashlib.sha1(head).hexdigest()}"
+    
+    def run(self, account_number, path, progress=None):
+        """Import a statement; returns counts of imported/duplicate/skipped rows"""
+        source, size = self.source_id(path), max(os.path.getsize(path), 1)
+        checkpoint_path = self._checkpoint_path(account_number)
+        ledger = self.store.get(account_number)
+        checkpoint = {"source": source, "offset": 0, "imported": 0, "duplicates": 0, "skipped": 0,
+                      "base_rows": len(ledger) if ledger is not None else 0}
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                saved = json.load(f)
+            if saved.get("source") == source:
+                checkpoint = saved
+        resumed = checkpoint["offset"] > 0
+        
+        # Rows from before this import (not ones appended by an interrupted run of it)
+        existing = {}
+        if ledger is not None and checkpoint["base_rows"]:
+            base = slice(0, checkpoint["base_rows"])
+            for key in zip(ledger.dates[base].tolist(), ledger.amounts[base].tolist(), ledger.merchants[base].tolist()):
+                existing[key] = existing.get(key, 0) + 1
+        ledger = None  # Segments are appended on disk; don't pin the old copy
+        
+        stats = checkpoint
+        pipeline = self.categorize(self.dedupe(self.normalize(self.parse(path, checkpoint["offset"], stats)), existing, stats))
+        for batch, end in pipeline:
+            if len(batch["dates"]):
+                self.store.append(account_number, batch["dates"], batch["amounts"], batch["merchants"], batch["categories"])
+            stats["imported"] += len(batch["dates"])
+            stats["offset"] = end
+            with open(checkpoint_path + ".tmp", "w") as f:
+                json.dump(stats, f)
+            os.replace(checkpoint_path + ".tmp", checkpoint_path)
+            if progress is not None:
+                progress(end / size, stats["imported"])
+        
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.store.compact(account_number)
+        return {"imported": stats["imported"], "duplicates": stats["duplicates"],
+                "skipped": stats["skipped"], "resumed": resumed}
+
+statement_importer = StatementImporter(ledger_store)
+
+def format_share(part, total):
+    return f"{round(100 * part / total, 1):g}%" if total else "0%"
+
+def render_expense_breakdown(ledger, days=30):
+    totals = ledger.category_totals(days)
+    total = totals.sum()
+    lines = [f"📈 **Expense Categories (Last {days} Days)**", ""]
+    for category in np.argsort(-totals):
+        if totals[category] <= 0:
+            break
+        label, emoji = CATEGORIES[category]
+        lines.append(f"{emoji} {label}: ₹{int(totals[category]):,} ({format_share(totals[category], total)})")
+    lines += ["", f"**Total:** ₹{int(total):,}", ""]
+    top = int(np.argmax(totals))
+    if total and totals[top] / total > 0.35 and CATEGORIES[top][0] != "Rent":
+        lines.append(f"⚠️ {CATEGORIES[top][0]} is {format_share(totals[top], total)} of spending - worth a closer look!")
+    else:
+        lines.append("💡 Spending looks balanced - keep it up!")
+    return "\n".join(lines)
+
+def render_subscriptions(subscriptions):
+    lines = ["📱 **Subscriptions**", ""]
+    for merchant, monthly, period in subscriptions:
+        suffix = "/mo" if period == "monthly" else f"/mo (₹{int(monthly * 12):,}/yr)"
+        lines.append(f"- {merchant.title()}: ₹{int(monthly):,}{suffix}")
+    monthly_total = sum(monthly for _, monthly, _ in subscriptions)
+    lines += ["", f"**Total:** ₹{int(monthly_total):,}/mo (₹{int(monthly_total * 12):,}/year)", ""]
+    lines.append(f"💡 Found {len(subscriptions)} recurring charges in your statements - cancel the ones you don't use.")
+    return "\n".join(lines)
@@ -0,0 +1,138 @@
+"""Request metrics: in-process counters and histograms, served as Prometheus text."""
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+
+from .config import METRICS_ENABLED, METRICS_PATH
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_RATE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+METRIC_DEFINITIONS = {
+    # name: (type, help, histogram buckets)
+    "aira_request_seconds": ("histogram", "Handler latency by handler", LATENCY_BUCKETS),
+    "aira_feature_seconds": ("histogram", "Feature report latency by feature", LATENCY_BUCKETS),
+    "aira_model_queue_seconds": ("histogram", "Time waiting for a model slot", LATENCY_BUCKETS),
+    "aira_model_first_token_seconds": ("histogram", "Model time to first token", LATENCY_BUCKETS),
+    "aira_model_generation_seconds": ("histogram", "Model time to complete answer", LATENCY_BUCKETS),
+    "aira_model_tokens_per_second": ("histogram", "Streamed chunks per second of generation", TOKEN_RATE_BUCKETS),
+    "aira_model_warm_up_seconds": ("histogram", "Warm-up request latency (connect and model wake-up)", LATENCY_BUCKETS),
+    "aira_logins_total": ("counter", "Login attempts by result", None),
+    "aira_answers_total": ("counter", "Chat answers by source", None),
+    "aira_query_routes_total": ("counter", "Chat questions by route (feature, short, detailed)", None),
+    "aira_fallbacks_total": ("counter", "Chat answers that fell back, by reason", None),
+    "aira_model_errors_total": ("counter", "Failed model calls by stage and exception type", None),
+    "aira_bill_reminders_total": ("counter", "Bill due-soon reminders queued", None),
+    "aira_background_failures_total": ("counter", "Failed background job runs by job and exception type", None),
+    "aira_response_cache_hits_total": ("counter", "Response cache hits", None),
+    "aira_response_cache_misses_total": ("counter", "Response cache misses", None),
+    "aira_response_cache_bytes": ("gauge", "Response cache size", None),
+    "aira_model_calls_in_flight": ("gauge", "Model calls holding a slot", None),
+    "aira_model_calls_waiting": ("gauge", "Model calls waiting for a slot", None),
+    "aira_model_clients_open": ("gauge", "Pooled model clients kept open", None),
+    "aira_model_client_evictions_total": ("counter", "Pooled model clients closed after going idle", None),
+}
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "started")
+    
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+
+class Metrics:
+    """Counters and histograms from METRIC_DEFINITIONS, keyed by label values.
+    
+    Gauges (and counters owned by other objects) are read from callbacks at
+    scrape time. When disabled every call returns immediately and timer()
+    hands back a shared no-op context manager.
+    """
+    _NULL_TIMER = nullcontext()
+    
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._series = {name: {} for name in METRIC_DEFINITIONS}  # name -> {labels: value or histogram}
+        self._callbacks = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = tuple(labels.items())
+        with self._lock:
+            series = self._series[name]
+            series[key] = series.get(key, 0) + amount
+    
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        buckets = METRIC_DEFINITIONS[name][2]
+        key = tuple(labels.items())
+        with self._lock:
+            series = self._series[name]
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = [0] * (len(buckets) + 1) + [0.0]  # Bucket counts, +Inf, sum
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-1] += value
+    
+    def timer(self, name, **labels):
+        """Context manager observing its elapsed time in histogram `name`"""
+        if not self.enabled:
+            return self._NULL_TIMER
+        return _Timer(self, name, labels)
+    
+    def collect(self, name, callback):
+        """Read metric `name` from callback() at scrape time"""
+        self._callbacks[name] = callback
+    
+    @staticmethod
+    def _labels(pairs):
+        if not pairs:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+    
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            snapshot = {name: {key: list(value) if isinstance(value, list) else value for key, value in series.items()}
+                        for name, series in self._series.items()}
+        for name, (kind, description, buckets) in METRIC_DEFINITIONS.items():
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+            if name in self._callbacks:
+                lines.append(f"{name} {self._callbacks[name]()}")
+                continue
+            for key, value in snapshot[name].items():
+                if kind != "histogram":
+                    lines.append(f"{name}{self._labels(key)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip((*buckets, "+Inf"), value[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._labels(key + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{self._labels(key)} {value[-1]}")
+                lines.append(f"{name}_count{self._labels(key)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics(METRICS_ENABLED)
+
+def metrics_routes():
+    """Routes to add next to the Gradio app: METRICS_PATH, when enabled"""
+    if not METRICS_ENABLED:
+        return []
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+    
+    def scrape(request):
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+    return [Route(METRICS_PATH, scrape)]
@@ -0,0 +1,449 @@
+"""Model backends (remote, local and fake) and the guards around calls:
+circuit breaker, concurrency limiter, client pool and response cache."""
+import asyncio
+import bisect
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from .config import (
+    AMOUNT_BUCKET_EDGES, LOCAL_MODEL_CONTEXT, LOCAL_MODEL_PATH, LOCAL_MODEL_THREADS,
+    MODEL_MAX_TOKENS, MODEL_TEMPERATURE, STUB_TOKENS_PER_SECOND, WORD_RE
+)
+
+class ServerBusy(Exception):
+    """Raised when the model wait queue is full"""
+
+class CircuitBreaker:
+    """Skips the model while recent calls are mostly failing or slow.
+    
+    A call is slow when its first token took `slow_call_seconds` or more, or
+    its tokens came `slow_token_seconds` or more apart; total call time is
+    not used, as a long answer from a healthy endpoint takes long too.
+    closed -> open when the bad-call rate over the last `window` calls
+    reaches `failure_rate`; open -> half_open after `cooldown_seconds`,
+    letting one probe call through; the probe closes or re-opens it. A probe
+    that ends without an outcome (busy, cancelled) is handed back with
+    release_probe() so the next call can probe instead.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+    
+    def __init__(self, window, min_calls, failure_rate, slow_call_seconds, slow_token_seconds, cooldown_seconds,
+                 clock=time.monotonic):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_token_seconds = slow_token_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self._outcomes = deque(maxlen=window)  # True = failed or slow
+        self._probe_in_flight = False
+        self.probes = 0  # Id of the latest probe let through
+    
+    def allow(self):
+        if self.state == self.OPEN:
+            if self.clock() - self.opened_at < self.cooldown_seconds:
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            self.probes += 1
+        return True
+    
+    def release_probe(self, probe):
+        """Give back probe `probe` if it is still waiting for an outcome"""
+        if self.state == self.HALF_OPEN and self._probe_in_flight and probe == self.probes:
+            self._probe_in_flight = False
+    
+    def record_success(self, first_token_seconds=0.0, seconds_per_token=0.0):
+        if first_token_seconds >= self.slow_call_seconds or seconds_per_token >= self.slow_token_seconds:
+            self._record(True)
+        elif self.state == self.HALF_OPEN:
+            self._close()
+        else:
+            self._record(False)
+    
+    def record_failure(self):
+        self._record(True)
+    
+    def _record(self, bad):
+        if self.state == self.HALF_OPEN:
+            if bad:
+                self._open()
+            else:
+                self._close()
+            return
+        self._outcomes.append(bad)
+        if len(self._outcomes) >= self.min_calls and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+            self._open()
+    
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = self.clock()
+        self._probe_in_flight = False
+    
+    def _close(self):
+        self.state = self.CLOSED
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+class FakeInferenceClient:
+    """Local stand-in for AsyncInferenceClient.chat_completion.
+    
+    Simulates latency, token rate and failures so the breaker, hedging and
+    handlers can be exercised offline; flip `healthy` to trip and recover.
+    """
+    def __init__(self, reply="Here is some general guidance on managing your money wisely.",
+                 first_token_latency=0.05, tokens_per_second=200.0, error_rate=0.0, healthy=True, seed=None):
+        self.reply = reply
+        self.first_token_latency = first_token_latency
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.healthy = healthy
+        self.calls = 0
+        self.open_streams = 0  # Started and neither finished nor closed
+        self._random = random.Random(seed)
+    
+    async def chat_completion(self, messages, stream=False, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.first_token_latency)
+        if not self.healthy or self._random.random() < self.error_rate:
+            raise ConnectionError("fake endpoint unavailable")
+        tokens = [word + " " for word in self.reply_for(messages).split()]
+        if not stream:
+            await asyncio.sleep(len(tokens) / self.tokens_per_second if self.tokens_per_second else 0)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="".join(tokens).strip()))])
+        return self._stream(tokens)
+    
+    def reply_for(self, messages):
+        return self.reply
+    
+    async def _stream(self, tokens):
+        self.open_streams += 1
+        try:
+            for token in tokens:
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+                await asyncio.sleep(1 / self.tokens_per_second if self.tokens_per_second else 0)
+        finally:
+            self.open_streams -= 1
+
+class StubBackend(FakeInferenceClient):
+    """Deterministic offline backend: never fails, reply derived from the question"""
+    def __init__(self, tokens_per_second=STUB_TOKENS_PER_SECOND):
+        super().__init__(first_token_latency=0.0, tokens_per_second=tokens_per_second)
+    
+    def reply_for(self, messages):
+        topic = " ".join(WORD_RE.findall(messages[-1]["content"].lower())[:12]) or "your finances"
+        return (f"You asked about {topic}. Start by tracking income and expenses, "
+                f"keep an emergency fund, and invest the surplus regularly.")
+
+class LlamaCppBackend:
+    """Local CPU inference of a GGUF model through llama-cpp-python.
+    
+    Exposes the same async chat_completion shape as AsyncInferenceClient.
+    llama.cpp is blocking and not re-entrant, so generation runs in a worker
+    thread and calls are serialized with a lock.
+    """
+    def __init__(self, model_path=LOCAL_MODEL_PATH, n_threads=LOCAL_MODEL_THREADS, n_ctx=LOCAL_MODEL_CONTEXT):
+        try:
+            from llama_cpp import Llama
+        except ImportError as e:
+            raise RuntimeError("Local backend needs llama-cpp-python: pip install llama-cpp-python") from e
+        self.llm = Llama(model_path=model_path, n_threads=n_threads, n_ctx=n_ctx, verbose=False)
+        self._lock = asyncio.Lock()
+    
+    @staticmethod
+    def _to_namespace(value):
+        if isinstance(value, dict):
+            return SimpleNamespace(**{k: LlamaCppBackend._to_namespace(v) for k, v in value.items()})
+        if isinstance(value, list):
+            return [LlamaCppBackend._to_namespace(v) for v in value]
+        return value
+    
+    async def chat_completion(self, messages, stream=False, max_tokens=MODEL_MAX_TOKENS,
+                              temperature=MODEL_TEMPERATURE, **kwargs):
+        if not stream:
+            async with self._lock:
+                result = await asyncio.to_thread(
+                    self.llm.create_chat_completion,
+                    messages=messages, max_tokens=max_tokens, temperature=temperature
+                )
+            return self._to_namespace(result)
+        return self._stream(messages, max_tokens, temperature)
+    
+    async def _stream(self, messages, max_tokens, temperature):
+        async with self._lock:
+            chunks = await asyncio.to_thread(
+                self.llm.create_chat_completion,
+                messages=messages, max_tokens=max_tokens, temperature=temperature, stream=True
+            )
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                yield self._to_namespace(chunk)
+
+_local_backends = {}
+
+def create_backend(name, token=None):
+    """Build the chat_completion client for a backend name"""
+    if name == "hf":
+        from huggingface_hub import AsyncInferenceClient  # Only the hf backend needs it
+        return AsyncInferenceClient(token=token)
+    if name == "stub":
+        return StubBackend()
+    if name == "llamacpp":
+        # Loading weights is slow and memory-heavy; keep one model per process
+        if name not in _local_backends:
+            _local_backends[name] = LlamaCppBackend()
+        return _local_backends[name]
+    raise ValueError(f"Unknown model backend {name!r}; expected hf, llamacpp or stub")
+
+class ClientPool:
+    """Model clients by (backend, token), kept open between requests.
+    
+    An hf client holds an HTTP session whose keep-alive connections are
+    reused by every request made through it, so leasing the same client
+    again skips the TCP/TLS setup. It also keeps every response it streamed
+    in its exit stack until it is closed, so after `max_leases` leases a
+    client is replaced and closed once its last lease returns. Clients unused
+    for `idle_seconds` are closed by a sweep that runs while the pool is
+    non-empty, and the least recently used beyond `max_clients` when a lease
+    is returned; a client is never closed while leased.
+    """
+    def __init__(self, idle_seconds, max_clients, max_leases, factory=create_backend, clock=time.monotonic):
+        self.idle_seconds = idle_seconds
+        self.max_clients = max_clients
+        self.max_leases = max_leases
+        self.factory = factory
+        self.clock = clock
+        self.evictions = 0
+        self.recycled = 0
+        self._entries = OrderedDict()  # (backend, token) -> [client, leases, last used, leases ever]
+        self._sweeper = None
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, key):
+        return key in self._entries
+    
+    @asynccontextmanager
+    async def lease(self, backend, token):
+        key = (backend, token)
+        entry = self._entries.get(key)
+        if entry is None or entry[3] >= self.max_leases:
+            # A worn-out client stays open for its current leases; the last one closes it
+            entry = self._entries[key] = [self.factory(backend, token), 0, self.clock(), 0]
+        self._entries.move_to_end(key)
+        entry[1] += 1
+        entry[3] += 1
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.ensure_future(self._sweep())
+        try:
+            yield entry[0]
+        finally:
+            entry[1] -= 1
+            entry[2] = self.clock()
+            if entry[3] >= self.max_leases and not entry[1]:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self.recycled += 1
+                await _close_client(entry[0])
+            await self._evict()
+    
+    async def _sweep(self):
+        # Idle clients are closed even when no lease returns to trigger _evict()
+        while self._entries:
+            await asyncio.sleep(self.idle_seconds / 2)
+            await self._evict()
+    
+    async def _evict(self):
+        # Least recently leased first: stop at the first idle client that is still fresh
+        now = self.clock()
+        excess = len(self._entries) - self.max_clients
+        for key, (client, leases, last_used, _) in list(self._entries.items()):
+            if leases:
+                continue
+            if excess <= 0 and now - last_used < self.idle_seconds:
+                break
+            del self._entries[key]
+            excess -= 1
+            self.evictions += 1
+            await _close_client(client)
+    
+    async def close(self):
+        """Close every client that isn't leased"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        for key, (client, leases, _, _) in list(self._entries.items()):
+            if not leases:
+                del self._entries[key]
+                await _close_client(client)
+
+async def _close_client(client):
+    if hasattr(client, "close"):
+        await client.close()
+
+def delta_text(message):
+    """Content of a streamed chat_completion chunk ('' for role/usage chunks)"""
+    if not message.choices:
+        return ""
+    return getattr(message.choices[0].delta, "content", None) or ""
+
+async def close_stream(iterator):
+    if iterator is not None and hasattr(iterator, "aclose"):
+        await iterator.aclose()
+
+class InferenceLimiter:
+    """Caps in-flight model calls and how many callers may wait for a slot"""
+    def __init__(self, max_in_flight, max_waiting):
+        self.max_in_flight = max_in_flight
+        self.max_waiting = max_waiting
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = None
+    
+    def is_saturated(self):
+        return self.in_flight >= self.max_in_flight
+    
+    @asynccontextmanager
+    async def slot(self):
+        # Created lazily so it binds to Gradio's event loop, not the import-time one
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        if self.is_saturated() and self.waiting >= self.max_waiting:
+            raise ServerBusy(f"{self.waiting} requests already waiting")
+        
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+def amount_band(amount):
+    """The AMOUNT_BUCKET_EDGES band `amount` falls in, as prompt text"""
+    band = bisect.bisect(AMOUNT_BUCKET_EDGES, amount)
+    if band == 0:
+        return f"under ₹{AMOUNT_BUCKET_EDGES[0]:,}"
+    if band == len(AMOUNT_BUCKET_EDGES):
+        return f"₹{AMOUNT_BUCKET_EDGES[-1]:,} or more"
+    return f"₹{AMOUNT_BUCKET_EDGES[band - 1]:,}-{AMOUNT_BUCKET_EDGES[band]:,}"
+
+class ResponseCache:
+    """LRU + TTL cache of model answers with a size cap in bytes.
+    
+    With a `shared` store (see store.py) answers are also written there, and
+    a local miss is looked up there, so workers reuse each other's answers.
+    Async callers use get_async()/put_async(), which keep those round trips
+    off the event loop.
+    """
+    SHARED_PREFIX = "aira:answer:"
+    
+    def __init__(self, max_bytes, ttl_seconds, shared=None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (answer, expires_at, size_bytes)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(user_message, user_type, user_data):
+        """Normalized question + system-prompt variant with bucketed amounts.
+        
+        An answer is served to everyone with the same key, so the prompt that
+        produced it must carry nothing the key doesn't: the bands, no names.
+        """
+        question = " ".join(WORD_RE.findall(user_message.lower()))
+        salary_band = amount_band(user_data.get("salary", 0))
+        balance_band = amount_band(user_data.get("balance", 0))
+        return f"{user_type}|s{salary_band}|b{balance_band}|{question}"
+    
+    def get(self, key):
+        answer = self._get_local(key)
+        return answer if answer is not None else self._get_shared(key)
+    
+    async def get_async(self, key):
+        """get() for the event loop: a shared-store lookup runs in a worker thread"""
+        answer = self._get_local(key)
+        if answer is not None or self.shared is None:
+            return answer if answer is not None else self._get_shared(key)
+        return await asyncio.to_thread(self._get_shared, key)
+    
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        return None
+    
+    def _get_shared(self, key):
+        # After a local miss; counts the hit or miss
+        answer = self.shared.get(self.SHARED_PREFIX + key) if self.shared is not None else None
+        with self._lock:
+            if answer is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._put_local(key, answer)
+        return answer
+    
+    def put(self, key, answer):
+        if self.shared is not None:
+            self.shared.set(self.SHARED_PREFIX + key, answer, self.ttl_seconds)
+        self._put_local(key, answer)
+    
+    async def put_async(self, key, answer):
+        """put() for the event loop: the shared-store write runs in a worker thread"""
+        if self.shared is not None:
+            await asyncio.to_thread(self.shared.set, self.SHARED_PREFIX + key, answer, self.ttl_seconds)
+        self._put_local(key, answer)
+    
+    def _put_local(self, key, answer):
+        size = len(key.encode()) + len(answer.encode())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (answer, time.monotonic() + self.ttl_seconds, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
+    
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,228 @@
+"""Net-worth history: append-only snapshots with aggregates kept on append.
+
+Each account's snapshots are parallel typed arrays (stdlib `array`, no
+numpy) persisted as fixed-size records appended to one file. Monthly
+change, 12-month growth and the 90-day trend are maintained as each
+snapshot arrives, so rendering the report never walks the history.
+"""
+import os
+import random
+import shutil
+import struct
+import threading
+from array import array
+from datetime import date, timedelta
+from functools import lru_cache
+
+from .config import NETWORTH_DIR, NETWORTH_TREND_DAYS
+from .users import USER_DATABASE
+
+class NetWorthHistory:
+    """One account's snapshots, in date order, one per day at most.
+    
+    Two pointers trail the latest snapshot by a month and a year, and the
+    least-squares sums for the trend cover a sliding NETWORTH_TREND_DAYS
+    window; each append moves them forward, so the cost is amortized O(1).
+    """
+    FIELDS = ("cash", "investments", "property", "liabilities")
+    
+    def __init__(self, trend_days=NETWORTH_TREND_DAYS):
+        self.trend_days = trend_days
+        self.days = array("l")  # date ordinals
+        self.columns = {field: array("d") for field in self.FIELDS}
+        self.net = array("d")
+        self._month = 0  # Last snapshot at least 30 days before the latest
+        self._year = 0  # ... and at least 365 days before
+        self._tail = 0  # First snapshot inside the trend window
+        self._fit_sums = [0.0] * 5  # n, sum x, sum y, sum xy, sum xx over the window
+    
+    def __len__(self):
+        return len(self.days)
+    
+    def _fit(self, i, sign):
+        x = float(self.days[i] - self.days[0])
+        y = self.net[i]
+        for k, term in enumerate((1.0, x, y, x * y, x * x)):
+            self._fit_sums[k] += sign * term
+    
+    def append(self, day, cash=0.0, investments=0.0, property=0.0, liabilities=0.0):
+        """Add a snapshot for `day` (a date); a second one on the same day replaces the first"""
+        ordinal = day.toordinal()
+        values = (cash, investments, property, liabilities)
+        net = cash + investments + property - liabilities
+        last = len(self.days) - 1
+        if last >= 0 and ordinal < self.days[last]:
+            raise ValueError(f"Snapshot for {day} is older than the latest one")
+        if last >= 0 and ordinal == self.days[last]:
+            self._fit(last, -1)
+            for field, value in zip(self.FIELDS, values):
+                self.columns[field][last] = value
+            self.net[last] = net
+            self._fit(last, 1)
+            return
+        
+        self.days.append(ordinal)
+        for field, value in zip(self.FIELDS, values):
+            self.columns[field].append(value)
+        self.net.append(net)
+        self._fit(last + 1, 1)
+        days = self.days
+        while self._month + 1 <= last and days[self._month + 1] <= ordinal - 30:
+            self._month += 1
+        while self._year + 1 <= last and days[self._year + 1] <= ordinal - 365:
+            self._year += 1
+        while days[self._tail] < ordinal - self.trend_days:
+            self._fit(self._tail, -1)
+            self._tail += 1
+    
+    def latest(self):
+        i = len(self.days) - 1
+        return {"day": date.fromordinal(self.days[i]), "net": self.net[i],
+                **{field: self.columns[field][i] for field in self.FIELDS}}
+    
+    def summary(self):
+        """Latest snapshot plus monthly change, 12-month growth and trend (None until there is enough history)"""
+        latest = self.latest()
+        ordinal = self.days[-1]
+        month = self.net[self._month] if self.days[self._month] <= ordinal - 30 else None
+        year = self.net[self._year] if self.days[self._year] <= ordinal - 365 else None
+        n, sx, sy, sxy, sxx = self._fit_sums
+        spread = n * sxx - sx * sx
+        return {
+            **latest,
+            "since": date.fromordinal(self.days[0]),
+            "month_delta": None if month is None else latest["net"] - month,
+            "year_ago": year,
+            "year_growth": None if not year or year <= 0 else latest["net"] / year - 1,
+            "trend_per_month": None if n < 2 or spread <= 0 else (n * sxy - sx * sy) / spread * 30,
+        }
+
+class NetWorthStore:
+    """Histories by account, each persisted as `<account>.bin` records.
+    
+    Snapshots are only ever appended to the file; a history loaded in this
+    process is topped up from the file's tail when another worker has
+    written to it, found by comparing the file size.
+    """
+    RECORD = struct.Struct("<i4d")  # day ordinal, cash, investments, property, liabilities
+    
+    def __init__(self, directory=NETWORTH_DIR):
+        self.directory = directory
+        self._histories = {}  # account -> (bytes read, history)
+        self._lock = threading.Lock()
+    
+    def _path(self, account_number):
+        return os.path.join(self.directory, f"{account_number}.bin")
+    
+    def get(self, account_number):
+        """The account's history, or None if nothing was recorded"""
+        path = self._path(account_number)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        with self._lock:
+            offset, history = self._histories.get(account_number, (0, None))
+            if size > offset:
+                history = history if history is not None else NetWorthHistory()
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read(size - offset)
+                for ordinal, *values in self.RECORD.iter_unpack(data[:len(data) - len(data) % self.RECORD.size]):
+                    history.append(date.fromordinal(ordinal), *values)
+                self._histories[account_number] = (offset + len(data) - len(data) % self.RECORD.size, history)
+            return history
+    
+    def record_many(self, account_number, snapshots):
+        """Append (day, cash, investments, property, liabilities) snapshots in date order"""
+        os.makedirs(self.directory, exist_ok=True)
+        data = b"".join(self.RECORD.pack(day.toordinal(), *values) for day, *values in snapshots)
+        with self._lock:
+            with open(self._path(account_number), "ab") as f:
+                f.write(data)
+        return self.get(account_number)
+    
+    def record_balance(self, account_number, balance, day):
+        """Today's snapshot with the current balance, other holdings carried over.
+        
+        Nothing is written when the balance hasn't changed since the last one.
+        """
+        history = self.get(account_number)
+        if history is None:
+            return self.record_many(account_number, [(day, float(balance), 0.0, 0.0, 0.0)])
+        latest = history.latest()
+        if latest["cash"] == balance:
+            return history
+        carried = [latest[field] for field in NetWorthHistory.FIELDS[1:]]
+        return self.record_many(account_number, [(max(day, latest["day"]), float(balance), *carried)])
+    
+    def seed_demo_history(self, today, years=5):
+        """Weekly snapshots for the demo accounts, ending at today's figures.
+        
+        Written to a scratch directory that is renamed into place, so threads
+        or workers starting together seed it exactly once.
+        """
+        if os.path.isdir(self.directory) and os.listdir(self.directory):
+            return
+        scratch = f"{self.directory}.seed-{os.getpid()}-{threading.get_ident()}"
+        os.makedirs(scratch, exist_ok=True)
+        for partition in ("students", "professionals"):
+            for account_number, user in USER_DATABASE[partition].items():
+                rng = random.Random(account_number)
+                salary = user.get("salary")
+                if salary:
+                    cash, investments, property, liabilities = user["balance"], salary * 20, salary * 15, salary * 8
+                else:
+                    cash, investments, property, liabilities = user["balance"], 0, 5000, 2000
+                weeks = years * 52
+                snapshots = []
+                for week in range(weeks, -1, -1):
+                    # Walk back from today: markets and savings grew ~10%/yr, debt shrank
+                    years_ago = week / 52
+                    wobble = 1 + rng.gauss(0, 0.02) if week else 1
+                    snapshots.append((
+                        today - timedelta(weeks=week),
+                        round(cash * (0.6 + 0.4 * (1 - years_ago / years)) * wobble),
+                        round(investments / 1.12 ** years_ago * wobble),
+                        round(property / 1.06 ** years_ago),
+                        round(liabilities * (1 + 0.1 * years_ago)),
+                    ))
+                with open(os.path.join(scratch, f"{account_number}.bin"), "wb") as f:
+                    f.write(b"".join(self.RECORD.pack(day.toordinal(), *values) for day, *values in snapshots))
+        try:
+            os.rename(scratch, self.directory)
+        except OSError:
+            shutil.rmtree(scratch)  # Another thread or worker seeded it first
+
+@lru_cache(maxsize=None)
+def get_net_worth_store():
+    """The process-wide store, with demo history seeded on first use"""
+    store = NetWorthStore()
+    store.seed_demo_history(date.today())
+    return store
+
+def _signed(amount):
+    return f"{'+' if amount >= 0 else '-'}₹{abs(int(amount)):,}"
+
+def render_net_worth(summary, user_type):
+    assets = summary["cash"] + summary["investments"] + summary["property"]
+    lines = ["💰 **Net Worth**", "", f"**Assets:** ₹{int(assets):,}", f"- Balance: ₹{int(summary['cash']):,}"]
+    if summary["investments"]:
+        lines.append(f"- Investments: ₹{int(summary['investments']):,}")
+    if summary["property"]:
+        lines.append(f"- {'Items' if user_type == 'student' else 'Property'}: ₹{int(summary['property']):,}")
+    lines += ["", f"**Liabilities:** ₹{int(summary['liabilities']):,}", "", f"**Net Worth:** ₹{int(summary['net']):,}", ""]
+    
+    if summary["trend_per_month"] is not None:
+        arrow = "📈" if summary["trend_per_month"] >= 0 else "📉"
+        lines.append(f"{arrow} **Trend:** {_signed(summary['trend_per_month'])}/month over the last 90 days")
+    if summary["month_delta"] is not None:
+        lines.append(f"📅 **Last 30 days:** {_signed(summary['month_delta'])}")
+    if summary["year_growth"] is not None:
+        target = summary["year_ago"] * 1.15
+        progress = (summary["net"] - summary["year_ago"]) / (target - summary["year_ago"])
+        status = "✅ On target" if progress >= 1 else f"{max(progress, 0):.0%} of the way"
+        lines.append(f"📊 **12-month growth:** {summary['year_growth']:+.1%} · Target +15% (₹{int(target):,}): {status}")
+    else:
+        lines.append(f"📊 Tracking since {summary['since']:%b %d, %Y} - growth shows after a year of history")
+    return "\n".join(lines)
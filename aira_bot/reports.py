@@ -0,0 +1,291 @@
+"""Report templates: static markdown parsed once at import, {field:spec}
+slots filled from the memoized figures returned by derive_figures()."""
+import string
+from datetime import timedelta
+from functools import lru_cache
+from types import MappingProxyType
+
+from .config import FD_RATE
+
+class ReportTemplate:
+    """Markdown report compiled into literal/field parts at import time"""
+    _formatter = string.Formatter()
+    
+    def __init__(self, text):
+        self.fields = []
+        self.parts = []
+        for literal, field, spec, _ in self._formatter.parse(text):
+            self.parts.append((literal, field, spec))
+            if field is not None:
+                self.fields.append(field)
+    
+    def render(self, figures):
+        out = []
+        for literal, field, spec in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(figures[field], spec))
+        return "".join(out)
+
+REPORT_TEMPLATES = {
+    ("budget_summary", "student"): ReportTemplate("""📊 **Student Budget Summary**
+
+💰 Current Balance: ₹{balance:,}
+
+**Recommended Monthly Budget:**
+- 🍽️ Food & Groceries: ₹3,000 (30%)
+- 🏠 Hostel/Rent: ₹4,000 (40%)
+- 📚 Books & Supplies: ₹1,000 (10%)
+- 🚌 Travel: ₹800 (8%)
+- 🎮 Entertainment: ₹700 (7%)
+- 💾 Savings: ₹500 (5%)
+
+**Total:** ₹10,000/month
+
+💡 Try to save at least 10% of any income!"""),
+    ("budget_summary", "professional"): ReportTemplate("""📊 **Professional Budget Summary**
+
+💰 Monthly Salary: ₹{salary:,}
+💵 Balance: ₹{balance:,}
+
+**50/30/20 Rule:**
+- 🏠 Essentials (50%): ₹{essentials:,}
+- 🎯 Wants (30%): ₹{wants:,}
+- 💎 Savings (20%): ₹{savings:,}
+
+**Tax-Saving Target:** ₹{tax_target:,}
+Invest in 80C, NPS, ELSS"""),
+    ("expense_categorization", "student"): ReportTemplate("""📈 **Expense Categories (Last Month)**
+
+🍽️ Food: ₹3,200 (32%)
+🏠 Rent: ₹4,000 (40%)
+📚 Books: ₹950 (9.5%)
+🚌 Travel: ₹850 (8.5%)
+🎮 Entertainment: ₹700 (7%)
+📱 Internet: ₹300 (3%)
+
+**Total:** ₹10,000
+
+⚠️ Food spending slightly high - try meal planning!"""),
+    ("expense_categorization", "professional"): ReportTemplate("""📈 **Expense Categories (Last Month)**
+
+🏠 Rent: ₹25,000 (33%)
+🛒 Groceries: ₹8,000 (11%)
+🚗 Travel: ₹6,000 (8%)
+💳 EMIs: ₹15,000 (20%)
+🍽️ Dining: ₹5,000 (7%)
+🎬 Entertainment: ₹3,000 (4%)
+👔 Shopping: ₹7,000 (9%)
+⚡ Bills: ₹4,000 (5%)
+💰 Savings: ₹2,000 (3%)
+
+**Total:** ₹75,000
+
+💡 Increase savings to 15%+"""),
+    ("investment_suggestions", "student"): ReportTemplate("""💎 **Investment Ideas**
+
+1. **Recurring Deposit**
+   - ₹500/month
+   - Returns: 6-7%
+   - Safe & disciplined
+
+2. **SIP in Index Funds**
+   - ₹500/month
+   - Nifty 50 funds
+   - Long-term growth
+
+3. **Digital Gold**
+   - ₹100-500/month
+   - Easy to liquidate
+
+4. **PPF**
+   - Lock: 15 years
+   - Tax-free: 7-8%
+
+💡 Start: RD + SIP = ₹1,000/month"""),
+    ("investment_suggestions", "professional"): ReportTemplate("""💎 **Investment Portfolio**
+
+**Monthly Capacity:** ₹{invest:,} (20%)
+
+🎯 **Allocation:**
+1. Equity MF (60%): ₹{invest_equity:,}
+2. Debt (20%): ₹{invest_debt:,}
+3. Gold (10%): ₹{invest_gold:,}
+4. Emergency (10%): ₹{invest_emergency:,}
+
+💰 **20-Year Wealth** ({paths:,} simulations):
+Investment: ₹{invested_20y:,}
+Expected (median): ₹{wealth_p50:,}
+Range (10th-90th): ₹{wealth_p10:,} - ₹{wealth_p90:,}
+After 10 years: ₹{wealth_10y:,}
+Beats FD ({fd_rate:.0%}): {beat_fd:.0%} · Below invested: {loss:.0%}
+
+🏆 **Tax Benefits:**
+ELSS: ₹46,800/year
+NPS: ₹15,600/year"""),
+    ("tax_saving", "student"): ReportTemplate("""💰 **Tax Awareness**
+
+📚 **Basics (FY 2025-26):**
+- New regime: no tax up to ₹12L (₹12.75L on salary)
+- Old regime: no tax up to ₹5L
+- Keep receipts!
+
+💡 **Tips:**
+- Scholarships = tax-free
+- Loan interest deductible
+- Learn about 80C, 80D
+- Get PAN card early"""),
+    ("tax_saving", "professional"): ReportTemplate("""💰 **Tax-Saving Guide (FY 2025-26)**
+
+**Annual:** ₹{annual_income:,}
+
+🧾 **Your Tax:**
+- New regime: ₹{tax_new:,}
+- Old regime, no deductions: ₹{tax_old:,}
+- Old regime, all deductions below: ₹{tax_old_max:,}
+
+✅ **Best:** {best_regime} regime at ₹{best_tax:,} (saves ₹{regime_saving:,})
+{break_even}
+
+🎯 **Old-Regime Deductions:**
+- 80C (₹1.5L): Save ₹{save_80c:,}
+- 80D health insurance (₹25K): Save ₹{save_80d:,}
+- NPS 80CCD(1B) (₹50K): Save ₹{save_nps:,}
+- Home loan 24(b) (₹2L interest): Save ₹{save_24b:,}
+- HRA: rent above 10% of basic, up to 50% of basic (metro)
+
+📋 Review Form 16 and tell your employer your regime early!"""),
+    ("subscription_tracker", "student"): ReportTemplate("""📱 **Subscriptions**
+
+- Netflix: ₹199/mo
+- Spotify: ₹119/mo
+- Google One: ₹130/mo
+- Medium: ₹75/mo
+
+**Total:** ₹523/mo (₹6,276/year)
+
+⚠️ **Save:**
+- Share Netflix: -₹100
+- Free Spotify: -₹119
+- Cancel Medium: -₹75
+
+💰 Potential: -₹294/mo"""),
+    ("subscription_tracker", "professional"): ReportTemplate("""📱 **Subscriptions**
+
+- Netflix: ₹649
+- Prime: ₹1,499/yr
+- Spotify: ₹119
+- LinkedIn: ₹1,700
+- Gym: ₹2,000
+- Cloud: ₹205
+
+**Total:** ₹5,771/mo (₹69,252/year)
+
+⚠️ **Optimize:**
+- Gym: 8 visits (₹250/visit)
+- LinkedIn: Rarely used
+- Consolidate cloud
+
+💰 Save: ₹2,199/mo"""),
+    ("cash_flow", "student"): ReportTemplate("""📊 **Cash Flow**
+
+**Balance:** ₹{balance:,}
+**Daily Spend:** ₹{daily_spend}
+
+📅 **Prediction:**
+- Lasts: ~{runway_days} days
+- Until: {runway_until}
+
+💡 **Extend:**
+Reduce to ₹250/day → +12 days
+Keep ₹2,000 emergency buffer"""),
+    ("cash_flow", "professional"): ReportTemplate("""📊 **Cash Flow**
+
+**Balance:** ₹{balance:,}
+**Monthly Expense:** ₹{monthly_expense:,}
+
+📅 **Runway:** {runway_months:.1f} months
+{runway_status}
+
+💰 **3-Month Projection:**
+M1: ₹{projection_m1:,}
+M2: ₹{projection_m2:,}
+M3: ₹{projection_m3:,}
+
+Annual surplus: ₹{annual_surplus:,}"""),
+}
+
+@lru_cache(maxsize=4096)
+def derive_figures(user_type, balance, salary):
+    """Numbers behind the reports, computed once per (profile, balance, salary).
+    
+    Keying on the values themselves invalidates the memo as soon as a
+    user's balance or salary changes.
+    """
+    if user_type == "student":
+        return MappingProxyType({
+            "balance": balance,
+            "daily_spend": 300,
+            "runway_days": int(balance / 300),
+        })
+    
+    invest = int(salary * 0.2)
+    monthly_expense = int(salary * 0.8)
+    runway_months = balance / monthly_expense
+    return MappingProxyType({
+        "salary": salary,
+        "balance": balance,
+        # 50/30/20 split
+        "essentials": int(salary * 0.5),
+        "wants": int(salary * 0.3),
+        "savings": int(salary * 0.2),
+        "tax_target": int(salary * 0.15),
+        # Portfolio and 20-year projection
+        "invest": invest,
+        "invest_equity": int(invest * 0.6),
+        "invest_debt": int(invest * 0.2),
+        "invest_gold": int(invest * 0.1),
+        "invest_emergency": int(invest * 0.1),
+        "invested_20y": invest * 12 * 20,
+        "fd_rate": FD_RATE,
+        # Tax
+        "annual_income": salary * 12,
+        # Cash flow runway
+        "monthly_expense": monthly_expense,
+        "runway_months": runway_months,
+        "runway_status": "✅ Healthy (6+ months)" if runway_months >= 6 else "⚠️ Build to 6 months",
+        "projection_m1": balance + salary - monthly_expense,
+        "projection_m2": balance + (salary * 2) - (monthly_expense * 2),
+        "projection_m3": balance + (salary * 3) - (monthly_expense * 3),
+        "annual_surplus": (salary - monthly_expense) * 12,
+    })
+
+# Figures only one report needs, computed when that report renders
+# (numpy-backed, so their modules load on the first render)
+def _projection_extras(figures):
+    from .simulation import projection_figures
+    return projection_figures(figures["invest"])
+
+def _tax_extras(figures):
+    from .tax import tax_figures
+    return tax_figures(figures["annual_income"])
+
+REPORT_EXTRAS = {
+    "investment_suggestions": _projection_extras,
+    "tax_saving": _tax_extras,
+}
+
+@lru_cache(maxsize=16384)
+def render_report(feature_name, user_type, balance, salary, today):
+    """Rendered report; repeat clicks with unchanged figures are a cache hit.
+    
+    `today` is part of the key because some reports show dates.
+    """
+    figures = derive_figures(user_type, balance, salary)
+    if "runway_days" in figures:
+        until = today + timedelta(days=figures["runway_days"])
+        figures = {**figures, "runway_until": until.strftime('%b %d')}
+    extras = REPORT_EXTRAS.get(feature_name)
+    if extras is not None and "salary" in figures:
+        figures = {**figures, **extras(figures)}
+    return REPORT_TEMPLATES[feature_name, user_type].render(figures)
@@ -0,0 +1,92 @@
+"""Query routing: which questions skip the model, and how long an answer may be.
+
+Keyword regexes over the question, plus the user type, sort it into one of:
+- "feature": a lookup of the user's own figures (their tax, cash flow, net
+  worth, goals...), answered exactly by the feature report without a model
+  call; asking for advice or a plan about them is never a lookup;
+- "short": a brief factual question ("what is 80C?"), answered in a few
+  sentences by ROUTE_SHORT_MODEL with ROUTE_SHORT_MAX_TOKENS at a low
+  temperature;
+- "detailed": anything that needs planning, with MODEL_NAME and the full
+  MODEL_MAX_TOKENS.
+Stdlib only, and a few microseconds per question.
+"""
+import re
+
+from .config import (
+    MODEL_MAX_TOKENS, MODEL_NAME, MODEL_TEMPERATURE, ROUTE_SHORT_MAX_TOKENS, ROUTE_SHORT_MAX_WORDS, ROUTE_SHORT_MODEL,
+    ROUTE_SHORT_TEMPERATURE, WORD_RE
+)
+
+# Lookups of the user's own numbers, by the feature report that answers them.
+# Lookup-shaped on purpose: "what is my net worth" gets the report, while
+# "how do I grow my net worth" is advice and goes to the model.
+FEATURE_PATTERNS = {
+    "tax_saving": [r"\bhow much (income )?tax (do|will|would|should|must) i (pay|owe)\b",
+                   r"\b(what('s| is)|show|calculate) my (income )?tax\b", r"\bwhich (tax )?regime is (better|cheaper) for me\b"],
+    "cash_flow": [r"\b(what('s| is)|show|predict) my (cash ?flow|runway)\b",
+                  r"\bhow long will my (money|balance|savings) last\b", r"\bwhen will i run out of (money|cash)\b"],
+    "net_worth": [r"\b(what('s| is)|show|calculate) my net ?worth\b", r"\bwhat am i worth\b",
+                  r"\b(what are|show|list) my (total )?(assets|liabilities)\b"],
+    "savings_goal": [r"\b(show|what are|check) my (savings )?goals?\b", r"\bhow close am i to my (savings )?goals?\b",
+                     r"\bhow much have i saved (for|towards)\b"],
+    "bill_reminder": [r"\b(show|what are|list) my (upcoming )?bills\b", r"\bwhat bills are due\b", r"\bwhen is my \w+ due\b"],
+    "subscription_tracker": [r"\b(show|list|what are) my subscriptions\b", r"\bhow much do i spend on subscriptions\b"],
+    "expense_categorization": [r"\bwhere (does|did) my money go\b", r"\b(show|what are) my (spending|expenses)\b",
+                               r"\bwhat did i spend (on|last)\b"],
+    "budget_summary": [r"\b(show|what('s| is)) my (monthly )?budget\b"],
+}
+
+# Planning questions need room; professionals also get it for their heavier topics
+DETAILED_PATTERNS = {
+    "any": [r"\bplan(ning)?\b", r"\bstrateg(y|ies)\b", r"\bstep[- ]by[- ]step\b", r"\broadmap\b", r"\bcompare\b",
+            r"\b(pros and cons|vs|versus)\b", r"\bin detail\b", r"\bexplain\b", r"\bhow should i\b", r"\ballocat"],
+    "student": [r"\beducation loan\b", r"\bstudy abroad\b"],
+    "professional": [r"\bportfolio\b", r"\bretire(ment)?\b", r"\bhome loan\b", r"\binsurance\b", r"\bcorpus\b"],
+}
+# Asking how to change the numbers, not what they are: always the model's job
+ADVICE_RE = re.compile(r"\b(how (can|should|do) i|should i|help me|reduce|improve|increase|grow|advice|advise|tips?|faster|if (my|i))\b")
+# Openers of a question with a one-line answer
+SHORT_RE = re.compile(r"^\s*(what(?:'s| is| are| does)|who|when|which|is|are|does|do|can|define|meaning of)\b")
+SHORT_INSTRUCTION = "This is a quick question: answer in two or three sentences."
+
+def _compile(patterns):
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+FEATURE_RES = [(feature, _compile(patterns)) for feature, patterns in FEATURE_PATTERNS.items()]
+# Every feature pattern is in the first person; most other questions skip them all on this
+FIRST_PERSON_RE = re.compile(r"\b(my|i|me)\b")
+DETAILED_RES = {
+    user_type: _compile(DETAILED_PATTERNS["any"] + DETAILED_PATTERNS[user_type])
+    for user_type in ("student", "professional")
+}
+
+class Route:
+    """How to answer one question: a feature report, or a model within a token budget"""
+    __slots__ = ("kind", "feature", "model", "max_tokens", "temperature")
+    
+    def __init__(self, kind, feature=None, model=MODEL_NAME, max_tokens=MODEL_MAX_TOKENS, temperature=MODEL_TEMPERATURE):
+        self.kind = kind
+        self.feature = feature
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+    
+    def __repr__(self):
+        return f"Route({self.kind!r}, feature={self.feature!r}, model={self.model!r}, max_tokens={self.max_tokens})"
+
+SHORT = Route("short", model=ROUTE_SHORT_MODEL, max_tokens=ROUTE_SHORT_MAX_TOKENS, temperature=ROUTE_SHORT_TEMPERATURE)
+DETAILED = Route("detailed")
+
+def classify(message, user_type):
+    """Route for a question from this kind of user"""
+    message = message.lower()  # Patterns are lowercase; cheaper than re.I
+    if DETAILED_RES.get(user_type, DETAILED_RES["student"]).search(message) or ADVICE_RE.search(message):
+        return DETAILED
+    if FIRST_PERSON_RE.search(message):
+        for feature, pattern in FEATURE_RES:
+            if pattern.search(message):
+                return Route("feature", feature)
+    if SHORT_RE.match(message) and len(WORD_RE.findall(message)) <= ROUTE_SHORT_MAX_WORDS:
+        return SHORT
+    return DETAILED
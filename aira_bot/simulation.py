@@ -0,0 +1,89 @@
+"""Portfolio simulation: correlated yearly returns per asset class, drawn for
+many paths at once, turned into percentile wealth for a monthly SIP."""
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from .config import FD_RATE, SIMULATION_PATHS, SIMULATION_SEED, SIMULATION_WORKERS
+
+ASSET_CLASSES = ("equity", "debt", "gold", "cash")
+ASSET_RETURNS = np.array([0.12, 0.07, 0.09, 0.04])  # Expected nominal yearly return
+ASSET_VOLATILITY = np.array([0.18, 0.04, 0.15, 0.01])
+ASSET_CORRELATION = np.array([
+    [1.00, 0.10, -0.10, 0.00],
+    [0.10, 1.00, 0.10, 0.20],
+    [-0.10, 0.10, 1.00, 0.00],
+    [0.00, 0.20, 0.00, 1.00],
+])
+ASSET_CHOLESKY = np.linalg.cholesky(ASSET_CORRELATION) * ASSET_VOLATILITY[:, None]
+ASSET_DRIFT = np.log1p(ASSET_RETURNS) - 0.5 * ASSET_VOLATILITY ** 2  # Log-return mean matching ASSET_RETURNS
+DEFAULT_ALLOCATION = (0.6, 0.2, 0.1, 0.1)  # Equity MF / debt / gold / emergency (cash)
+
+@lru_cache(maxsize=1024)
+def simulate_portfolio(monthly, allocation=DEFAULT_ALLOCATION, horizon_years=20,
+                       paths=SIMULATION_PATHS, seed=SIMULATION_SEED):
+    """Percentile wealth for investing `monthly` every month in `allocation`.
+    
+    Each path draws correlated log-normal yearly returns per asset class
+    (Cholesky of ASSET_CORRELATION) and rebalances to `allocation` once a
+    year; the year's contributions are credited mid-year, so they earn half
+    of that year's growth. Stepping yearly rather than monthly keeps 10k
+    paths x 20 years within a few milliseconds. The fixed seed makes results
+    repeatable, so they are memoized per (monthly, allocation, horizon).
+    """
+    weights = np.asarray(allocation, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((paths, horizon_years, len(ASSET_CLASSES))) @ ASSET_CHOLESKY.T
+    growth = np.exp(shocks + ASSET_DRIFT) @ weights  # (paths, years) portfolio growth factors
+    
+    wealth = np.empty((paths, horizon_years))
+    balance = np.zeros(paths)
+    for year in range(horizon_years):
+        balance = balance * growth[:, year] + 12 * monthly * np.sqrt(growth[:, year])
+        wealth[:, year] = balance
+    
+    invested = 12 * monthly * np.arange(1, horizon_years + 1)
+    fd = 12 * monthly * np.sqrt(1 + FD_RATE) * ((1 + FD_RATE) ** horizon_years - 1) / FD_RATE  # Same schedule at FD_RATE
+    p10, p50, p90 = np.percentile(wealth, [10, 50, 90], axis=0)
+    for column in (invested, p10, p50, p90):
+        column.setflags(write=False)
+    return MappingProxyType({
+        "paths": paths,
+        "invested": invested,
+        "p10": p10,
+        "p50": p50,
+        "p90": p90,
+        "beat_fd": float((wealth[:, -1] > fd).mean()),
+        "loss": float((wealth[:, -1] < invested[-1]).mean()),
+    })
+
+def sweep_portfolios(scenarios, workers=SIMULATION_WORKERS):
+    """simulate_portfolio() for many (monthly, allocation, horizon) what-ifs.
+    
+    Scenarios are spread over a process pool; results come back in order.
+    """
+    scenarios = [(monthly, tuple(allocation), horizon) for monthly, allocation, horizon in scenarios]
+    if workers <= 1 or len(scenarios) < 2:
+        return [simulate_portfolio(*scenario) for scenario in scenarios]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(scenarios) // (workers * 4))
+        # MappingProxyType doesn't pickle, so workers send plain dicts back
+        return [MappingProxyType(result) for result in pool.map(_simulate_plain, scenarios, chunksize=chunksize)]
+
+def _simulate_plain(scenario):
+    return dict(simulate_portfolio(*scenario))
+
+def projection_figures(monthly, allocation=DEFAULT_ALLOCATION, horizon_years=20):
+    """Report fields for the simulated outcome at 10 years and at the horizon"""
+    result = simulate_portfolio(monthly, allocation, horizon_years)
+    return {
+        "paths": result["paths"],
+        "wealth_10y": int(result["p50"][min(10, horizon_years) - 1]),
+        "wealth_p10": int(result["p10"][-1]),
+        "wealth_p50": int(result["p50"][-1]),
+        "wealth_p90": int(result["p90"][-1]),
+        "beat_fd": result["beat_fd"],
+        "loss": result["loss"],
+    }
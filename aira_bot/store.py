@@ -0,0 +1,172 @@
+"""Shared state: sessions, cached answers and rate-limit counters.
+
+All of it goes through a small key-value store. MemoryStore keeps it in
+this process; RedisStore (needs the `redis` package) points every worker
+at the same Redis-compatible server, so any worker can serve any user.
+"""
+import asyncio
+import json
+import secrets
+import threading
+import time
+from functools import lru_cache
+
+from .config import SESSION_TTL_SECONDS, STORE_URL
+
+class MemoryStore:
+    """Dict with per-key expiry, for a single process"""
+    shared = False
+    
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._data = {}  # key -> (value, expires_at or None)
+        self._lock = threading.Lock()
+        self._sweep_at = 1024
+    
+    def _entry(self, key):
+        """Live (value, expires_at) for key, dropping it if expired; caller holds the lock"""
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= self._clock():
+            del self._data[key]
+            return None
+        return entry
+    
+    def _put(self, key, value, expires_at):
+        self._data[key] = (value, expires_at)
+        # Keys nobody reads again (old rate windows, abandoned sessions) are swept
+        # whenever the dict doubles, so the cost stays amortized O(1) per write
+        if len(self._data) >= self._sweep_at:
+            now = self._clock()
+            self._data = {k: e for k, e in self._data.items() if e[1] is None or e[1] > now}
+            self._sweep_at = max(1024, 2 * len(self._data))
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entry(key)
+            return None if entry is None else entry[0]
+    
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._put(key, value, None if ttl is None else self._clock() + ttl)
+    
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def expire(self, key, ttl):
+        with self._lock:
+            entry = self._entry(key)
+            if entry is not None:
+                self._data[key] = (entry[0], self._clock() + ttl)
+    
+    def incr(self, key, ttl):
+        """Add one to a counter and return it; a new counter expires after `ttl` seconds"""
+        with self._lock:
+            entry = self._entry(key)
+            count = 1 if entry is None else entry[0] + 1
+            self._put(key, count, self._clock() + ttl if entry is None else entry[1])
+            return count
+
+class RedisStore:
+    """The same interface over a Redis-compatible server, shared by all workers"""
+    shared = True
+    
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("A redis:// AIRA_STORE_URL needs the redis package: pip install 'aira-bot[redis]'") from None
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+    
+    def get(self, key):
+        return self._redis.get(key)
+    
+    def set(self, key, value, ttl=None):
+        self._redis.set(key, value, ex=None if ttl is None else int(ttl))
+    
+    def delete(self, key):
+        self._redis.delete(key)
+    
+    def expire(self, key, ttl):
+        self._redis.expire(key, int(ttl))
+    
+    def incr(self, key, ttl):
+        # One round trip: create the counter with its expiry if missing, then count
+        pipe = self._redis.pipeline()
+        pipe.set(key, 0, ex=int(ttl), nx=True)
+        pipe.incr(key)
+        return pipe.execute()[1]
+
+def create_store(url=STORE_URL):
+    if url in ("", "memory://"):
+        return MemoryStore()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStore(url)
+    raise ValueError(f"Unsupported store URL {url!r}: use memory:// or redis://host:port/db")
+
+async def off_loop(store, func, *args):
+    """func(*args) from an async handler: in a worker thread when `store` is
+    shared, so its network round trips don't block the event loop"""
+    if not store.shared:
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
+
+@lru_cache(maxsize=None)
+def get_store():
+    """The process-wide store, created on first use"""
+    return create_store()
+
+def new_session():
+    return {
+        "logged_in": False,
+        "user_type": None,
+        "account_number": None,
+        "user_data": None,
+        "hf_token": None
+    }
+
+class SessionStore:
+    """Sessions as JSON in the store, keyed by a random id the browser keeps.
+    
+    Expiry slides: loading a session pushes it back by `ttl` seconds.
+    """
+    PREFIX = "aira:session:"
+    
+    def __init__(self, store, ttl=SESSION_TTL_SECONDS):
+        self.store = store
+        self.ttl = ttl
+    
+    def load(self, session_id):
+        """The session for this id, or a new logged-out one if it is unknown or expired"""
+        if session_id:
+            data = self.store.get(self.PREFIX + session_id)
+            if data is not None:
+                self.store.expire(self.PREFIX + session_id, self.ttl)
+                return json.loads(data)
+        return new_session()
+    
+    def save(self, session_id, session):
+        """Store the session and return its id, minting one for a new session"""
+        session_id = session_id or secrets.token_urlsafe(24)
+        self.store.set(self.PREFIX + session_id, json.dumps(session), self.ttl)
+        return session_id
+    
+    def delete(self, session_id):
+        if session_id:
+            self.store.delete(self.PREFIX + session_id)
+
+class RateLimiter:
+    """At most `limit` hits per key per `window` seconds, counted across workers"""
+    def __init__(self, store, name, limit, window=60, clock=time.time):
+        self.store = store
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self._clock = clock
+    
+    def allow(self, key):
+        if self.limit <= 0:
+            return True
+        # Fixed windows on wall-clock time, so every worker counts into the same one
+        window = int(self._clock() // self.window)
+        return self.store.incr(f"aira:rate:{self.name}:{key}:{window}", self.window) <= self.limit
@@ -0,0 +1,147 @@
+"""Income tax, FY 2025-26 (AY 2026-27), resident individuals below 60.
+
+Each regime is a plain table; TaxRegime compiles it into arrays once at
+import so whole cohorts are taxed with a few searchsorted lookups.
+"""
+import numpy as np
+
+TAX_CESS_RATE = 0.04  # Health & education cess on tax + surcharge
+TAX_RULES = {
+    "new": {
+        "slabs": [(0, 0.0), (400_000, 0.05), (800_000, 0.10), (1_200_000, 0.15),
+                  (1_600_000, 0.20), (2_000_000, 0.25), (2_400_000, 0.30)],
+        "standard_deduction": 75_000,
+        # 87A: nil tax up to ₹12L taxable; just above it, tax is capped at the excess
+        "rebate_limit": 1_200_000, "rebate_max": 60_000, "rebate_marginal_relief": True,
+        "surcharge": [(0, 0.0), (5_000_000, 0.10), (10_000_000, 0.15), (20_000_000, 0.25)],
+    },
+    "old": {
+        "slabs": [(0, 0.0), (250_000, 0.05), (500_000, 0.20), (1_000_000, 0.30)],
+        "standard_deduction": 50_000,
+        "rebate_limit": 500_000, "rebate_max": 12_500, "rebate_marginal_relief": False,
+        "surcharge": [(0, 0.0), (5_000_000, 0.10), (10_000_000, 0.15), (20_000_000, 0.25), (50_000_000, 0.37)],
+    },
+}
+# Old-regime deduction caps; 80D parents assumes senior-citizen parents
+DEDUCTION_LIMITS = {"80c": 150_000, "80d": 25_000, "80d_parents": 50_000, "80ccd_1b": 50_000, "24b": 200_000}
+
+class TaxRegime:
+    """One regime's slabs, 87A rebate and surcharge, compiled to arrays.
+    
+    `base[i]` is the tax due at the lower edge of slab i, so slab tax is a
+    searchsorted plus one multiply-add. Surcharge marginal relief (tax +
+    surcharge may exceed the amount due at a threshold by at most the income
+    above it) uses the amount due at each threshold, also precomputed.
+    """
+    def __init__(self, slabs, standard_deduction, rebate_limit, rebate_max, rebate_marginal_relief, surcharge):
+        self.lower = np.array([edge for edge, _ in slabs], dtype=np.float64)
+        self.rates = np.array([rate for _, rate in slabs])
+        self.base = np.concatenate(([0.0], np.cumsum(np.diff(self.lower) * self.rates[:-1])))
+        self.standard_deduction = standard_deduction
+        self.rebate_limit = rebate_limit
+        self.rebate_max = rebate_max
+        self.rebate_marginal_relief = rebate_marginal_relief
+        self.surcharge_lower = np.array([edge for edge, _ in surcharge], dtype=np.float64)
+        self.surcharge_rates = np.array([rate for _, rate in surcharge])
+        previous_rates = np.concatenate(([0.0], self.surcharge_rates[:-1]))
+        self.relief_base = self._after_rebate(self.surcharge_lower) * (1 + previous_rates)
+    
+    def slab_tax(self, taxable):
+        i = np.searchsorted(self.lower, taxable, side="right") - 1
+        return self.base[i] + (taxable - self.lower[i]) * self.rates[i]
+    
+    def _after_rebate(self, taxable):
+        tax = self.slab_tax(taxable)
+        within = taxable <= self.rebate_limit
+        tax = np.where(within, np.maximum(tax - self.rebate_max, 0), tax)
+        if self.rebate_marginal_relief:
+            tax = np.where(within, tax, np.minimum(tax, taxable - self.rebate_limit))
+        return tax
+    
+    def tax(self, taxable):
+        """Total tax (after rebate, surcharge and cess) on taxable income"""
+        taxable = np.asarray(taxable, dtype=np.float64)
+        tax = self._after_rebate(taxable)
+        k = np.searchsorted(self.surcharge_lower, taxable, side="right") - 1
+        total = tax * (1 + self.surcharge_rates[k])
+        relieved = self.relief_base[k] + (taxable - self.surcharge_lower[k])
+        total = np.where(k > 0, np.minimum(total, relieved), total)
+        return np.round(total * (1 + TAX_CESS_RATE))
+
+TAX_REGIMES = {name: TaxRegime(**rules) for name, rules in TAX_RULES.items()}
+
+def hra_exemption(basic, hra_received, rent_paid, metro):
+    """Least of HRA received, rent over 10% of basic, and 50% (metro) / 40% of basic"""
+    return np.clip(np.minimum(np.minimum(hra_received, rent_paid - 0.1 * basic),
+                              np.where(metro, 0.5, 0.4) * basic), 0, None)
+
+def compute_tax(gross, basic=0, hra_received=0, rent_paid=0, metro=False, section_80c=0, section_80d=0,
+                section_80d_parents=0, section_80ccd_1b=0, home_loan_interest=0):
+    """Tax under both regimes for annual salaries; every argument may be an
+    array (one entry per user) or a scalar.
+    
+    Deductions are what was actually paid; caps from DEDUCTION_LIMITS are
+    applied here, and only the old regime allows them.
+    """
+    gross = np.asarray(gross, dtype=np.float64)
+    old, new = TAX_REGIMES["old"], TAX_REGIMES["new"]
+    deductions = (
+        hra_exemption(basic, hra_received, rent_paid, metro)
+        + np.minimum(section_80c, DEDUCTION_LIMITS["80c"])
+        + np.minimum(section_80d, DEDUCTION_LIMITS["80d"])
+        + np.minimum(section_80d_parents, DEDUCTION_LIMITS["80d_parents"])
+        + np.minimum(section_80ccd_1b, DEDUCTION_LIMITS["80ccd_1b"])
+        + np.minimum(home_loan_interest, DEDUCTION_LIMITS["24b"])
+    )
+    gross, deductions = np.broadcast_arrays(gross, deductions)
+    taxable_old = np.maximum(gross - old.standard_deduction - deductions, 0)
+    taxable_new = np.maximum(gross - new.standard_deduction, 0)
+    tax_old = old.tax(taxable_old)
+    tax_new = new.tax(taxable_new)
+    return {
+        "taxable_old": taxable_old,
+        "taxable_new": taxable_new,
+        "old": tax_old,
+        "new": tax_new,
+        "new_is_better": tax_new <= tax_old,
+    }
+
+# Deduction sweep for the break-even point in tax_figures(): ₹0 to ₹10L in ₹1,000 steps
+BREAK_EVEN_DEDUCTIONS = np.arange(0, 1_000_001, 1_000, dtype=np.float64)
+
+def tax_figures(annual_income):
+    """Report fields: both regimes, what each deduction saves, break-even"""
+    # Rows: nothing claimed, each section maxed alone, all of them together
+    claims = np.array([
+        [0, 0, 0, 0],
+        [DEDUCTION_LIMITS["80c"], 0, 0, 0],
+        [0, DEDUCTION_LIMITS["80d"], 0, 0],
+        [0, 0, DEDUCTION_LIMITS["80ccd_1b"], 0],
+        [0, 0, 0, DEDUCTION_LIMITS["24b"]],
+        [DEDUCTION_LIMITS["80c"], DEDUCTION_LIMITS["80d"], DEDUCTION_LIMITS["80ccd_1b"], DEDUCTION_LIMITS["24b"]],
+    ])
+    result = compute_tax(annual_income, section_80c=claims[:, 0], section_80d=claims[:, 1],
+                         section_80ccd_1b=claims[:, 2], home_loan_interest=claims[:, 3])
+    old = result["old"].astype(np.int64)
+    tax_new = int(result["new"][0])
+    
+    # Smallest total deduction at which the old regime is no worse than the new one
+    taxable = np.maximum(annual_income - TAX_REGIMES["old"].standard_deduction - BREAK_EVEN_DEDUCTIONS, 0)
+    wins = np.flatnonzero(TAX_REGIMES["old"].tax(taxable) <= tax_new)
+    break_even = (f"Old regime wins once deductions reach ₹{int(BREAK_EVEN_DEDUCTIONS[wins[0]]):,}" if len(wins)
+                  else "New regime wins even with ₹10L+ of deductions")
+    
+    best_old = int(old[-1])
+    return {
+        "tax_new": tax_new,
+        "tax_old": int(old[0]),
+        "tax_old_max": best_old,
+        "save_80c": int(old[0] - old[1]),
+        "save_80d": int(old[0] - old[2]),
+        "save_nps": int(old[0] - old[3]),
+        "save_24b": int(old[0] - old[4]),
+        "best_regime": "New" if tax_new <= best_old else "Old",
+        "best_tax": min(tax_new, best_old),
+        "regime_saving": abs(tax_new - best_old),
+        "break_even": break_even,
+    }
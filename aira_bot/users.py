@@ -0,0 +1,194 @@
+"""Accounts: SQLite user store with salted password hashes."""
+import csv
+import hashlib
+import hmac
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+from .config import PASSWORD_HASH_ITERATIONS, USER_DB_PATH, USER_DB_POOL_SIZE
+
+# Demo accounts, seeded into the user store on first start
+USER_DATABASE = {
+    "students": {
+        "STU001": {"password": "student123", "name": "Alex Kumar", "balance": 15000},
+        "STU002": {"password": "study456", "name": "Priya Sharma", "balance": 12000}
+    },
+    "professionals": {
+        "PRO001": {"password": "work123", "name": "Rajesh Patel", "salary": 75000, "balance": 150000},
+        "PRO002": {"password": "prof456", "name": "Anita Singh", "salary": 95000, "balance": 200000}
+    }
+}
+
+def hash_password(password, salt, iterations=PASSWORD_HASH_ITERATIONS):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+class UserStore:
+    """SQLite-backed accounts with salted PBKDF2 password hashes.
+    
+    One `users` table with a `user_type` column and a unique index on
+    account_number, so login is a single indexed lookup. Connections come
+    from a small pool; WAL mode lets logins read while a bulk import writes.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            account_number TEXT NOT NULL,
+            user_type TEXT NOT NULL CHECK (user_type IN ('student', 'professional')),
+            name TEXT NOT NULL,
+            salary INTEGER,
+            balance INTEGER NOT NULL DEFAULT 0,
+            password_salt BLOB NOT NULL,
+            password_hash BLOB NOT NULL,
+            hash_iterations INTEGER NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS users_account_number ON users (account_number);
+    """
+    UPSERT = """
+        INSERT INTO users (account_number, user_type, name, salary, balance,
+                           password_salt, password_hash, hash_iterations)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (account_number) DO UPDATE SET
+            user_type = excluded.user_type, name = excluded.name, salary = excluded.salary,
+            balance = excluded.balance, password_salt = excluded.password_salt,
+            password_hash = excluded.password_hash, hash_iterations = excluded.hash_iterations
+    """
+    
+    def __init__(self, path=USER_DB_PATH, pool_size=USER_DB_POOL_SIZE):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        else:
+            pool_size = 1  # Every connection to :memory: opens a database of its own
+        self.path = path
+        self._pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._pool.put(conn)
+        with self.connection() as conn:
+            conn.executescript(self.SCHEMA)
+        # Hashed for unknown accounts so a miss costs the same as a wrong password
+        self._dummy_salt = os.urandom(16)
+    
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+    
+    def count(self):
+        with self.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+    
+    def balances(self, account_numbers, batch_size=500):
+        """{account_number: balance} for the given accounts"""
+        found = {}
+        account_numbers = list(account_numbers)
+        with self.connection() as conn:
+            for i in range(0, len(account_numbers), batch_size):
+                batch = account_numbers[i:i + batch_size]
+                placeholders = ",".join("?" * len(batch))
+                found.update(conn.execute(
+                    f"SELECT account_number, balance FROM users WHERE account_number IN ({placeholders})", batch
+                ))
+        return found
+    
+    def authenticate(self, account_number, password):
+        """(user_type, user_data) for valid credentials, else None"""
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT user_type, name, salary, balance, password_salt, password_hash, hash_iterations "
+                "FROM users WHERE account_number = ?", (account_number,)
+            ).fetchone()
+        if row is None:
+            hash_password(password, self._dummy_salt)
+            return None
+        user_type, name, salary, balance, salt, stored_hash, iterations = row
+        if not hmac.compare_digest(hash_password(password, salt, iterations), stored_hash):
+            return None
+        user_data = {"name": name, "balance": balance, "account_number": account_number}
+        if salary is not None:
+            user_data["salary"] = salary
+        return user_type, user_data
+    
+    def _hash_row(self, user):
+        if user.get("password_hash"):
+            # Migrated credentials: hex salt/hash already computed elsewhere
+            salt = bytes.fromhex(user["password_salt"])
+            password_hash = bytes.fromhex(user["password_hash"])
+            iterations = int(user["hash_iterations"])
+        else:
+            salt = os.urandom(16)
+            password_hash = hash_password(user["password"], salt)
+            iterations = PASSWORD_HASH_ITERATIONS
+        return (
+            user["account_number"], user["user_type"], user["name"],
+            int(user["salary"]) if user.get("salary") not in (None, "") else None,
+            int(user.get("balance") or 0),
+            salt, password_hash, iterations
+        )
+    
+    def bulk_import(self, users, batch_size=2000, workers=None):
+        """Insert or update accounts from an iterable of dicts
+        (account_number, user_type, name, password, balance, salary).
+        
+        Rows may carry password_salt/password_hash/hash_iterations (hex)
+        instead of a password to migrate pre-hashed credentials without
+        paying the hash cost. Hashing runs on a thread pool (pbkdf2_hmac
+        releases the GIL) and rows are written in batched transactions, so
+        the app keeps serving logins during large imports. Returns the
+        number of accounts written.
+        """
+        written = 0
+        batch = []
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            for user in users:
+                batch.append(user)
+                if len(batch) >= batch_size:
+                    written += self._write_batch(pool, batch)
+                    batch = []
+            if batch:
+                written += self._write_batch(pool, batch)
+        return written
+    
+    def _write_batch(self, pool, batch):
+        rows = list(pool.map(self._hash_row, batch))
+        with self.connection() as conn:
+            with conn:
+                conn.executemany(self.UPSERT, rows)
+        return len(rows)
+    
+    def import_csv(self, path, **kwargs):
+        """Bulk import from a CSV with a header row of the bulk_import fields"""
+        with open(path, newline="", encoding="utf-8") as f:
+            return self.bulk_import(csv.DictReader(f), **kwargs)
+    
+    def seed_demo_accounts(self):
+        if self.count():
+            return
+        self.bulk_import(
+            {"account_number": account_number, "user_type": user_type, **user}
+            for partition, user_type in (("students", "student"), ("professionals", "professional"))
+            for account_number, user in USER_DATABASE[partition].items()
+        )
+
+_user_store_lock = threading.Lock()
+
+def get_user_store():
+    """The process-wide store, opened and seeded with demo accounts on first use.
+    Logins arriving together wait for the first one instead of each hashing
+    the demo passwords again."""
+    with _user_store_lock:
+        return _open_user_store()
+
+@lru_cache(maxsize=None)
+def _open_user_store():
+    store = UserStore()
+    store.seed_demo_accounts()
+    return store
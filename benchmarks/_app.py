@@ -0,0 +1,37 @@
+"""Load the aira_bot package for benchmarks, without installing it.
+
+load_app() returns one namespace holding the public names of the given
+submodules (default: all of them, including the Gradio app, which loads
+gradio). Attributes are shared objects, so e.g. `app.chatbot.client = ...`
+swaps the client the handlers use.
+
+The package is pointed at a scratch AIRA_DATA_DIR, removed at exit, so a
+benchmark never reads or writes the real user store, ledgers or indexes.
+"""
+import importlib
+import os
+import pathlib
+import sys
+import tempfile
+import types
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+MODULES = ("config", "users", "metrics", "model", "content", "faq", "ledger", "forecast",
+           "simulation", "tax", "reports", "chat", "app")
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Set before aira_bot.config is imported, which reads it once
+DATA_DIR = tempfile.TemporaryDirectory(prefix="aira_bench_")
+os.environ["AIRA_DATA_DIR"] = DATA_DIR.name
+
+
+def load_app(*modules):
+    namespace = types.SimpleNamespace()
+    for name in modules or MODULES:
+        module = importlib.import_module(f"aira_bot.{name}")
+        for attr, value in vars(module).items():
+            if not attr.startswith("__"):
+                setattr(namespace, attr, value)
+    return namespace
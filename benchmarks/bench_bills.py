@@ -0,0 +1,61 @@
+"""Benchmark: bill reminders for a large user base.
+
+Loads N users with a handful of recurring bills each into an in-memory
+BillScheduler, then times upcoming() per user against a scan over every
+bill, and one day's tick() against checking every bill for a reminder.
+
+    python benchmarks/bench_bills.py [users]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from _app import load_app
+
+RULES = ["monthly:{day}", "monthly:{day}", "monthly:{day}", "weekly:{weekday}", "yearly:{month:02d}-{day:02d}", "every:14"]
+
+
+def main(users=100_000, lookups=20_000):
+    app = load_app("bills")
+    rng = random.Random(7)
+    today = date(2026, 1, 1)
+    bills = [
+        {"account_number": f"U{user:07d}", "name": f"Bill {i}", "amount": rng.randint(100, 20_000),
+         "rule": rule.format(day=rng.randint(1, 28), weekday=rng.randint(0, 6), month=rng.randint(1, 12)),
+         "first_due": today - timedelta(days=rng.randint(0, 60))}
+        for user in range(users) for i, rule in enumerate(rng.sample(RULES, rng.randint(3, 6)))
+    ]
+    started = time.perf_counter()
+    scheduler = app.BillScheduler(":memory:", clock=lambda: today)
+    scheduler.add_many(bills)
+    print(f"{len(bills):,} bills for {users:,} users loaded in {time.perf_counter() - started:.2f} s")
+
+    accounts = [f"U{rng.randrange(users):07d}" for _ in range(lookups)]
+    started = time.perf_counter()
+    for account in accounts:
+        scheduler.upcoming(account, today)
+    heap_us = (time.perf_counter() - started) / lookups * 1e6
+
+    # What a per-request scan costs: every bill, filtered to the account
+    started = time.perf_counter()
+    for account in accounts[:20]:
+        sorted(app.next_due(b["rule"], b["first_due"], today) for b in bills if b["account_number"] == account)
+    scan_us = (time.perf_counter() - started) / 20 * 1e6
+    print(f"upcoming: {heap_us:8.1f} us/user (heap)   {scan_us:10.1f} us/user (scan)")
+
+    started = time.perf_counter()
+    sent = scheduler.tick(today)
+    print(f"first tick: {sent:,} reminders in {(time.perf_counter() - started) * 1e3:.0f} ms")
+    days, sent, started = 30, 0, time.perf_counter()
+    for offset in range(1, days + 1):
+        sent += scheduler.tick(today + timedelta(days=offset))
+    tick_ms = (time.perf_counter() - started) / days * 1e3
+    started = time.perf_counter()
+    sum(1 for b in bills if app.next_due(b["rule"], b["first_due"], today) <= today + timedelta(days=3))
+    scan_ms = (time.perf_counter() - started) * 1e3
+    print(f"daily tick: {tick_ms:8.1f} ms/day ({sent / days:,.0f} reminders/day)   scan of all bills: {scan_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,127 @@
+"""Benchmark: circuit breaker transitions against a failing fake endpoint.
+
+Drives FinanceChatbot with FakeInferenceClient through trip, half-open and
+recovery, including a probe cancelled mid-call and a probe turned away by
+a full limiter, asserting the breaker state after each step. Also times a
+chat against the failing endpoint with the breaker closed (stream attempt
+plus retry) and open (local tip, no model call), and checks that long
+answers from a healthy endpoint don't count as slow calls.
+
+    python benchmarks/bench_breaker.py
+"""
+import asyncio
+import itertools
+import time
+
+from _app import load_app
+
+USER = {"name": "Bench", "balance": 50_000, "salary": 80_000}
+_questions = itertools.count()
+
+
+async def ask(app, bot):
+    """One chat turn with a question no FAQ entry or cache answers; returns the final reply"""
+    question = f"Describe the tradeoffs of option {next(_questions)} for a freelancer"
+    reply = None
+    async for reply in bot.generate_response(question, "professional", USER):
+        pass
+    return reply
+
+
+def check(bot, state, step):
+    breaker = bot.breaker
+    assert breaker.state == state, f"{step}: expected {state}, got {breaker.state}"
+    assert not breaker._probe_in_flight, f"{step}: probe still marked in flight"
+    assert not bot.client.open_streams, f"{step}: {bot.client.open_streams} model streams left open"
+    print(f"  {step:<34} {breaker.state}")
+
+
+async def scenarios(app):
+    now = [0.0]
+    bot = app.FinanceChatbot("stub")
+    bot.client = app.FakeInferenceClient(first_token_latency=0.01, healthy=False)
+    bot.breaker = app.CircuitBreaker(window=10, min_calls=3, failure_rate=0.5, slow_call_seconds=5,
+                                     slow_token_seconds=0.5, cooldown_seconds=30, clock=lambda: now[0])
+    print("transitions:")
+
+    # Trip: each failing chat records the stream failure and the failed retry
+    started = time.perf_counter()
+    await ask(app, bot)
+    closed_ms = (time.perf_counter() - started) * 1e3
+    await ask(app, bot)
+    check(bot, bot.breaker.OPEN, "failing endpoint trips it")
+    calls = bot.client.calls
+    started = time.perf_counter()
+    reply = await ask(app, bot)
+    open_ms = (time.perf_counter() - started) * 1e3
+    assert bot.client.calls == calls and "having trouble" in reply
+    check(bot, bot.breaker.OPEN, "open: answered locally")
+
+    # Cooldown over, probe cancelled mid-call: the next chat may probe again
+    now[0] += 31
+    bot.client.first_token_latency = 1.0
+    task = asyncio.ensure_future(ask(app, bot))
+    await asyncio.sleep(0.05)
+    assert bot.breaker._probe_in_flight
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    check(bot, bot.breaker.HALF_OPEN, "probe cancelled mid-call")
+
+    # Probe turned away by a full limiter
+    bot.limiter = app.InferenceLimiter(max_in_flight=1, max_waiting=0)
+    held, release = asyncio.Event(), asyncio.Event()
+
+    async def hold_slot():
+        async with bot.limiter.slot():
+            held.set()
+            await release.wait()
+    holder = asyncio.ensure_future(hold_slot())
+    await held.wait()
+    reply = await ask(app, bot)
+    assert "🚦" in reply
+    check(bot, bot.breaker.HALF_OPEN, "probe turned away busy")
+    release.set()
+    await holder
+
+    # Healthy again: the next probe closes it
+    bot.client.healthy = True
+    bot.client.first_token_latency = 0.01
+    reply = await ask(app, bot)
+    assert "guidance" in reply
+    check(bot, bot.breaker.CLOSED, "healthy probe recovers")
+
+    # A failing probe re-opens it for another cooldown
+    bot.client.healthy = False
+    for _ in range(2):
+        await ask(app, bot)
+    now[0] += 31
+    await ask(app, bot)
+    check(bot, bot.breaker.OPEN, "failing probe re-opens")
+    return closed_ms, open_ms
+
+
+async def slow_scenarios(app):
+    """Long answers from a healthy endpoint are not slow calls; a late first token is"""
+    bot = app.FinanceChatbot("stub")
+    bot.client = app.FakeInferenceClient(reply="word " * 60, first_token_latency=0.01, tokens_per_second=100)
+    bot.breaker = app.CircuitBreaker(window=10, min_calls=3, failure_rate=0.5, slow_call_seconds=0.3,
+                                     slow_token_seconds=0.05, cooldown_seconds=30)
+    print("slow calls:")
+    for _ in range(3):
+        await ask(app, bot)
+    check(bot, bot.breaker.CLOSED, "long healthy answers (0.6 s)")
+    bot.client.first_token_latency = 0.4
+    for _ in range(3):
+        await ask(app, bot)
+    check(bot, bot.breaker.OPEN, "late first tokens trip it")
+
+
+def main():
+    app = load_app("config", "model", "chat")
+    closed_ms, open_ms = asyncio.run(scenarios(app))
+    asyncio.run(slow_scenarios(app))
+    print(f"failing endpoint: {closed_ms:.1f} ms per chat while closed, {open_ms:.2f} ms once open")
+
+
+if __name__ == "__main__":
+    main()
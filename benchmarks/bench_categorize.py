@@ -0,0 +1,68 @@
+"""Benchmark: categorize a year of transactions for many users in one batch.
+
+Generates synthetic narrations (one per user per day by default), then
+times merchant normalization, vectorized categorization and subscription
+detection for a sample of users.
+
+    python benchmarks/bench_categorize.py [users] [days]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+from _app import load_app
+
+NARRATIONS = [
+    "UPI/{ref}/SWIGGY/Bangalore", "UPI/{ref}/ZOMATO ORDER", "POS {ref} BIG BAZAAR", "BLINKIT {ref}",
+    "UBER INDIA {ref}", "IRCTC E-TICKET {ref}", "BESCOM ELECTRICITY BILL", "AIRTEL RECHARGE {ref}",
+    "NETFLIX.COM", "SPOTIFY INDIA", "AMAZON PAY INDIA {ref}", "MYNTRA ORDER {ref}", "ATM CASH WD {ref}",
+    "EMI {ref} BAJAJ FINANCE", "SIP ZERODHA {ref}", "APOLLO PHARMACY {ref}", "UDEMY COURSE",
+    "LOCAL STORE {ref}", "TEA STALL", "NEFT SALARY ACME CORP",
+]
+
+
+def synthetic_year(users, days, seed=7):
+    rng = random.Random(seed)
+    start = np.datetime64("2025-01-01")
+    descriptions, amounts, dates, owners = [], [], [], []
+    for user in range(users):
+        for day in range(days):
+            narration = rng.choice(NARRATIONS).format(ref=rng.randint(100, 999))
+            descriptions.append(narration)
+            amounts.append(75000.0 if "SALARY" in narration else -float(rng.randint(50, 5000)))
+            dates.append(start + day)
+            owners.append(user)
+    return descriptions, np.array(amounts), np.array(dates, dtype="datetime64[D]"), np.array(owners)
+
+
+def main(users=10_000, days=365):
+    app = load_app("ledger")
+    descriptions, amounts, dates, owners = synthetic_year(users, days)
+    print(f"{len(descriptions):,} transactions for {users:,} users")
+
+    started = time.perf_counter()
+    merchants = app.merchant_keys(descriptions)
+    normalized = time.perf_counter()
+    categories = app.CategoryRuleEngine().categorize(merchants, amounts)
+    categorized = time.perf_counter()
+    print(f"normalize:  {normalized - started:6.2f} s")
+    print(f"categorize: {categorized - normalized:6.2f} s  "
+          f"({len(categories) / (categorized - normalized) / 1e6:.1f}M rows/s)")
+
+    merchants = np.array(merchants, dtype=object)
+    bounds = np.searchsorted(owners, np.arange(users + 1))
+    ledgers = [
+        app.Ledger(dates[a:b], amounts[a:b], merchants[a:b], categories[a:b])
+        for a, b in zip(bounds[:-1], bounds[1:])
+    ][:1000]
+    started = time.perf_counter()
+    for ledger in ledgers:
+        app.detect_subscriptions(ledger)
+    elapsed = time.perf_counter() - started
+    print(f"subscriptions: {elapsed / len(ledgers) * 1e3:.2f} ms/user")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,125 @@
+"""Benchmark: per-request hf clients against the pooled client.
+
+Serves a minimal chat-completion endpoint on localhost (HTTP/1.1 with
+keep-alive) and times sequential requests through AsyncInferenceClient,
+once building and closing a client per request (the old behaviour) and
+once leasing it from ClientPool, for plain and for streamed (SSE)
+completions. Over localhost only client and connection setup differ;
+against a remote TLS endpoint the gap is the handshake, tens of
+milliseconds per request.
+
+A streamed response stays in the hf client's exit stack until the client
+closes, so the streaming runs, half of them abandoned after the first
+chunk the way a disconnect or deadline does, also report the largest exit
+stack a pooled client reached, with and without recycling after
+max_leases.
+
+    python benchmarks/bench_client_pool.py
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from _app import load_app
+
+MAX_LEASES = 50
+
+COMPLETION = json.dumps({
+    "id": "bench", "object": "chat.completion", "created": 0, "model": "bench",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}).encode()
+STREAM = b"".join(
+    b"data: " + json.dumps({
+        "id": "bench", "object": "chat.completion.chunk", "created": 0, "model": "bench",
+        "choices": [{"index": 0, "finish_reason": None, "delta": {"role": "assistant", "content": word}}],
+    }).encode() + b"\n\n"
+    for word in ("ok ", "then ", "done")
+) + b"data: [DONE]\n\n"
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        self.send_response(200)
+        if not body.get("stream"):
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(COMPLETION)))
+            self.end_headers()
+            self.wfile.write(COMPLETION)
+            return
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(STREAM), STREAM))
+
+    def log_message(self, *args):
+        pass
+
+
+async def call(client, messages, stream, abandon):
+    """One completion; a streamed one is read to the end, or closed after its first chunk if `abandon`"""
+    if not stream:
+        return await client.chat_completion(messages=messages, max_tokens=1)
+    chunks = await client.chat_completion(messages=messages, max_tokens=1, stream=True)
+    try:
+        async for _ in chunks:
+            if abandon:
+                break
+    finally:
+        await chunks.aclose()
+
+
+async def run(app, url, requests, stream, max_leases):
+    """(ms per request with a new client each, ms with the pool, largest exit stack, clients recycled)"""
+    from huggingface_hub import AsyncInferenceClient
+    messages = [{"role": "user", "content": "Hi"}]
+
+    started = time.perf_counter()
+    for i in range(requests):
+        client = AsyncInferenceClient(base_url=url, token="hf_bench")
+        await call(client, messages, stream, abandon=i % 2)
+        await client.close()
+    fresh_ms = (time.perf_counter() - started) / requests * 1e3
+
+    pool = app.ClientPool(idle_seconds=300, max_clients=8, max_leases=max_leases,
+                          factory=lambda backend, token: AsyncInferenceClient(base_url=url, token=token))
+    largest = 0
+    started = time.perf_counter()
+    for i in range(requests):
+        async with pool.lease("hf", "hf_bench") as client:
+            await call(client, messages, stream, abandon=i % 2)
+            largest = max(largest, len(client.exit_stack._exit_callbacks))
+    pooled_ms = (time.perf_counter() - started) / requests * 1e3
+    await pool.close()
+    return fresh_ms, pooled_ms, largest, pool.recycled
+
+
+def main(requests=300):
+    app = load_app("model")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CompletionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    runs = [
+        ("plain", False, MAX_LEASES),
+        ("stream", True, MAX_LEASES),
+        ("stream, never recycled", True, requests + 1),
+    ]
+    print(f"{'completion':<24}{'fresh ms':>10}{'pooled ms':>11}{'speedup':>9}{'exit stack':>12}{'recycled':>10}")
+    for name, stream, max_leases in runs:
+        fresh_ms, pooled_ms, largest, recycled = asyncio.run(run(app, url, requests, stream, max_leases))
+        print(f"{name:<24}{fresh_ms:>10.2f}{pooled_ms:>11.2f}{fresh_ms / pooled_ms:>8.1f}x{largest:>12}{recycled:>10}")
+        # Recycled, a client's exit stack holds its session plus one response per lease at most
+        assert max_leases > requests or largest <= max_leases + 1, largest
+    server.shutdown()
+    print(f"{requests} sequential requests per run, half the streams abandoned after the first chunk; "
+          f"exit stack = most entries one pooled client held (max_leases {MAX_LEASES})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Micro-benchmark: per-click cost of feature dispatch.
+
+"eager" reproduces the old get_feature_response, which built every report and
+returned one; "lazy" is the registry lookup that renders only the requested
+feature.
+
+    python benchmarks/bench_feature_dispatch.py [iterations]
+"""
+import sys
+import timeit
+
+from _app import load_app
+
+
+def eager_feature_response(app, chatbot, feature_name, user_type, user_data):
+    responses = {
+        name: generator(chatbot, user_type, user_data)
+        for name, generator in app.FEATURE_REGISTRY.items()
+    }
+    return responses.get(feature_name, "Feature coming soon!")
+
+
+def main(iterations=2000):
+    app = load_app("users", "chat")
+    chatbot = app.FinanceChatbot()
+    profiles = {
+        "student": {**app.USER_DATABASE["students"]["STU001"], "account_number": "STU001"},
+        "professional": {**app.USER_DATABASE["professionals"]["PRO001"], "account_number": "PRO001"},
+    }
+
+    print(f"{'feature':<24}{'user':<14}{'eager µs':>10}{'lazy µs':>10}{'speedup':>9}")
+    for user_type, user_data in profiles.items():
+        for feature_name in app.FEATURE_REGISTRY:
+            eager = timeit.timeit(
+                lambda: eager_feature_response(app, chatbot, feature_name, user_type, user_data),
+                number=iterations,
+            ) / iterations * 1e6
+            lazy = timeit.timeit(
+                lambda: chatbot.get_feature_response(feature_name, user_type, user_data),
+                number=iterations,
+            ) / iterations * 1e6
+            print(f"{feature_name:<24}{user_type:<14}{eager:>10.2f}{lazy:>10.2f}{eager / lazy:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
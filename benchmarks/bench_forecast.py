@@ -0,0 +1,71 @@
+"""Benchmark: nightly cash-flow forecasts for many users in one batch.
+
+Builds a year of ledger history per user (salary, rent and subscriptions
+on fixed days, plus random daily spend), then times the batched
+forecaster against forecasting users one at a time.
+
+    python benchmarks/bench_forecast.py [users] [batch]
+"""
+import sys
+import time
+
+import numpy as np
+
+from _app import load_app
+
+RECURRING = [("salary acme corp", 75000.0, 1), ("rent", -22000.0, 5), ("netflix", -649.0, 12),
+             ("airtel", -399.0, 20), ("sip zerodha", -5000.0, 28)]
+SPEND = ["swiggy", "zomato", "big bazaar", "uber", "local store", "amazon pay"]
+
+
+def synthetic_ledgers(app, users, days=365, seed=7):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2025-01-01")
+    calendar = start + np.arange(days)
+    day_of_month = (calendar - calendar.astype("datetime64[M]")).astype(int) + 1
+    ledgers = []
+    for _ in range(users):
+        spend_days = calendar[rng.random(days) < 0.8]
+        dates = [spend_days]
+        amounts = [-rng.integers(50, 3000, len(spend_days)).astype(float)]
+        merchants = [np.array(SPEND, dtype=object)[rng.integers(0, len(SPEND), len(spend_days))]]
+        for merchant, amount, day in RECURRING:
+            due = calendar[day_of_month == day]
+            dates.append(due)
+            amounts.append(np.full(len(due), amount))
+            merchants.append(np.full(len(due), merchant, dtype=object))
+        dates = np.concatenate(dates)
+        order = np.argsort(dates, kind="stable")
+        ledgers.append(app.Ledger(dates[order], np.concatenate(amounts)[order],
+                                  np.concatenate(merchants)[order], np.zeros(len(dates), dtype=np.int16)))
+    return ledgers
+
+
+def main(users=10_000, batch=2_000):
+    app = load_app("ledger", "forecast")
+    ledgers = synthetic_ledgers(app, users)
+    balances = [50000.0] * users
+    forecaster = app.CashFlowForecaster()
+    start = "2026-01-01"
+    print(f"{sum(map(len, ledgers)):,} transactions for {users:,} users")
+
+    started = time.perf_counter()
+    for i in range(0, users, batch):
+        forecaster.forecast(ledgers[i:i + batch], balances[i:i + batch], start)
+    elapsed = time.perf_counter() - started
+    print(f"batched ({batch:,}/pass): {elapsed:6.2f} s  ({elapsed / users * 1e3:.2f} ms/user)")
+
+    sample = ledgers[:500]
+    started = time.perf_counter()
+    for ledger in sample:
+        forecaster.forecast([ledger], [50000.0], start)
+    elapsed = time.perf_counter() - started
+    print(f"one at a time:         {elapsed / len(sample) * 1e3:.2f} ms/user")
+
+    forecast = forecaster.forecast(ledgers[:1], balances[:1], start)[0]
+    print(f"sample: {forecast['daily_spend']:.0f}/day, bills {forecast['monthly_bills']:.0f}/mo, "
+          f"income {forecast['monthly_income']:.0f}/mo, month ends {forecast['month_end_balances'][:3]}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
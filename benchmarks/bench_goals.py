@@ -0,0 +1,60 @@
+"""Benchmark: savings-goal log replay, append and render.
+
+Writes event logs of increasing length and times a cold load (the
+vectorized replay), the same log folded one event at a time, a deposit
+appended to a loaded book, and the report render. A cold load of a million
+events should take well under a second, and render cost should not depend
+on the log length.
+
+    python benchmarks/bench_goals.py
+"""
+import os
+import random
+import tempfile
+import time
+from datetime import date
+
+from _app import load_app
+
+
+def main(repeats=2000):
+    app = load_app("goals")
+    rng = random.Random(7)
+    today = date.today()
+    print(f"{'events':>10}{'replay ms':>12}{'fold ms':>10}{'append us':>12}{'render us':>12}")
+    for events in (10_000, 100_000, 1_000_000):
+        with tempfile.TemporaryDirectory() as directory:
+            store = app.GoalStore(directory, compact_events=events * 2)
+            data = b"".join(
+                app.EVENT.pack(today.toordinal() - (events - i) // 500, rng.choice((app.DEPOSIT, app.DEPOSIT, app.WITHDRAW)),
+                               rng.randrange(len(app.GOALS)), rng.choice((100.0, 250.0, 1000.0)), 0)
+                for i in range(events)
+            )
+            with open(os.path.join(directory, "BENCH.log"), "wb") as f:
+                f.write(b"".join(app.EVENT.pack(today.toordinal(), app.TARGET, goal, 1e9, today.toordinal() + 365)
+                                 for goal in range(len(app.GOALS))) + data)
+
+            started = time.perf_counter()
+            book = store.get("BENCH", today)
+            replay_ms = (time.perf_counter() - started) * 1e3
+
+            started = time.perf_counter()
+            folded = app.GoalBook()
+            for event in app.EVENT.iter_unpack(data):
+                folded.apply(*event)
+            fold_ms = (time.perf_counter() - started) * 1e3
+
+            started = time.perf_counter()
+            for _ in range(repeats // 10):
+                store.record("BENCH", "Vacation", 100, today)
+            append_us = (time.perf_counter() - started) / (repeats // 10) * 1e6
+
+            started = time.perf_counter()
+            for _ in range(repeats):
+                app.render_goals(book, today)
+            render_us = (time.perf_counter() - started) / repeats * 1e6
+        print(f"{events:>10,}{replay_ms:>12.1f}{fold_ms:>10.1f}{append_us:>12.1f}{render_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
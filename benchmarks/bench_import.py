@@ -0,0 +1,52 @@
+"""Startup cost: time to import the core engine in a fresh interpreter.
+
+Each import runs in its own subprocess, so nothing is already cached in
+sys.modules. Also checks that the core engine leaves numpy and gradio
+unloaded. Exits non-zero if aira_bot.chat misses the budget.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from _app import ROOT
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in ("numpy", "gradio", "huggingface_hub") if m in sys.modules]}}))
+"""
+MODULES = ("aira_bot", "aira_bot.cli", "aira_bot.chat", "aira_bot.ledger", "aira_bot.app")
+
+
+def time_import(module, runs):
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(module=module)], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(out))
+    return statistics.median(r["seconds"] for r in results), results[-1]["loaded"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=100)
+    args = parser.parse_args()
+    
+    failed = False
+    for module in MODULES:
+        seconds, loaded = time_import(module, args.runs)
+        print(f"{module:<18} {seconds * 1000:8.1f} ms   loads: {', '.join(loaded) or '-'}")
+        if module == "aira_bot.chat" and (seconds * 1000 > args.budget_ms or loaded):
+            failed = True
+    if failed:
+        print(f"aira_bot.chat over the {args.budget_ms:.0f} ms budget or loaded heavy dependencies")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Load test: N concurrent simulated users driving the Gradio handlers.
+
+Each user logs in, clicks every feature button and sends a few chat
+messages, against FakeInferenceClient standing in for the model endpoint
+(configurable first-token latency, token rate and error rate). Reports
+p50/p95/p99 per operation and overall throughput, and fails (exit 1) when
+p95 latency, throughput, the fallback rate or the busy rate regress against
+the stored baseline recorded with the same settings. Replies turned away by
+the inference limiter (more users than MAX_CONCURRENT_MODEL_CALLS +
+MAX_WAITING_MODEL_CALLS) count as busy, not as fallbacks, so the fallback
+rate only reflects the model failing or timing out.
+
+    python benchmarks/bench_load.py [--users 50] [--messages 3] [--update-baseline]
+"""
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import random
+import sys
+import time
+
+import numpy as np
+
+from _app import load_app
+
+BASELINE_PATH = pathlib.Path(__file__).resolve().parent / "load_baseline.json"
+ACCOUNTS = [("STU001", "student123"), ("STU002", "study456"), ("PRO001", "work123")]
+QUESTIONS = [
+    "How should I invest a bonus of {n} thousand?",
+    "Is it better to prepay my loan or start a SIP of {n} thousand?",
+    "How much emergency fund do I need if I spend {n} thousand a month?",
+    "Should I buy gold with {n} thousand rupees?",
+    "How do I plan for a trip costing {n} thousand?",
+]
+BUSY_PREFIX = "🚦"
+FALLBACK_PREFIXES = ("⚠️", "❌")
+
+
+async def simulated_user(app, user, args, timings, outcomes):
+    rng = random.Random(user)
+    account, password = ACCOUNTS[user % len(ACCOUNTS)]
+
+    started = time.perf_counter()
+    # Gradio runs sync handlers in worker threads; so do we
+    session = (await asyncio.to_thread(app.login, account, password, None))[-1]
+    timings["login"].append(time.perf_counter() - started)
+
+    for feature in app.FEATURE_REGISTRY:
+        started = time.perf_counter()
+        await asyncio.to_thread(app.handle_feature_click, feature, session)
+        timings["feature"].append(time.perf_counter() - started)
+
+    history = []
+    for _ in range(args.messages):
+        # A small pool of amounts, so some questions repeat across users and hit the cache
+        question = rng.choice(QUESTIONS).format(n=rng.randint(1, args.question_variety))
+        started = time.perf_counter()
+        first = None
+        async for history in app.handle_chat(question, history, session):
+            if first is None and history[-1][1]:
+                first = time.perf_counter() - started
+        timings["chat_first_update"].append(first if first is not None else time.perf_counter() - started)
+        timings["chat"].append(time.perf_counter() - started)
+        reply = history[-1][1]
+        outcomes["busy" if reply.startswith(BUSY_PREFIX) else "fallback" if reply.startswith(FALLBACK_PREFIXES)
+                 else "answered"] += 1
+
+
+async def run(app, args):
+    timings = {"login": [], "feature": [], "chat_first_update": [], "chat": []}
+    outcomes = {"answered": 0, "fallback": 0, "busy": 0}
+    started = time.perf_counter()
+    await asyncio.gather(*(simulated_user(app, user, args, timings, outcomes) for user in range(args.users)))
+    return timings, outcomes, time.perf_counter() - started
+
+
+def summarize(timings, outcomes, elapsed):
+    operations = sum(len(samples) for name, samples in timings.items() if name != "chat_first_update")
+    chats = max(sum(outcomes.values()), 1)
+    report = {"throughput_ops": round(operations / elapsed, 2),
+              "fallback_rate": round(outcomes["fallback"] / chats, 4),
+              "busy_rate": round(outcomes["busy"] / chats, 4)}
+    for name, samples in timings.items():
+        p50, p95, p99 = np.percentile(np.array(samples) * 1e3, [50, 95, 99]).round(2).tolist()
+        report[name] = {"count": len(samples), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+    return report
+
+
+def regressions(report, baseline, tolerance):
+    found = []
+    for name, stats in report.items():
+        if not isinstance(stats, dict) or name not in baseline["report"]:
+            continue
+        limit = baseline["report"][name]["p95_ms"] * (1 + tolerance)
+        if stats["p95_ms"] > limit and stats["p95_ms"] - limit > 1:  # Ignore sub-millisecond noise
+            found.append(f"{name} p95 {stats['p95_ms']:.1f} ms > {limit:.1f} ms")
+    floor = baseline["report"]["throughput_ops"] * (1 - tolerance)
+    if report["throughput_ops"] < floor:
+        found.append(f"throughput {report['throughput_ops']:.1f} ops/s < {floor:.1f} ops/s")
+    for rate in ("fallback_rate", "busy_rate"):
+        allowed = baseline["report"].get(rate, 0)
+        if report[rate] > allowed + 0.05:
+            found.append(f"{rate.replace('_', ' ')} {report[rate]:.1%} > {allowed:.1%} + 5 pts")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=3, help="chat messages per user")
+    parser.add_argument("--question-variety", type=int, default=20, help="distinct amounts per question")
+    parser.add_argument("--first-token-latency", type=float, default=0.2, help="seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed fractional regression")
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    # Simulated users share three demo accounts, so the per-account chat limit is off
+    os.environ.setdefault("AIRA_CHAT_RATE_LIMIT", "0")
+    app = load_app()
+    app.chatbot.client = app.FakeInferenceClient(
+        reply="Split the amount between an index fund SIP and a liquid fund, and keep six months of expenses aside.",
+        first_token_latency=args.first_token_latency, tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate, seed=1,
+    )
+
+    timings, outcomes, elapsed = asyncio.run(run(app, args))
+    report = summarize(timings, outcomes, elapsed)
+    print(f"{args.users} users in {elapsed:.2f} s: {report['throughput_ops']:.1f} ops/s, "
+          f"fallback rate {report['fallback_rate']:.1%}, busy {report['busy_rate']:.1%}, response cache {app.chatbot.cache.stats()['hits']} hits")
+    for name, stats in report.items():
+        if isinstance(stats, dict):
+            print(f"  {name:18s} n={stats['count']:5d}  p50 {stats['p50_ms']:8.1f} ms  "
+                  f"p95 {stats['p95_ms']:8.1f} ms  p99 {stats['p99_ms']:8.1f} ms")
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("tolerance", "baseline", "update_baseline")}
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps({"settings": settings, "report": report}, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print("No baseline yet; rerun with --update-baseline")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["settings"] != settings:
+        print(f"Baseline was recorded with {baseline['settings']}; rerun with those settings or --update-baseline")
+        return 1
+    found = regressions(report, baseline, args.tolerance)
+    for line in found:
+        print(f"REGRESSION: {line}")
+    if not found:
+        print("No regressions against baseline")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
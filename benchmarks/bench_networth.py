@@ -0,0 +1,57 @@
+"""Benchmark: net-worth report cost against history length.
+
+Builds daily snapshot histories of increasing length and times the append
+that keeps the aggregates current and the report render, next to a full
+recompute of the same figures over the history. Render cost should stay
+flat as the history grows to five years.
+
+    python benchmarks/bench_networth.py
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from _app import load_app
+
+
+def recompute(history):
+    """Month delta, year growth and 90-day trend from scratch"""
+    days, net = history.days, history.net
+    last = days[-1]
+    month = [y for x, y in zip(days, net) if x <= last - 30]
+    year = [y for x, y in zip(days, net) if x <= last - 365]
+    window = [(x - days[0], y) for x, y in zip(days, net) if x >= last - 90]
+    mean_x = sum(x for x, _ in window) / len(window)
+    mean_y = sum(y for _, y in window) / len(window)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in window) / sum((x - mean_x) ** 2 for x, _ in window)
+    return net[-1] - month[-1], net[-1] / year[-1] - 1, slope * 30
+
+
+def main(repeats=2000):
+    app = load_app("networth")
+    rng = random.Random(7)
+    print(f"{'history':>10}{'append us':>12}{'render us':>12}{'recompute us':>15}")
+    for days in (400, 730, 1826):
+        history = app.NetWorthHistory()
+        start = date(2020, 1, 1)
+        value = 500_000.0
+        started = time.perf_counter()
+        for offset in range(days):
+            value *= 1 + rng.gauss(0.0003, 0.01)
+            history.append(start + timedelta(days=offset), value, 200_000.0, 1_000_000.0, 300_000.0)
+        append_us = (time.perf_counter() - started) / days * 1e6
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            app.render_net_worth(history.summary(), "professional")
+        render_us = (time.perf_counter() - started) / repeats * 1e6
+
+        started = time.perf_counter()
+        for _ in range(repeats // 20):
+            recompute(history)
+        recompute_us = (time.perf_counter() - started) / (repeats // 20) * 1e6
+        print(f"{days:>6} days{append_us:>12.2f}{render_us:>12.2f}{recompute_us:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark: query routing cost and the generation budget it saves.
+
+Classifies a mix of student and professional questions, including advice
+about the user's own numbers that must not be answered by a report, and
+fails if any lands on the wrong route. Reports the classifier's cost per
+question, how the questions were routed, how many skip the model, and the
+mean max_tokens of the model-bound ones against the fixed MODEL_MAX_TOKENS
+every question used to get.
+
+    python benchmarks/bench_routing.py
+"""
+import asyncio
+import time
+from collections import Counter
+
+from _app import load_app
+
+# (user type, question, expected route: a feature name, "short" or "detailed")
+QUESTIONS = [
+    ("student", "what is a recurring deposit", "short"),
+    ("student", "What is an index fund?", "short"),
+    ("student", "is gold a good investment", "short"),
+    ("student", "how should i split my pocket money each month", "detailed"),
+    ("student", "what is my net worth", "net_worth"),
+    ("student", "show my subscriptions", "subscription_tracker"),
+    ("student", "where did my money go last month", "expense_categorization"),
+    ("student", "how close am i to my savings goal", "savings_goal"),
+    ("student", "can you explain how credit scores work and how to build one while studying", "detailed"),
+    ("student", "should I take an education loan or work part time", "detailed"),
+    ("student", "what does CIBIL mean", "short"),
+    ("student", "how do I start investing with 500 rupees", "detailed"),
+    ("student", "when is my rent due", "bill_reminder"),
+    ("professional", "What is section 80C?", "short"),
+    ("professional", "How much tax will I pay this year?", "tax_saving"),
+    ("professional", "which regime is better for me", "tax_saving"),
+    ("professional", "how long will my savings last", "cash_flow"),
+    ("professional", "what is my net worth", "net_worth"),
+    ("professional", "Plan my retirement corpus for 25 years with SIPs", "detailed"),
+    ("professional", "compare PPF vs ELSS for a 10 year horizon", "detailed"),
+    ("professional", "should I prepay my home loan or invest the bonus", "detailed"),
+    ("professional", "what is the tax on fd interest", "short"),
+    ("professional", "how much term insurance cover do I need", "detailed"),
+    ("professional", "what's an NPS tier 2 account", "short"),
+    ("professional", "help me rebalance my portfolio", "detailed"),
+    # Advice about the user's own numbers is not a lookup
+    ("professional", "How can I reduce my expenses?", "detailed"),
+    ("professional", "Help me plan my monthly budget for college", "detailed"),
+    ("professional", "How do I build my emergency fund faster?", "detailed"),
+    ("professional", "Should I pay my bills with a credit card to get rewards?", "detailed"),
+    ("professional", "Which tax regime should I choose if my HRA is 20000?", "detailed"),
+    ("student", "how can i grow my net worth", "detailed"),
+    ("student", "tips to cut my subscriptions", "detailed"),
+    ("professional", "How do I grow my net worth?", "detailed"),
+    ("professional", "How do I save tax?", "detailed"),
+]
+
+
+async def answer(bot, question, user_type, user_data):
+    reply = None
+    async for reply in bot.generate_response(question, user_type, user_data):
+        pass
+    return reply
+
+
+def canned_reports(app):
+    """Questions routed to the model that FinanceChatbot answered with a feature report anyway"""
+    bot = app.FinanceChatbot("stub")
+    profiles = {
+        "student": {**app.USER_DATABASE["students"]["STU001"], "account_number": "STU001"},
+        "professional": {**app.USER_DATABASE["professionals"]["PRO001"], "account_number": "PRO001"},
+    }
+    reports = {user_type: {bot.get_feature_response(feature, user_type, user_data) for feature in app.FEATURE_REGISTRY}
+               for user_type, user_data in profiles.items()}
+    return [question for user_type, question, expected in QUESTIONS if expected in ("short", "detailed")
+            and asyncio.run(answer(bot, question, user_type, profiles[user_type])) in reports[user_type]]
+
+
+def main(repeats=20_000):
+    app = load_app("config", "routing")
+    rounds = repeats // len(QUESTIONS)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for user_type, question, _ in QUESTIONS:
+            app.classify(question, user_type)
+    classify_us = (time.perf_counter() - started) / (rounds * len(QUESTIONS)) * 1e6
+
+    routes = [app.classify(question, user_type) for user_type, question, _ in QUESTIONS]
+    wrong = [(question, expected, route) for (_, question, expected), route in zip(QUESTIONS, routes)
+             if expected != (route.feature or route.kind)]
+    for question, expected, route in wrong:
+        print(f"MISROUTED {question!r}: expected {expected}, got {route}")
+
+    model_bound = [route for route in routes if route.kind != "feature"]
+    budget = sum(route.max_tokens for route in model_bound) / len(model_bound)
+    print(f"classify: {classify_us:.2f} us/question")
+    print("routes:   " + ", ".join(f"{kind} {count}" for kind, count in Counter(route.kind for route in routes).most_common()))
+    print(f"feature:  {len(routes) - len(model_bound)} of {len(routes)} questions answered by a report, no model call")
+    print(f"model:    mean max_tokens {budget:.0f} over the other {len(model_bound)} (was {app.MODEL_MAX_TOKENS}) "
+          f"-> {1 - budget / app.MODEL_MAX_TOKENS:.0%} smaller")
+
+    # End to end: the FAQ must not answer a model-bound question with a report either
+    reported = canned_reports(load_app("users", "chat"))
+    for question in reported:
+        print(f"REPORT for {question!r}, which needs the model")
+    if wrong or reported:
+        raise SystemExit(f"{len(wrong)} questions misrouted, {len(reported)} answered with a report")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark: Monte Carlo projection behind the investment suggestions.
+
+Times a cold simulate_portfolio() call (budget: 200 ms on one core), a
+memoized repeat, and a what-if sweep over monthly amounts and equity
+shares, serially and on a process pool.
+
+    python benchmarks/bench_simulation.py [workers]
+"""
+import os
+import sys
+import time
+
+from _app import load_app
+
+
+def main(workers=os.cpu_count() or 1):
+    app = load_app("simulation")
+
+    timings = []
+    for monthly in (5_000, 10_000, 15_000, 20_000, 25_000):
+        started = time.perf_counter()
+        app.simulate_portfolio(monthly)
+        timings.append(time.perf_counter() - started)
+    print(f"cold:   {max(timings) * 1e3:6.1f} ms worst, {sum(timings) / len(timings) * 1e3:6.1f} ms mean "
+          f"({app.SIMULATION_PATHS:,} paths)")
+    started = time.perf_counter()
+    app.simulate_portfolio(15_000)
+    print(f"cached: {(time.perf_counter() - started) * 1e6:6.1f} us")
+
+    scenarios = [
+        (monthly, (equity, 0.9 - equity, 0.05, 0.05), horizon)
+        for monthly in range(2_000, 42_000, 4_000)
+        for equity in (0.3, 0.5, 0.7, 0.8)
+        for horizon in (10, 20, 30)
+    ]
+    app.simulate_portfolio.cache_clear()
+    started = time.perf_counter()
+    app.sweep_portfolios(scenarios, workers=1)
+    serial = time.perf_counter() - started
+    app.simulate_portfolio.cache_clear()  # Forked workers would inherit the warm cache
+    started = time.perf_counter()
+    app.sweep_portfolios(scenarios, workers=workers)
+    pooled = time.perf_counter() - started
+    print(f"sweep ({len(scenarios)} scenarios): {serial:.2f} s serial, {pooled:.2f} s on {workers} workers")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
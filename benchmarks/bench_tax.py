@@ -0,0 +1,50 @@
+"""Benchmark: vectorized income-tax evaluation for a cohort of users.
+
+Scores both regimes for N synthetic salaried users with random HRA, rent
+and deductions in one compute_tax() call, and checks a few known
+FY 2025-26 results first. Target: at least 1M users per second.
+
+    python benchmarks/bench_tax.py [users]
+"""
+import sys
+import time
+
+import numpy as np
+
+from _app import load_app
+
+# (gross salary, new regime, old regime with no deductions)
+KNOWN = [(1_275_000, 0, 187_200), (1_300_000, 26_000, 195_000), (2_000_000, 192_400, 413_400),
+         (5_100_000, 1_149_200, 1_417_000)]
+
+
+def main(users=1_000_000):
+    app = load_app("tax")
+    gross = np.array([salary for salary, _, _ in KNOWN])
+    result = app.compute_tax(gross)
+    assert result["new"].tolist() == [new for _, new, _ in KNOWN], result["new"]
+    assert result["old"].tolist() == [old for _, _, old in KNOWN], result["old"]
+
+    rng = np.random.default_rng(7)
+    gross = np.round(rng.lognormal(np.log(1_200_000), 0.7, users), -3)
+    basic = gross * 0.5
+    cohort = dict(
+        basic=basic, hra_received=basic * 0.4, rent_paid=rng.uniform(0, 0.5, users) * basic,
+        metro=rng.random(users) < 0.4, section_80c=rng.uniform(0, 200_000, users),
+        section_80d=rng.uniform(0, 30_000, users), section_80ccd_1b=rng.uniform(0, 50_000, users),
+        home_loan_interest=np.where(rng.random(users) < 0.3, rng.uniform(0, 300_000, users), 0),
+    )
+    app.compute_tax(gross[:1000], **{k: v[:1000] for k, v in cohort.items()})  # Warm up
+
+    runs = []
+    for _ in range(5):
+        started = time.perf_counter()
+        result = app.compute_tax(gross, **cohort)
+        runs.append(time.perf_counter() - started)
+    best = min(runs)
+    print(f"{users:,} users, both regimes: {best * 1e3:.0f} ms ({users / best / 1e6:.1f}M evaluations/s)")
+    print(f"new regime better for {result['new_is_better'].mean():.0%}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))